@@ -3,12 +3,15 @@ import sys
 import json
 import math
 from loguru import logger
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime, timedelta
+from pathlib import Path
 from collections import defaultdict
 
-from tools_parser import ToolManager
-from environments.traineebench.schemas.registry import call_evaluator
+from tools_parser import ToolManager, load_toolbox_manifest
+from tool_profiler import PROFILE_SUFFIX, is_error_result
+from environments.traineebench.schemas.registry import evaluate_task
+from environments.traineebench.schemas.answer_cache import evaluation_pass
 from virtual_server.registry import create_server
 from virtual_server.base_server import BaseServer
 from environments.common import BaseController, ReactiveController, NarrativeController
@@ -116,9 +119,16 @@ class Environment:
             ac['agent_name'] for ac in agents_config['ego_agents']
         ]
 
+        self.calendar_config: Dict = config.get('calendar_config', {})
+        self.sandbox_config: Dict = config.get('sandbox_config', {})
+        self.cloud_disk_config: Dict = config.get('cloud_disk_config', {})
+        self.output_config: Dict = config.get('output_config', {})
+
         tools_config: List[Dict] = config['tools']
+        # Optional tool profile of the tasks, see `toolset` in `task_hub.TASK_HUB`
+        self.toolset: Optional[List[str]] = config.get('toolset', None)
         self.servers: Dict[str, BaseServer] = {}
-        self.register_tools(tools_config)
+        self.register_tools(tools_config, self.toolset)
 
         self.total_tool_calls: Dict[str, int] = defaultdict(int)
         
@@ -128,23 +138,44 @@ class Environment:
         self.event_controller = self._load_controller(benchmark_name, controller_config)
         logger.info(f"Loaded event controller for benchmark: {benchmark_name}")
 
-    def register_tools(self, tools_config: List[Dict]):
+    def register_tools(self, tools_config: List[Dict], toolset: Optional[List[str]] = None):
+        """
+        Creates the servers of the configured tool modules and loads their tools. With a
+        `toolset`, only the listed tools are loaded, and modules without any of them (and
+        the servers they depend on) are skipped altogether.
+        """
+        manifest = load_toolbox_manifest() if toolset is not None else {}
         tool_names = []
         server_names = []
         for tc in tools_config:
+            entry = manifest.get(tc.get('name'))
+            if entry and not any(tool['name'] in toolset for tool in entry['tools']):
+                continue
             tool_names.append(tc.get('name'))
             server_names += tc.get('dependency', None)
 
         for sd in server_names:
+            server_type = sd
+            if sd == 'docker_sandbox' and self.sandbox_config.get('backend') == 'local':
+                # Tools still receive it as `docker_sandbox`; both backends share one interface
+                server_type = 'local_sandbox'
             self.servers[sd] = create_server(
-                sd, 
+                server_type, 
                 task_root_path = self.task_root_path,
                 clock = self.clock,
-                agents_config = self.agents_config
+                agents_config = self.agents_config,
+                calendar_config = self.calendar_config,
+                sandbox_config = self.sandbox_config,
+                cloud_disk_config = self.cloud_disk_config,
+                output_config = self.output_config
             )
         
         self.tool_manager = ToolManager(self.servers)
-        self.tool_manager.load_tools(modules=tool_names)
+        self.tool_manager.load_tools(modules=tool_names, toolset=toolset)
+        if toolset is not None:
+            missing = sorted(set(toolset) - set(self.tool_manager.tools))
+            if missing:
+                logger.debug(f"Tools of the toolset not provided by the configured tools: {missing}")
 
     def generate_tasks_prompt(self, agent_name: str) -> str:
         system_prompt = ''
@@ -183,13 +214,28 @@ class Environment:
                 except Exception as e:
                     tc_args = None
 
-                if tc_args:
+                # Malformed calls are rejected here instead of failing deep inside a server
+                invalid_reason = self.tool_manager.validate(tc.function.name, tc_args) if tc_args is not None else None
+                if tc_args is not None and invalid_reason is None:
                     try:
-                        tc_result = self.tool_manager.tools[tc.function.name](**tc_args)
+                        tc_result = self.tool_manager.call_tool(tc.function.name, **tc_args)
+                        if is_error_result(tc_result):
+                            self.tool_manager.profiler.record_error(tc.function.name)
                     except Exception as e:
                         tc_result = f'[Error] The following error occurred when you called the tool `{tc.function.name}`: {e.__str__()}.'
+                elif invalid_reason:
+                    self.tool_manager.profiler.record(tc.function.name, 0.0, error=True)
+                    tc_result = f'[Error] Invalid call of `{tc.function.name}`: {invalid_reason}'
                 else:
+                    self.tool_manager.profiler.record(tc.function.name, 0.0, error=True)
                     tc_result = f'[Error] There is a problem with the tool parameters you entered. Please make sure you enter the correct parameters in the correct format.'
+
+                # Long outputs are saved in the workspace; the agent gets a preview and a handle
+                if 'output_store' in self.servers and not (isinstance(tc_result, dict) and 'attach_user_message' in tc_result):
+                    result_text = tc_result if isinstance(tc_result, str) else json.dumps(tc_result, ensure_ascii=False)
+                    spilled = self.servers['output_store'].spill(tc.function.name, result_text)
+                    if spilled is not result_text:
+                        tc_result = spilled
                 
                 # Track last action for event controller
                 last_action = tc
@@ -209,6 +255,7 @@ class Environment:
                     tool_call_result_str = json.dumps({"attach_user_message": True}, ensure_ascii=False)
                 else:
                     tool_call_result_str = json.dumps(tc_result, ensure_ascii=False)
+                self.tool_manager.profiler.record_result_size(tc.function.name, len(tool_call_result_str))
 
                 execute_results.append(
                     {
@@ -257,34 +304,31 @@ class Environment:
 
     def evaluate(self) -> Dict:
         evaluation_results = []
-        for task in self.tasks:
-            evaluation_config = task.get('evaluation', None)
-            if evaluation_config:
-                func_name, func_args = evaluation_config['name'], evaluation_config['args']
-                result = call_evaluator(
-                    name=func_name, 
-                    task_root_path=self.task_root_path, 
-                    workspace_path=self.workspace,
-                    **func_args
-                )
-                evaluation_results.append(
-                    {
-                        "task_name": task.get('task_name', ""),
-                        "total_score": result['total_score'],
-                        "full_score": result['full_score'],
-                        "notes": result['notes']
-                    }
-                )
-                logger.info(f"Evaluation Reuslt for {task['task_name']}:\n{result}.")
+        # Answer files shared by several tasks are parsed once
+        with evaluation_pass():
+            for task in self.tasks:
+                evaluation_config = task.get('evaluation', None)
+                if evaluation_config:
+                    with self.tool_manager.profiler.timed(f"evaluator:{evaluation_config['name']}"):
+                        result = evaluate_task(task, self.task_root_path, self.workspace)
+                    evaluation_results.append(result)
+                    logger.info(f"Evaluation Reuslt for {task['task_name']}:\n{result}.")
 
         if self.log_path:
             logger.info(f"Task has been finished, check {self.log_path} for details.")
         else:
             logger.info('Task has been finished.')
 
+        profiler = self.tool_manager.profiler
+        if self.log_path:
+            # Aggregate across episodes and runs with `python tool_profiler.py <output folder>`
+            log_path = Path(self.log_path)
+            profiler.dump(log_path.with_name(f'{log_path.stem}{PROFILE_SUFFIX}'))
+
         output = {
             "evaluation_results": evaluation_results, 
-            "total_tool_calls": self.total_tool_calls
+            "total_tool_calls": self.total_tool_calls,
+            "tool_profile": profiler.summary()
         }
 
         return output
@@ -74,21 +74,28 @@ class MCPToolProvider(ToolProvider):
     用于 TraineeBench，工具定义在 Python 类中
     """
     
-    def __init__(self, servers: Dict, tools_config: List[Dict]):
+    def __init__(self, servers: Dict, tools_config: List[Dict] = None, tool_manager: Any = None):
         """
         初始化 MCP 工具提供者
         
         Args:
             servers: 服务器实例字典（如 DockerSandbox, CloudDisk 等）
             tools_config: 工具配置列表
+            tool_manager: 已加载好的 ToolManager（如 Environment.tool_manager），传入时直接共享，
+                不再重复加载工具；此时服务器由其所有者负责关闭
         """
         from tools_parser import ToolManager
         
         self.servers = servers
+        self.owns_servers = tool_manager is None
+        if tool_manager is not None:
+            self.tool_manager = tool_manager
+            return
+
         self.tool_manager = ToolManager(servers)
         
         # 加载工具模块
-        tool_names = [tc.get('name') for tc in tools_config]
+        tool_names = [tc.get('name') for tc in tools_config or []]
         self.tool_manager.load_tools(modules=tool_names)
     
     def get_tools_schema(self) -> List[Dict]:
@@ -113,10 +120,13 @@ class MCPToolProvider(ToolProvider):
         if tool_name not in self.tool_manager.tools:
             raise ValueError(f"Tool '{tool_name}' not found in MCP tools")
         
-        return self.tool_manager.tools[tool_name](**arguments)
+        # 经由 call_tool 执行，以记录耗时并使用只读工具的结果缓存
+        return self.tool_manager.call_tool(tool_name, **arguments)
     
     def close(self):
         """清理 MCP 服务器资源"""
+        if not self.owns_servers:
+            return
         for server in self.servers.values():
             if hasattr(server, 'close'):
                 server.close()
@@ -65,19 +65,10 @@ class TraineeBenchAdapter(BaseBenchmarkAdapter):
                     "Environment not initialized. Call reset() first."
                 )
             
-            # 从旧的 Environment 获取配置
-            import json
-            from pathlib import Path
-            
-            config_file = Path(self.task_path) / 'config.json'
-            with open(config_file, 'r', encoding='utf-8') as rf:
-                config = json.load(rf)
-            
-            tools_config = config.get('tools', [])
-            
+            # 共享旧 Environment 已加载的 ToolManager，避免重复实例化工具和生成 Schema
             self._tool_provider = MCPToolProvider(
                 servers=self._legacy_env.servers,
-                tools_config=tools_config
+                tool_manager=self._legacy_env.tool_manager
             )
         
         return self._tool_provider
@@ -127,6 +118,8 @@ class TraineeBenchAdapter(BaseBenchmarkAdapter):
         # 初始化旧版 Environment
         from environment import Environment as LegacyEnv
         
+        # 工具提供者绑定在旧 Environment 的 ToolManager 上，随之重建
+        self._tool_provider = None
         self._legacy_env = LegacyEnv(
             task_path=self.task_path,
             log_level=self.log_level,
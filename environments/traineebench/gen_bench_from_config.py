@@ -12,6 +12,7 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from environments.traineebench.schemas.common_config import CommonConfig
+from virtual_server.blob_store import BlobStore
 
 from task_hub import TASK_HUB
 
@@ -57,6 +58,30 @@ tools = [
         "dependency": [
             "cloud_disk"
         ]
+    },
+    {
+        "name": "output_tool",
+        "dependency": [
+            "output_store"
+        ]
+    },
+    {
+        "name": "sql_tool",
+        "dependency": [
+            "workspace_db"
+        ]
+    },
+    {
+        "name": "file_tool",
+        "dependency": [
+            "file_reader"
+        ]
+    },
+    {
+        "name": "search_tool",
+        "dependency": [
+            "search_index"
+        ]
     }
 ]
 
@@ -65,6 +90,8 @@ def gen_bench(
 ):
     with open(config_path, 'r', encoding='utf-8') as rf:
         bench_config = json.load(rf)
+    # Cloud disk files repeated across scenarios and days share their data, as reflinks of one blob
+    blob_store_path = bench_path / '.blobs'
         
     for scenario in bench_config['scenarios']:
         scenario_name = scenario['name']
@@ -77,7 +104,8 @@ def gen_bench(
                 day_path,
                 datetime.fromisoformat('2025-10-01T08:00:00'),
                 num_employees=50, env_model_name=npc_model,
-                tools=tools
+                tools=tools, calendar_config=day.get('calendar_config', None),
+                blob_store_path=blob_store_path
             )
             for task in day['tasks']:
                 task_name = task['name']
@@ -99,8 +127,16 @@ def gen_bench(
                     task_name, deadline
                 )
 
+            # A day only gets the tools its tasks need, unless one of them has no profile
+            toolsets = [TASK_HUB[task['name']].get('toolset') for task in day['tasks']]
+            if toolsets and all(toolset is not None for toolset in toolsets):
+                day_common_config.config['toolset'] = sorted(set().union(*toolsets))
             day_common_config.save_config()
 
+    removed = BlobStore(blob_store_path).gc(bench_path)
+    if removed:
+        print(f"Removed {removed} unused blobs from {blob_store_path}")
+
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
@@ -0,0 +1,74 @@
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Parsed answer files of the running evaluation pass, None outside of a pass
+_PASS_CACHE: Optional[Dict[Tuple, Any]] = None
+
+
+@contextmanager
+def evaluation_pass():
+    """
+    Shares parsed ground-truth files between the evaluators called inside the block.
+
+    Evaluators load answer files with `load_answer` (and index them with `load_answer_index`),
+    so a file checked by several tasks of a day is parsed once per pass instead of once per
+    evaluator. Nested passes share the outer one.
+
+    Example:
+        with evaluation_pass():
+            results = [evaluate_task(task, task_root_path, workspace_path) for task in tasks]
+    """
+    global _PASS_CACHE
+    outer = _PASS_CACHE
+    if outer is None:
+        _PASS_CACHE = {}
+    try:
+        yield
+    finally:
+        if outer is None:
+            _PASS_CACHE = None
+
+
+def _stat_key(path: str) -> Optional[Tuple[str, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.realpath(path), st.st_mtime_ns, st.st_size)
+
+
+def load_answer(path: str, parser: Callable[[str], Any]) -> Any:
+    """
+    Returns `parser(path)`, parsed only once per evaluation pass as long as the file is
+    unchanged. The result is shared between evaluators and must not be modified.
+    """
+    stat_key = _stat_key(path) if _PASS_CACHE is not None else None
+    if stat_key is None:
+        # Outside of a pass, or a missing file whose error the parser reports
+        return parser(path)
+    key = (stat_key, parser)
+    if key not in _PASS_CACHE:
+        _PASS_CACHE[key] = parser(path)
+    return _PASS_CACHE[key]
+
+
+def load_answer_index(path: str, column: str, parser: Callable[[str], Any]) -> Dict[Any, List]:
+    """
+    Returns the records of `load_answer(path, parser)` (a list of dicts) grouped by the value
+    of `column`, built once per evaluation pass. Records without the column are left out.
+    """
+    def build_index(rows) -> Dict[Any, List]:
+        index: Dict[Any, List] = {}
+        for row in rows or []:
+            if isinstance(row, dict) and column in row:
+                index.setdefault(row[column], []).append(row)
+        return index
+
+    stat_key = _stat_key(path) if _PASS_CACHE is not None else None
+    if stat_key is None:
+        return build_index(parser(path))
+    key = (stat_key, parser, column)
+    if key not in _PASS_CACHE:
+        _PASS_CACHE[key] = build_index(load_answer(path, parser))
+    return _PASS_CACHE[key]
@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import List, Dict, Union
 
 from environments.traineebench.schemas.utils.random_employees import generate_company_employees_by_size
+from virtual_server.blob_store import BlobStore
 
 
 CURRENT_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
@@ -46,6 +47,30 @@ DEFAULT_TOOLS = [
         "dependency": [
             "cloud_disk"
         ]
+    },
+    {
+        "name": "output_tool",
+        "dependency": [
+            "output_store"
+        ]
+    },
+    {
+        "name": "sql_tool",
+        "dependency": [
+            "workspace_db"
+        ]
+    },
+    {
+        "name": "file_tool",
+        "dependency": [
+            "file_reader"
+        ]
+    },
+    {
+        "name": "search_tool",
+        "dependency": [
+            "search_index"
+        ]
     }
 ]
 
@@ -55,7 +80,11 @@ class CommonConfig:
         start_time: datetime,
         num_employees: int = 50, 
         env_model_name: str = 'gpt-4o-mini', 
-        tools: List[Dict] = DEFAULT_TOOLS
+        tools: List[Dict] = DEFAULT_TOOLS,
+        calendar_config: Dict = None,
+        sandbox_config: Dict = None,
+        blob_store_path: Union[str, Path] = None,
+        lazy_assets: bool = True
     ) -> None:
         self.task_root_path = Path(task_root_path)
         self.task_root_path.mkdir(exist_ok=True, parents=True)
@@ -69,6 +98,8 @@ class CommonConfig:
         self.cloud_disk_path.mkdir(exist_ok=True)
 
         self.config_path = self.task_root_path / 'config.json'
+        # Rendered assets (heatmaps, maps) are stored as recipes and rendered on first access
+        self.lazy_assets = lazy_assets
 
         self.company_employees = generate_company_employees_by_size(
             num_employees)
@@ -80,6 +111,14 @@ class CommonConfig:
         self.build_empty_config(
             env_model_name, tools
         )
+        # Optional room set, business hours and planning horizon for `MeetingRoomCalendar`
+        if calendar_config:
+            self.config['calendar_config'] = calendar_config
+        # Optional container pool settings for `DockerSandbox`
+        if sandbox_config:
+            self.config['sandbox_config'] = sandbox_config
+        # Optional benchmark-wide blob store; identical cloud disk files of all days are stored once
+        self.blob_store = BlobStore(blob_store_path) if blob_store_path else None
 
     def clean(self):
         shutil.rmtree(self.task_root_path)
@@ -104,10 +143,13 @@ class CommonConfig:
                     "CreateChatGroup": 1,
                     "ListUsers": 1,
                     "DownloadFileFromCloudDisk": 10,
+                    "DownloadFolderFromCloudDisk": 10,
                     "OpenFolderInCloudDisk": 1,
+                    "SearchCloudDisk": 1,
                     "BookMeeting": 5,
                     "CancelMeeting": 1,
-                    "GetAvailableRooms": 1
+                    "GetAvailableRooms": 1,
+                    "FindFreeSlots": 1
                 }
             },
             "agents": {
@@ -156,4 +198,6 @@ class CommonConfig:
     def save_config(self):
         self.complete_npc_prompts()
         with open(self.config_path, 'w', encoding='utf-8') as wf:
-            json.dump(self.config, wf, ensure_ascii=False, indent=4, default=str)
\ No newline at end of file
+            json.dump(self.config, wf, ensure_ascii=False, indent=4, default=str)
+        if self.blob_store is not None:
+            self.blob_store.dedupe_tree(self.cloud_disk_path)
\ No newline at end of file
@@ -1,19 +1,118 @@
-from typing import Any, Dict, Callable
+import os
+import json
+import inspect
+import hashlib
+from functools import lru_cache
+from loguru import logger
+from pathlib import Path
+from typing import Any, Dict, Callable, Iterable, Optional, Sequence, Tuple, Union
 
 EVALUATOR_REGISTRY: Dict[str, Callable[..., Dict[str, Any]]] = {}
 
-def register_evaluator(name: str):
+# Files and folders an evaluator reads: templates over its parameters, or a function of them
+EvaluatorInputs = Union[Sequence[str], Callable[[Dict[str, Any]], Iterable[str]]]
+# Name -> (inputs, version) of the evaluators that declare their inputs
+EVALUATOR_INPUTS: Dict[str, Tuple[EvaluatorInputs, int]] = {}
+
+# Results of evaluators declaring their inputs are cached in the task folder; `EVOENV_EVALUATION_CACHE=0` disables it
+CACHE_EVALUATIONS = os.environ.get('EVOENV_EVALUATION_CACHE', '1') != '0'
+EVALUATION_CACHE_FOLDER = '.evaluation_cache'
+
+SCHEMAS_PATH = Path(__file__).resolve().parent
+TASKS_PATH = SCHEMAS_PATH / 'tasks'
+
+
+def register_evaluator(name: str, inputs: Optional[EvaluatorInputs] = None, version: int = 1):
     """
     Decorator to register an evaluator function under a given name.
+
+    Args:
+        name: The unique identifier of the evaluator.
+        inputs: Optional files and folders the evaluator reads, e.g. `('{workspace_path}', '{answer_dir}')`.
+            The result of an evaluator declaring its inputs is cached, and reused as long as
+            the content of its inputs, its parameters, the sources of its task package and
+            of `schemas/`, and `version` are unchanged.
+        version: Bump it when the results change without any of those sources changing,
+            e.g. in a third-party library.
     """
     def decorator(func: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
         if name in EVALUATOR_REGISTRY:
             raise ValueError(f"Error: evaluator '{name}' has already been registed")
         EVALUATOR_REGISTRY[name] = func
+        if inputs is not None:
+            EVALUATOR_INPUTS[name] = (inputs, version)
         return func
     return decorator
 
 
+def _source_files(evaluator: Callable) -> Iterable[Path]:
+    """The Python files whose changes may change the results of an evaluator."""
+    source_file = inspect.getsourcefile(evaluator)
+    if not source_file:
+        return []
+    source_file = Path(source_file).resolve()
+    if TASKS_PATH in source_file.parents:
+        # The evaluator's task package (e.g. `tasks/attendance` with its `utils`) and the
+        # rest of `schemas/` (`answer_cache`, `utils`, ...), but not the other tasks
+        package_path = TASKS_PATH / source_file.relative_to(TASKS_PATH).parts[0]
+        files = set(package_path.rglob('*.py'))
+        files.update(path for path in SCHEMAS_PATH.rglob('*.py') if TASKS_PATH not in path.parents)
+    else:
+        files = set(source_file.parent.rglob('*.py'))
+    return sorted(path for path in files if not path.name.startswith('test_'))
+
+
+@lru_cache(maxsize=None)
+def _code_digest(evaluator: Callable) -> str:
+    digest = hashlib.sha256()
+    for path in _source_files(evaluator):
+        digest.update(f'\0{path.name}\0'.encode('utf-8'))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _hash_path(digest, path: str):
+    digest.update(f'\0{path}\0'.encode('utf-8'))
+    if os.path.isdir(path):
+        for root, dirs, filenames in os.walk(path):
+            dirs.sort()
+            for filename in sorted(filenames):
+                file_path = os.path.join(root, filename)
+                digest.update(f'\0{os.path.relpath(file_path, path)}\0'.encode('utf-8'))
+                with open(file_path, 'rb') as rf:
+                    for block in iter(lambda: rf.read(1024 * 1024), b''):
+                        digest.update(block)
+    elif os.path.isfile(path):
+        # A sqlite database may hold recent changes in its write-ahead log
+        for file_path in (path, f'{path}-wal'):
+            if os.path.isfile(file_path):
+                with open(file_path, 'rb') as rf:
+                    for block in iter(lambda: rf.read(1024 * 1024), b''):
+                        digest.update(block)
+    else:
+        digest.update(b'missing')
+
+
+def _cache_key(name: str, evaluator: Callable, params: Dict[str, Any]) -> str:
+    """Hash of the evaluator's sources and version, its parameters and the content of its inputs."""
+    inputs, version = EVALUATOR_INPUTS[name]
+    # Inputs may refer to parameters left to their defaults
+    all_params = {
+        key: parameter.default for key, parameter in inspect.signature(evaluator).parameters.items()
+        if parameter.default is not inspect.Parameter.empty
+    }
+    all_params.update(params)
+    paths = inputs(all_params) if callable(inputs) else [template.format(**all_params) for template in inputs]
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps(
+        [name, version, _code_digest(evaluator), params], sort_keys=True, default=str, ensure_ascii=False
+    ).encode('utf-8'))
+    for path in paths:
+        _hash_path(digest, str(path))
+    return digest.hexdigest()
+
+
 def call_evaluator(name: str, **params):
     """
     Call a registered evaluator by its name.
@@ -30,4 +129,54 @@ def call_evaluator(name: str, **params):
     evaluator = EVALUATOR_REGISTRY.get(name)
     if evaluator is None:
         raise ValueError(f"Evaluator '{name}' is not registered. Please Check `schemas/tasks/__init__.py`.\n\nCurrent Available Evaluator:\n\n{list(EVALUATOR_REGISTRY.keys())}")
-    return evaluator(**params)
\ No newline at end of file
+    cache_path = None
+    if CACHE_EVALUATIONS and name in EVALUATOR_INPUTS and params.get('task_root_path'):
+        try:
+            key = _cache_key(name, evaluator, params)
+            cache_path = Path(params['task_root_path']) / EVALUATION_CACHE_FOLDER / f'{name}-{key[:16]}.json'
+        except KeyError as e:
+            # An input refers to a parameter the caller did not pass; the evaluator reports it
+            logger.debug(f"Evaluator '{name}': result not cached, missing parameter {e}.")
+    if cache_path is not None and cache_path.is_file():
+        logger.debug(f"Evaluator '{name}': inputs unchanged, cached result reused.")
+        with open(cache_path, 'r', encoding='utf-8') as rf:
+            return json.load(rf)
+
+    result = evaluator(**params)
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            tmp_path = cache_path.with_name(f'.{cache_path.name}.{os.getpid()}.tmp')
+            tmp_path.write_text(json.dumps(result, ensure_ascii=False), encoding='utf-8')
+            tmp_path.replace(cache_path)
+        except (TypeError, ValueError, OSError) as e:
+            logger.debug(f"Evaluator '{name}': result not cached ({e}).")
+    return result
+
+
+def evaluate_task(task: Dict, task_root_path: str, workspace_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Evaluate one task of a `config.json` with its evaluator.
+
+    Only the task folder is needed: evaluators read the workspace, the answers and the
+    databases (e.g. `meeting_calendar.db`) saved in it, so finished runs can be re-scored
+    without building their environment.
+
+    Returns:
+        The task's entry of the evaluation results, or None if the task has no evaluation.
+    """
+    evaluation_config = task.get('evaluation', None)
+    if not evaluation_config:
+        return None
+    result = call_evaluator(
+        name=evaluation_config['name'],
+        task_root_path=task_root_path,
+        workspace_path=workspace_path,
+        **evaluation_config['args']
+    )
+    return {
+        "task_name": task.get('task_name', ""),
+        "total_score": result['total_score'],
+        "full_score": result['full_score'],
+        "notes": result['notes']
+    }
@@ -40,7 +40,7 @@ def _load_json(path: str) -> Dict[str, Any]:
         return {}
 
 
-@register_evaluator("ads_optimal_strategy")
+@register_evaluator("ads_optimal_strategy", inputs=('{workspace_path}', '{answer_path}'))
 def evaluate_ads_optimal_strategy(
     *, output_path: str, answer_path: str, budget: int | float, budget_tolerance: float = 0.0,
     workspace_path: str,
@@ -8,7 +8,8 @@ from datetime import datetime
 
 import numpy as np
 from environments.traineebench.schemas.common_config import CommonConfig
-from environments.traineebench.schemas.tasks.ads_strategy.utils.heatmap import make_heatmap, save_heatmap
+from virtual_server.lazy_assets import defer_render
+from environments.traineebench.schemas.tasks.ads_strategy.utils.heatmap import make_heatmap
 from environments.traineebench.schemas.tasks.ads_strategy.utils.channels import generate_channels, save_channels_csv
 from environments.traineebench.schemas.tasks.ads_strategy.utils.optimizer import solve_knapsack
 
@@ -145,7 +146,10 @@ class AdsStrategyGenerator:
                 ),
             )
             hp = self.ads_cloud_dir / f"target_user_density_{g}.png"
-            save_heatmap(H_g, hp)
+            defer_render(
+                hp, 'environments.traineebench.schemas.tasks.ads_strategy.utils.heatmap:render_heatmap',
+                lazy=self.common_config.lazy_assets, H=H_g.tolist()
+            )
             heatmaps[g] = str(hp)
             group_arrays[g] = H_g
 
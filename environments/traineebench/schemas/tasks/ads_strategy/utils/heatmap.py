@@ -168,4 +168,6 @@ def save_heatmap(H: np.ndarray, path: Path) -> None:
     plt.close(fig)
 
 
-
+def render_heatmap(path: str, H: list) -> None:
+    """Lazy asset renderer of `save_heatmap`, see `virtual_server/lazy_assets.py`."""
+    save_heatmap(np.asarray(H, dtype=np.int32), Path(path))
@@ -4,6 +4,10 @@ from environments.traineebench.schemas.tasks.attendance.utils.common import load
 from typing import Any, Dict, List, Union
 from pathlib import Path
 from environments.traineebench.schemas.registry import register_evaluator
+from environments.traineebench.schemas.answer_cache import load_answer, load_answer_index
+
+# Resource files and outputs are looked up anywhere in the workspace
+ATTENDANCE_INPUTS = ('{workspace_path}', '{answer_dir}')
 
 
 def weighted_score(correct_checkpoints: int,
@@ -27,7 +31,14 @@ def weighted_score(correct_checkpoints: int,
     return score
 
 
-@register_evaluator("avg_late_early_days")
+def _department_persons(person_data_file: str, department: str) -> List[Dict[str, str]]:
+    """Rows of `by_person_department.csv` of a department, or of all of them for 'all'."""
+    if department == 'all':
+        return list(load_answer(person_data_file, load_csv))
+    return list(load_answer_index(person_data_file, 'department', load_csv).get(department, []))
+
+
+@register_evaluator("avg_late_early_days", inputs=ATTENDANCE_INPUTS)
 def evaluate_avg_late_early_days(*, 
                                  output_path: str,
                                  answer_dir: str = "fixture/answers",
@@ -74,9 +85,8 @@ def evaluate_avg_late_early_days(*,
 
     # Get the department if provided; otherwise, use all data.
     person_data_file = f"{answer_dir}/by_person_department.csv"
-    data = load_csv(person_data_file)
     # Filter data based on department if provided.
-    dept_persons = [row for row in data if (department == 'all' or row['department'] == department)]
+    dept_persons = _department_persons(person_data_file, department)
   
     if not dept_persons:
         assert f"No data found for department '{department}'" if department != 'all' else "No data found"
@@ -108,7 +118,7 @@ def evaluate_avg_late_early_days(*,
         "notes": notes
     }
 
-@register_evaluator("top_percent_employees")
+@register_evaluator("top_percent_employees", inputs=ATTENDANCE_INPUTS)
 def evaluate_top_percent_employees(*, 
                                    output_path: str,
                                    answer_dir: str = "fixture/answers",
@@ -140,9 +150,8 @@ def evaluate_top_percent_employees(*,
         raise ValueError("Metric must be 'late' or 'early'")
     
     person_data_file = f"{answer_dir}/by_person_department.csv"
-    data = load_csv(person_data_file)
     # Filter based on department if provided.
-    dept_persons = [row for row in data if (department == 'all' or row['department'] == department)]
+    dept_persons = _department_persons(person_data_file, department)
 
     if not dept_persons:
         assert f"No data found for department '{department}'" if department != 'all' else "No data found"
@@ -257,7 +266,7 @@ def evaluate_top_percent_employees(*,
         "notes": notes
     }
 
-@register_evaluator("has_late_or_early")
+@register_evaluator("has_late_or_early", inputs=ATTENDANCE_INPUTS)
 def evaluate_has_late_or_early(*, 
                                output_path: str,
                                answer_dir: str = "fixture/answers",
@@ -303,9 +312,8 @@ def evaluate_has_late_or_early(*,
         }
     
     person_data_file = f"{answer_dir}/by_person_department.csv"
-    data = load_csv(person_data_file)
     # Filter data if department is provided.
-    persons = [row for row in data if (department == 'all' or row['department'] == department)]
+    persons = _department_persons(person_data_file, department)
 
     if not persons:
         assert f"No data found for department '{department}'" if department != 'all' else "No data found"
@@ -327,7 +335,7 @@ def evaluate_has_late_or_early(*,
         "notes": notes
     }
 
-@register_evaluator("late_early_employee")
+@register_evaluator("late_early_employee", inputs=ATTENDANCE_INPUTS)
 def evaluate_late_early_employee(*, 
                                  output_path: str,
                                  answer_dir: str = "fixture/answers",
@@ -362,10 +370,9 @@ def evaluate_late_early_employee(*,
 
     # Load the employee data from the CSV file
     person_data_file = os.path.join(answer_dir, "by_person_department.csv")
-    data = load_csv(person_data_file)
   
     # Filter the data based on the department if provided
-    dept_persons = [row for row in data if (department == 'all' or row['department'] == department)]
+    dept_persons = _department_persons(person_data_file, department)
 
     if not dept_persons:
         assert f"No data found for department '{department}'" if department != 'all' else "No data found"
@@ -552,7 +559,7 @@ def evaluate_late_early_employee(*,
         "notes": notes
     }
 
-@register_evaluator("total_absence_days")
+@register_evaluator("total_absence_days", inputs=ATTENDANCE_INPUTS)
 def evaluate_total_absence_days(*, 
                                 output_path: str,
                                 answer_dir: str = "fixture/answers",
@@ -598,9 +605,8 @@ def evaluate_total_absence_days(*,
         }
 
     person_data_file = f"{answer_dir}/by_person_department.csv"
-    data = load_csv(person_data_file)
     # Filter based on department if provided.
-    dept_persons = [row for row in data if (department == 'all' or row['department'] == department)]
+    dept_persons = _department_persons(person_data_file, department)
 
     if not dept_persons:
         assert f"No data found for department '{department}'" if department != 'all' else "No data found"
@@ -622,7 +628,7 @@ def evaluate_total_absence_days(*,
         "notes": notes
     }
 
-@register_evaluator("average_overtime_hours")
+@register_evaluator("average_overtime_hours", inputs=ATTENDANCE_INPUTS)
 def evaluate_average_overtime_hours(*, 
                                     output_path: str,
                                     answer_dir: str = "fixture/answers",
@@ -667,8 +673,7 @@ def evaluate_average_overtime_hours(*,
         }
 
     person_data_file = f"{answer_dir}/by_person_department.csv"
-    data = load_csv(person_data_file)
-    dept_persons = [row for row in data if (department == 'all' or row['department'] == department)]
+    dept_persons = _department_persons(person_data_file, department)
 
     if not dept_persons:
         assert f"No data found for department '{department}'" if department != 'all' else "No data found"
@@ -692,7 +697,7 @@ def evaluate_average_overtime_hours(*,
         "notes": notes
     }
 
-@register_evaluator("employees_with_most_remote_days")
+@register_evaluator("employees_with_most_remote_days", inputs=ATTENDANCE_INPUTS)
 def evaluate_employees_with_most_remote_days(*, 
                                              output_path: str,
                                              answer_dir: str = "fixture/answers",
@@ -709,9 +714,8 @@ def evaluate_employees_with_most_remote_days(*,
     notes = []
 
     person_data_file = f"{answer_dir}/by_person_department.csv"
-    data = load_csv(person_data_file)
     # Filter data based on department.
-    dept_persons = [row for row in data if (department == 'all' or row['department'] == department)]
+    dept_persons = _department_persons(person_data_file, department)
 
     if not dept_persons:
         assert f"No data found for department '{department}'" if department != 'all' else "No data found"
@@ -835,7 +839,7 @@ def evaluate_employees_with_most_remote_days(*,
         "notes": notes
     }
 
-@register_evaluator("attendance_statistics")
+@register_evaluator("attendance_statistics", inputs=ATTENDANCE_INPUTS)
 def evaluate_attendance_statistics(*, 
                                    output_path: str,
                                    answer_dir: str = "fixture/answers",
@@ -856,10 +860,10 @@ def evaluate_attendance_statistics(*,
     notes = []
 
     dept_data_file = f"{answer_dir}/by_department.csv"
-    data = load_csv(dept_data_file)
+    data = load_answer(dept_data_file, load_csv)
 
     if department != 'all':
-        dept_row = next((row for row in data if row['department'] == department), None)
+        dept_row = next(iter(load_answer_index(dept_data_file, 'department', load_csv).get(department, [])), None)
         if not dept_row:
             expected = {
                 "employees": 0,
@@ -964,7 +968,7 @@ def evaluate_attendance_statistics(*,
         "notes": notes
     }
 
-@register_evaluator("employees_with_perfect_attendance")
+@register_evaluator("employees_with_perfect_attendance", inputs=ATTENDANCE_INPUTS)
 def evaluate_employees_with_perfect_attendance(*, 
                                           output_path: str,
                                           answer_dir: str = "fixture/answers",
@@ -982,12 +986,7 @@ def evaluate_employees_with_perfect_attendance(*,
     notes = []
 
     person_data_file = f"{answer_dir}/by_person_department.csv"
-    data = load_csv(person_data_file)
-
-    if department != 'all':
-        persons = [row for row in data if row['department'] == department]
-    else:
-        persons = data
+    persons = _department_persons(person_data_file, department)
 
     expected = []
     for person in persons:
@@ -35,7 +35,10 @@ def _read_csv(path: str) -> List[List[str]]:
         return [row for row in reader]
 
 
-@register_evaluator("data_completion_check")
+@register_evaluator("data_completion_check", inputs=(
+    '{task_root_path}/config.json', '{task_root_path}/chat_messages.db', '{workspace_path}',
+    '{original_csv}', '{expected_csv}',
+))
 def evaluate_data_completion_check(
     *,
     task_root_path: str,
@@ -5,6 +5,11 @@ from pathlib import Path
 from typing import Dict, Any
 
 
+def EVENT_PLANNING_INPUTS(params: Dict[str, Any]):
+    # The output is looked up in its folder, and `common_period.json` lies next to the answers
+    return [os.path.dirname(params['output_path']), os.path.dirname(params['answer_path'])]
+
+
 def weighted_score(correct_checkpoints: int,
                    total_checkpoints: int,
                    first_checkpoint_correct: bool,
@@ -99,7 +104,7 @@ def load_json(path):
         return json.load(f)
 
 
-@register_evaluator("general_event_planning")
+@register_evaluator("general_event_planning", inputs=EVENT_PLANNING_INPUTS)
 def evaluate_general_event_planning(*, 
                           output_path: str,
                           answer_path: str = "event_planning/itinerary_plans.json",
@@ -316,7 +321,7 @@ def evaluate_general_event_planning(*,
         "notes": notes
     }
 
-@register_evaluator("optimal_event_planning")
+@register_evaluator("optimal_event_planning", inputs=EVENT_PLANNING_INPUTS)
 def evaluate_optimal_event_planning(*, 
                           output_path: str,
                           answer_path: str = "event_planning/itinerary_plans.json",
@@ -6,9 +6,11 @@ import datetime as dt
 import json
 from datetime import datetime
 import random
+import networkx as nx
 
 from environments.traineebench.schemas.tasks.event_planning.utils import *
 from environments.traineebench.schemas.common_config import CommonConfig
+from virtual_server.lazy_assets import defer_render
 from environments.traineebench.schemas.utils.random_employees import COMPANY_STRUCTURE_CONFIG
 
 def plan2str(plan) -> str:
@@ -209,7 +211,11 @@ class EventTaskGenerator:
         )
 
         # Plot MST with distance labels (if G is complete, this function will draw its MST)
-        map_path = plot_graph_mst(G, filepath=str(self.event_root_path / "mst_map.png"))
+        map_path = defer_render(
+            self.event_root_path / "mst_map.png",
+            'environments.traineebench.schemas.tasks.event_planning.utils.generate_graph:render_graph_mst',
+            lazy=self.common_config.lazy_assets, graph=nx.node_link_data(G, edges="edges")
+        )
         print("MST map saved to:", map_path)
 
         # Export graph to JSON
@@ -1,4 +1,4 @@
 from .common import *
 from .prepare_data import generate_available_dates, generate_candidate_locations, generate_candidate_restaurants    
-from .generate_graph import build_nx_graph, plot_graph_mst, export_graph_to_json
+from .generate_graph import build_nx_graph, plot_graph_mst, render_graph_mst, export_graph_to_json
 from .generate_plans import generate_plan_with_metrics, export_locations_restaurants_info, export_planning_guidelines, enumerate_candidate_plans, get_optimal_plans_by_metrics, score_plans
\ No newline at end of file
@@ -376,4 +376,10 @@ def plot_graph_mst(G: nx.Graph,
     plt.tight_layout()
     plt.savefig(filepath, dpi=160)
     plt.close()
-    return os.path.abspath(filepath)
\ No newline at end of file
+    return os.path.abspath(filepath)
+
+
+def render_graph_mst(path: str, graph: dict) -> str:
+    """Lazy asset renderer of `plot_graph_mst` for a graph in node-link format, see `virtual_server/lazy_assets.py`."""
+    G = nx.node_link_graph(graph, edges="edges")
+    return plot_graph_mst(G, filepath=path)
@@ -33,7 +33,10 @@ def _read_text(path: str) -> str:
         return rf.read()
 
 
-@register_evaluator("kb_fix_broken_charts")
+@register_evaluator("kb_fix_broken_charts", inputs=(
+    '{task_root_path}/config.json', '{task_root_path}/chat_messages.db', '{workspace_path}',
+    '{task_root_path}/cloud_disk/kb/articles',
+))
 def evaluate_kb_fix_broken_charts(
     *,
     articles: List[Dict[str, Any]],
@@ -7,6 +7,8 @@ from typing import Dict, List, Union
 
 from environments.traineebench.schemas.registry import register_evaluator
 
+MEETING_ATTEND_INPUTS = ('{task_root_path}/meeting_calendar.db', '{workspace_path}/meeting_summary.json')
+
 
 def _attend_on_time(
     task_root_path: str,
@@ -119,7 +121,7 @@ def _get_evalution_note(
     return evaluation_note
 
 
-@register_evaluator("attending_meeting_none")
+@register_evaluator("attending_meeting_none", inputs=('{task_root_path}/meeting_calendar.db',))
 def evaluation_attending_meeting_none(
     *, task_root_path: str,
     start_time: str,
@@ -140,7 +142,7 @@ def evaluation_attending_meeting_none(
         "notes": evaluation_note
     }
 
-@register_evaluator("attending_meeting_write")
+@register_evaluator("attending_meeting_write", inputs=MEETING_ATTEND_INPUTS)
 def evaluation_attending_meeting_write(
     *, task_root_path: str,
     workspace_path: str,
@@ -195,7 +197,7 @@ def evaluation_attending_meeting_write(
     }
 
 
-@register_evaluator("attending_meeting_sum")
+@register_evaluator("attending_meeting_sum", inputs=MEETING_ATTEND_INPUTS)
 def evaluation_attending_meeting_sum(
     *, task_root_path: str,
     workspace_path: str,
@@ -252,7 +254,7 @@ def evaluation_attending_meeting_sum(
     }
 
 
-@register_evaluator("attending_meeting_check")
+@register_evaluator("attending_meeting_check", inputs=MEETING_ATTEND_INPUTS)
 def evaluation_attending_meeting_check(
     *, task_root_path: str,
     workspace_path: str,
@@ -305,7 +307,7 @@ def evaluation_attending_meeting_check(
         "notes": evaluation_note if (total_score < full_socre) else ""
     }
 
-@register_evaluator("attending_meeting_check_sum")
+@register_evaluator("attending_meeting_check_sum", inputs=MEETING_ATTEND_INPUTS)
 def evaluation_attending_meeting_check_sum(
     *, task_root_path: str,
     workspace_path: str,
@@ -45,7 +45,7 @@ def _get_evaluation_note(
     return evaluation_note
 
 
-@register_evaluator("booking_meeting_manager")
+@register_evaluator("booking_meeting_manager", inputs=('{task_root_path}/meeting_calendar.db',))
 def evaluation_meeting_booking_manager(
     *, task_root_path: str,
     start_time: str,
@@ -106,7 +106,7 @@ def evaluation_meeting_booking_manager(
     }
 
 
-@register_evaluator("booking_meeting_department")
+@register_evaluator("booking_meeting_department", inputs=('{task_root_path}/meeting_calendar.db',))
 def evaluation_meeting_booking_department(
     *, task_root_path: str,
     start_time: str,
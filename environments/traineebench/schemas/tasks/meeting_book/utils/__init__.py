@@ -0,0 +1,2 @@
+# Utility package for meeting_book task (dense calendar generation for load benchmarks)
+
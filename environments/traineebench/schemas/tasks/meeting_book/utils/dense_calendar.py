@@ -0,0 +1,171 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, *[".."] * 6))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from virtual_server.meeting_calendar import MeetingRoomCalendar
+
+
+class _StartClock:
+    """Minimal stand-in for `VirtualClock`, only `now_dt` is read by the calendar."""
+    def __init__(self, now_dt: datetime):
+        self.now_dt = now_dt
+
+
+def generate_dense_calendar(
+    task_root_path: str,
+    calendar_config: Dict,
+    employees: List[str],
+    start_time: datetime,
+    num_days: int = 30,
+    occupancy: float = 0.7,
+    max_attendees: int = 6,
+    slot_minutes: int = 30,
+    seed: int = 1234
+) -> MeetingRoomCalendar:
+    """
+    Fill `meeting_calendar.db` with a dense but valid schedule for load benchmarks.
+
+    Time is walked slot by slot; every room that is free starts a meeting with
+    probability `occupancy`, and attendees are drawn only from people who are
+    free at that moment, so no room or person is ever double-booked.
+
+    Args:
+        task_root_path: Task folder holding `meeting_calendar.db`
+        calendar_config: Same structure as `calendar_config` in `config.json`
+        employees: Names that can be booked as applicants or attendees
+        start_time: Scenario start; the schedule begins on this date
+        num_days: Number of consecutive days to fill
+        occupancy: Probability that a free room starts a meeting in a slot
+        max_attendees: Maximum number of attendees besides the applicant
+        slot_minutes: Granularity of meeting starts and lengths
+        seed: Random seed
+
+    Returns:
+        A `MeetingRoomCalendar` opened on the generated database
+    """
+    rng = random.Random(seed)
+    calendar = MeetingRoomCalendar(
+        task_root_path, _StartClock(start_time), calendar_config=calendar_config
+    )
+    slot = timedelta(minutes=slot_minutes)
+
+    rows = []
+    for day in range(num_days):
+        day_start = datetime.combine(start_time.date() + timedelta(days=day), datetime.min.time())
+        opening = day_start + timedelta(hours=calendar.business_start)
+        closing = day_start + timedelta(hours=calendar.business_end)
+        room_free_at = {room: opening for room in calendar.room_names}
+        person_free_at = {person: opening for person in employees}
+
+        t = opening
+        while t < closing:
+            # Shuffle once per slot and pop attendees off the end
+            free_people = [p for p, free_at in person_free_at.items() if free_at <= t]
+            rng.shuffle(free_people)
+            for room in calendar.room_names:
+                if room_free_at[room] > t or rng.random() >= occupancy:
+                    continue
+                if len(free_people) < 2:
+                    break
+                length = slot * rng.randint(1, 4)
+                end = min(t + length, closing)
+                people = [free_people.pop() for _ in range(min(len(free_people), rng.randint(2, max_attendees + 1)))]
+                for person in people:
+                    person_free_at[person] = end
+                room_free_at[room] = end
+                rows.append((
+                    t.isoformat(), end.isoformat(), people[0], ','.join(people[1:]),
+                    room, f'Load test meeting {len(rows)}'
+                ))
+            t += slot
+
+    with sqlite3.connect(calendar.db_path) as conn:
+        conn.executemany(
+            """INSERT INTO meetings (start_time, end_time, applicant, attendees, room_name, summary) VALUES (?, ?, ?, ?, ?, ?);""",
+            rows
+        )
+        conn.commit()
+
+    return calendar
+
+
+def benchmark_queries(calendar: MeetingRoomCalendar, employees: List[str],
+                      start_time: datetime, num_days: int,
+                      repeats: int = 200, seed: int = 1234) -> Dict[str, float]:
+    """
+    Time the scheduling queries used by the calendar tools on random windows.
+
+    Returns:
+        Mean latency in milliseconds per query type
+    """
+    rng = random.Random(seed)
+    timings = {'get_available_rooms': 0.0, 'check_attendee_conflicts': 0.0, 'find_free_slots': 0.0}
+    for _ in range(repeats):
+        day = start_time.date() + timedelta(days=rng.randrange(num_days))
+        s = datetime.combine(day, datetime.min.time()) + timedelta(
+            hours=calendar.business_start, minutes=30 * rng.randrange(4))
+        e = s + timedelta(hours=1)
+        people = rng.sample(employees, 5)
+
+        t0 = time.perf_counter()
+        calendar.get_available_rooms(s, e)
+        t1 = time.perf_counter()
+        calendar._check_attendee_conflicts(people[0], ','.join(people[1:]), s, e)
+        t2 = time.perf_counter()
+        calendar.find_free_slots(people, 60, s, s + timedelta(days=5))
+        t3 = time.perf_counter()
+
+        timings['get_available_rooms'] += t1 - t0
+        timings['check_attendee_conflicts'] += t2 - t1
+        timings['find_free_slots'] += t3 - t2
+
+    return {k: v / repeats * 1000 for k, v in timings.items()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Generate a dense meeting calendar and benchmark scheduling queries on it."
+    )
+    parser.add_argument("--task-root", type=str, required=True, help="Output folder for meeting_calendar.db.")
+    parser.add_argument("--num-rooms", type=int, default=300)
+    parser.add_argument("--num-days", type=int, default=90)
+    parser.add_argument("--num-employees", type=int, default=3000)
+    parser.add_argument("--occupancy", type=float, default=0.7)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    os.makedirs(args.task_root, exist_ok=True)
+    db_path = os.path.join(args.task_root, 'meeting_calendar.db')
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    start = datetime.fromisoformat('2025-10-01T08:00:00')
+    employees = [f'Employee {i:05d}' for i in range(args.num_employees)]
+    calendar_config = {
+        "num_rooms": args.num_rooms,
+        "business_start": 8,
+        "business_end": 20,
+        "horizon_days": args.num_days
+    }
+
+    t0 = time.perf_counter()
+    calendar = generate_dense_calendar(
+        args.task_root, calendar_config, employees, start,
+        num_days=args.num_days, occupancy=args.occupancy, seed=args.seed
+    )
+    with sqlite3.connect(calendar.db_path) as conn:
+        num_meetings = conn.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+    print(f"Generated {num_meetings} meetings in {time.perf_counter() - t0:.1f}s")
+
+    for name, ms in benchmark_queries(calendar, employees, start, args.num_days, seed=args.seed).items():
+        print(f"{name}: {ms:.2f} ms/query")
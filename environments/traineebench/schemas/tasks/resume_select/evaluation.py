@@ -5,7 +5,7 @@ from typing import List
 from environments.traineebench.schemas.registry import register_evaluator
 
 
-@register_evaluator("resume_selection")
+@register_evaluator("resume_selection", inputs=('{workspace_path}/{output_file}',))
 def evaluate_resume_selection(
     output_file: str,
     gt_answer: List[str],
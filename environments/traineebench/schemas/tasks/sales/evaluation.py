@@ -3,6 +3,10 @@ import json
 from typing import Any, Dict, List, Set, Union, Optional
 
 from environments.traineebench.schemas.registry import register_evaluator
+from environments.traineebench.schemas.answer_cache import load_answer, load_answer_index
+
+# Resource files and outputs are looked up anywhere in the workspace
+SALES_INPUTS = ('{workspace_path}', '{answer_dir}')
 
 
 def weighted_score(correct_checkpoints: int,
@@ -42,23 +46,31 @@ def _load_json(file_path: str):
         return None
 
 
-def _load_by_person(answer_dir: str, quarter: int | None):
+def _by_person_path(answer_dir: str, quarter: int | None) -> str:
     if quarter is not None:
         file_path = os.path.join(answer_dir, f"by_person_Q{quarter}.json")
         if os.path.exists(file_path):
-            return _load_json(file_path)
-    file_path = os.path.join(answer_dir, 'by_person.json')
-    data = _load_json(file_path)
+            return file_path
+    return os.path.join(answer_dir, 'by_person.json')
+
+
+def _load_by_person(answer_dir: str, quarter: int | None):
+    data = load_answer(_by_person_path(answer_dir, quarter), _load_json)
     return data if data else []
 
 
+def _load_dept_people(answer_dir: str, quarter: int | None, department: str) -> List[Dict[str, Any]]:
+    """Answers of `_load_by_person` of one department."""
+    return load_answer_index(_by_person_path(answer_dir, quarter), 'department', _load_json).get(department, [])
+
+
 def _load_by_department(answer_dir: str, quarter: int | None):
     if quarter is not None:
         file_path = os.path.join(answer_dir, f"by_department_Q{quarter}.json")
         if os.path.exists(file_path):
-            return _load_json(file_path)
+            return load_answer(file_path, _load_json)
     file_path = os.path.join(answer_dir, 'by_department.json')
-    data = _load_json(file_path)
+    data = load_answer(file_path, _load_json)
     return data if data else []
 
 
@@ -118,7 +130,7 @@ def _basic_eval_setup(workspace_path: str, output_path: str, manual_name: str =
     return manual_score, output_file_score, notes, resolved_output
 
 
-@register_evaluator("top_sales_employee")
+@register_evaluator("top_sales_employee", inputs=SALES_INPUTS)
 def evaluate_top_sales_employee(*, output_path: str, answer_dir: str, workspace_path: str, department: str, quarter: int | None = None, **kwargs: Any) -> Dict[str, Any]:
     manual_score, output_file_score, notes, resolved_output = _basic_eval_setup(workspace_path, output_path)
     format_score = 0
@@ -139,8 +151,7 @@ def evaluate_top_sales_employee(*, output_path: str, answer_dir: str, workspace_
                 notes += "- You should report the result in a list of employee objects (JSON).\n"
 
     # Ground Truth
-    people = _load_by_person(answer_dir, quarter)
-    dept_people = [p for p in people if p.get('department') == department]
+    dept_people = _load_dept_people(answer_dir, quarter, department)
     
     if dept_people:
         max_total = max(p['total_sales'] for p in dept_people)
@@ -176,7 +187,7 @@ def evaluate_top_sales_employee(*, output_path: str, answer_dir: str, workspace_
     }
 
 
-@register_evaluator("sales_statistics")
+@register_evaluator("sales_statistics", inputs=SALES_INPUTS)
 def evaluate_sales_statistics(*, output_path: str, answer_dir: str, workspace_path: str, department: str, quarter: int | None = None, **kwargs: Any) -> Dict[str, Any]:
     manual_score, output_file_score, notes, resolved_output = _basic_eval_setup(workspace_path, output_path)
     format_score = 0
@@ -228,7 +239,7 @@ def evaluate_sales_statistics(*, output_path: str, answer_dir: str, workspace_pa
     }
 
 
-@register_evaluator("cross_depts_extreme_employee")
+@register_evaluator("cross_depts_extreme_employee", inputs=SALES_INPUTS)
 def evaluate_cross_depts_extreme_employee(*, output_path: str, answer_dir: str, workspace_path: str, departments: List[str], quarter: int, mode: str = "top", **kwargs: Any) -> Dict[str, Any]:
     manual_score, output_file_score, notes, resolved_output = _basic_eval_setup(workspace_path, output_path)
     format_score = 0
@@ -283,7 +294,7 @@ def evaluate_cross_depts_extreme_employee(*, output_path: str, answer_dir: str,
     }
 
 
-@register_evaluator("per_dept_extreme_employee")
+@register_evaluator("per_dept_extreme_employee", inputs=SALES_INPUTS)
 def evaluate_per_dept_extreme_employee(*, output_path: str, answer_dir: str, workspace_path: str, departments: List[str], quarter: int, mode: str = "top", **kwargs: Any) -> Dict[str, Any]:
     manual_score, output_file_score, notes, resolved_output = _basic_eval_setup(workspace_path, output_path)
     format_score = 0
@@ -297,10 +308,9 @@ def evaluate_per_dept_extreme_employee(*, output_path: str, answer_dir: str, wor
         else:
              notes += "- You should report the result in a dict mapping departments to employee lists.\n"
 
-    people = _load_by_person(answer_dir, quarter)
     expected = {}
     for dept in departments:
-        dept_people = [p for p in people if p.get('department') == dept]
+        dept_people = _load_dept_people(answer_dir, quarter, dept)
         if not dept_people:
             expected[dept] = []
             continue
@@ -334,7 +344,7 @@ def evaluate_per_dept_extreme_employee(*, output_path: str, answer_dir: str, wor
     }
 
 
-@register_evaluator("per_dept_avg_sales")
+@register_evaluator("per_dept_avg_sales", inputs=SALES_INPUTS)
 def evaluate_per_dept_avg_sales(*, output_path: str, answer_dir: str, workspace_path: str, departments: List[str], quarter: int, **kwargs: Any) -> Dict[str, Any]:
     manual_score, output_file_score, notes, resolved_output = _basic_eval_setup(workspace_path, output_path)
     format_score = 0
@@ -377,7 +387,7 @@ def evaluate_per_dept_avg_sales(*, output_path: str, answer_dir: str, workspace_
     }
 
 
-@register_evaluator("per_dept_top_n")
+@register_evaluator("per_dept_top_n", inputs=SALES_INPUTS)
 def evaluate_per_dept_top_n(*, output_path: str, answer_dir: str, workspace_path: str, departments: List[str], quarter: int, n: int = 3, **kwargs: Any) -> Dict[str, Any]:
     manual_score, output_file_score, notes, resolved_output = _basic_eval_setup(workspace_path, output_path)
     format_score = 0
@@ -391,10 +401,9 @@ def evaluate_per_dept_top_n(*, output_path: str, answer_dir: str, workspace_path
         else:
              notes += "- You should report the result in a dict mapping departments to list of employees.\n"
 
-    people = _load_by_person(answer_dir, quarter)
     expected = {}
     for dept in departments:
-        dept_people = [p for p in people if p.get('department') == dept]
+        dept_people = _load_dept_people(answer_dir, quarter, dept)
         sorted_people = sorted(dept_people, key=lambda x: x['total_sales'], reverse=True)
         cutoff = n if len(sorted_people) >= n else len(sorted_people)
         expected[dept] = [
@@ -424,7 +433,7 @@ def evaluate_per_dept_top_n(*, output_path: str, answer_dir: str, workspace_path
     }
 
 
-@register_evaluator("cross_depts_top_n")
+@register_evaluator("cross_depts_top_n", inputs=SALES_INPUTS)
 def evaluate_cross_depts_top_n(*, output_path: str, answer_dir: str, workspace_path: str, departments: List[str], quarter: int, n: int = 3, **kwargs: Any) -> Dict[str, Any]:
     manual_score, output_file_score, notes, resolved_output = _basic_eval_setup(workspace_path, output_path)
     format_score = 0
@@ -465,7 +474,7 @@ def evaluate_cross_depts_top_n(*, output_path: str, answer_dir: str, workspace_p
     }
 
 
-@register_evaluator("dept_person_qoq_count")
+@register_evaluator("dept_person_qoq_count", inputs=SALES_INPUTS)
 def evaluate_dept_person_qoq_count(*, output_path: str, answer_dir: str, workspace_path: str, department: str, quarter: int, direction: str = "up", **kwargs: Any) -> Dict[str, Any]:
     manual_score, output_file_score, notes, resolved_output = _basic_eval_setup(workspace_path, output_path)
     format_score = 0
@@ -520,7 +529,7 @@ def evaluate_dept_person_qoq_count(*, output_path: str, answer_dir: str, workspa
     }
 
 
-@register_evaluator("all_depts_qoq_count")
+@register_evaluator("all_depts_qoq_count", inputs=SALES_INPUTS)
 def evaluate_all_depts_qoq_count(*, output_path: str, answer_dir: str, workspace_path: str, quarter: int, direction: str = "up", **kwargs: Any) -> Dict[str, Any]:
     manual_score, output_file_score, notes, resolved_output = _basic_eval_setup(workspace_path, output_path)
     format_score = 0
@@ -5,7 +5,7 @@ from typing import List
 from environments.traineebench.schemas.registry import register_evaluator
 
 
-@register_evaluator("abnormal_supplier")
+@register_evaluator("abnormal_supplier", inputs=('{workspace_path}',))
 def evaluate_abnormal_supplier(
     *, checkpoint_files: List[str],
     output_file: str,
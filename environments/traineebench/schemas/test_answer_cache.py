@@ -0,0 +1,75 @@
+"""
+Test script for sharing parsed answer files within an evaluation pass.
+"""
+
+import csv
+
+from environments.traineebench.schemas.answer_cache import evaluation_pass, load_answer, load_answer_index
+
+
+PARSES = []
+
+
+def counting_load_csv(file_path: str):
+    PARSES.append(file_path)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def department_total(answer_file: str, department: str) -> int:
+    """An evaluator reading the answers of one department, through the index."""
+    return sum(int(row['score']) for row in load_answer_index(answer_file, 'department', counting_load_csv).get(department, []))
+
+
+def overall_average(answer_file: str) -> float:
+    """An evaluator reading the whole answer file."""
+    rows = load_answer(answer_file, counting_load_csv)
+    return sum(int(row['score']) for row in rows) / len(rows)
+
+
+def _evaluate_all(answer_file: str):
+    return [department_total(answer_file, 'sales'), department_total(answer_file, 'hr'), overall_average(answer_file)]
+
+
+def test_pass_parses_once(tmp_path):
+    """Inside a pass the file is parsed once and results equal those without a pass."""
+    answer_file = tmp_path / 'by_person_department.csv'
+    answer_file.write_text('name,department,score\nann,sales,3\nbob,sales,5\ncid,hr,4\n', encoding='utf-8')
+
+    PARSES.clear()
+    expected = _evaluate_all(str(answer_file))
+    parses_without_pass = len(PARSES)
+
+    PARSES.clear()
+    with evaluation_pass():
+        results = _evaluate_all(str(answer_file))
+        # Nested passes share the outer one
+        with evaluation_pass():
+            assert overall_average(str(answer_file)) == expected[2]
+    print(f"Results {results}, parsed {len(PARSES)} time(s) instead of {parses_without_pass}")
+    assert results == expected == [8, 4, 4.0]
+    assert len(PARSES) == 1 and parses_without_pass == 3
+
+    # Outside of a pass nothing is kept
+    PARSES.clear()
+    overall_average(str(answer_file))
+    overall_average(str(answer_file))
+    assert len(PARSES) == 2
+
+    print("\n✓ Evaluation pass test passed!")
+
+
+def test_changed_file_is_parsed_again(tmp_path):
+    """A file rewritten during a pass is parsed again and its new content is used."""
+    answer_file = tmp_path / 'answers.csv'
+    answer_file.write_text('name,department,score\nann,sales,3\n', encoding='utf-8')
+
+    PARSES.clear()
+    with evaluation_pass():
+        assert department_total(str(answer_file), 'sales') == 3
+        answer_file.write_text('name,department,score\nann,sales,3\nbob,sales,10\n', encoding='utf-8')
+        assert department_total(str(answer_file), 'sales') == 13
+        assert overall_average(str(answer_file)) == 6.5
+    assert len(PARSES) == 2
+
+    print("\n✓ Changed answer file test passed!")
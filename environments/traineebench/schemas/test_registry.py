@@ -0,0 +1,59 @@
+"""
+Test script for the evaluation cache of `call_evaluator`.
+"""
+
+import sys
+import importlib
+
+from environments.traineebench.schemas import registry
+
+
+def test_cache_invalidated_by_inputs_and_helpers(tmp_path, monkeypatch):
+    """A cached result is reused until an input file or a helper of the evaluator changes."""
+    monkeypatch.setattr(registry, 'CACHE_EVALUATIONS', True)
+    package_path = tmp_path / 'cached_eval_pkg'
+    package_path.mkdir()
+    (package_path / '__init__.py').write_text('')
+    (package_path / 'helpers.py').write_text('BONUS = 0\n')
+    (package_path / 'evaluation.py').write_text(
+        "from environments.traineebench.schemas.registry import register_evaluator\n"
+        "from cached_eval_pkg import helpers\n"
+        "CALLS = []\n"
+        "\n"
+        "@register_evaluator('test_cached_eval', inputs=('{workspace_path}/answer.txt',))\n"
+        "def evaluate(task_root_path, workspace_path):\n"
+        "    CALLS.append(1)\n"
+        "    with open(f'{workspace_path}/answer.txt') as rf:\n"
+        "        score = int(rf.read()) + helpers.BONUS\n"
+        "    return {'total_score': score, 'full_score': 10, 'notes': ''}\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module('cached_eval_pkg.evaluation')
+
+    task_root_path = tmp_path / 'task'
+    workspace_path = task_root_path / 'workspace'
+    workspace_path.mkdir(parents=True)
+    (workspace_path / 'answer.txt').write_text('3')
+
+    def evaluate():
+        return registry.call_evaluator(
+            'test_cached_eval', task_root_path=str(task_root_path), workspace_path=str(workspace_path)
+        )['total_score']
+
+    assert evaluate() == 3 and evaluate() == 3
+    print(f"Unchanged inputs: {len(module.CALLS)} evaluator call(s)")
+    assert len(module.CALLS) == 1
+
+    (workspace_path / 'answer.txt').write_text('5')
+    assert evaluate() == 5
+    assert len(module.CALLS) == 2
+
+    # A fixed helper invalidates the result even though the evaluator's own file is unchanged
+    (package_path / 'helpers.py').write_text('BONUS = 1\n')
+    registry._code_digest.cache_clear()
+    importlib.reload(sys.modules['cached_eval_pkg.helpers'])
+    assert evaluate() == 6
+    print(f"After changing the input and a helper: {len(module.CALLS)} evaluator calls")
+    assert len(module.CALLS) == 3
+
+    print("\n✓ Evaluation cache test passed!")
@@ -100,71 +100,106 @@ def random_website_monitor_task(seed: int = 1234):
     return None
 
 
+# Tool profiles: only the tools in the `toolset` of a day's tasks are built and shown to the
+# agent. Tools that are not configured for the day are ignored.
+BASE_TOOLS = [
+    'SendMessage', 'SendGroupMessage', 'CreateChatGroup', 'ListUsers', 'ListChatGroups',
+    'calculator', 'all_tasks_done', 'ReadToolOutput',
+]
+FILE_TOOLS = [
+    'OpenFolderInCloudDisk', 'SearchCloudDisk', 'DownloadFileFromCloudDisk', 'DownloadFolderFromCloudDisk',
+    'ExecuteCommand', 'ExecutePython', 'ResetSession', 'QueryWorkspaceData', 'ReadFile', 'GrepFile',
+    'SearchFileContents',
+]
+# Every NPC refers the agent to `CloudDisk:manuals_for_intern.md`, so days without
+# FILE_TOOLS still need to open, download and read it
+MANUAL_TOOLS = ['OpenFolderInCloudDisk', 'DownloadFileFromCloudDisk', 'ReadFile']
+IMAGE_TOOLS = ['ReadAsDataURL']
+CALENDAR_TOOLS = [
+    'GetAvailableRooms', 'FindFreeSlots', 'BookMeeting', 'CancelMeeting', 'AttendMeeting', 'JumpTime',
+]
+WEBSITE_TOOLS = [
+    'GetHistoricalLoadTimes', 'GetRealTimeSystemHealth', 'ListMonitoredServices',
+    'GetPerformanceSummary', 'GetErrorLogs', 'RebootServer',
+]
+
+
 TASK_HUB = {
     "Attendance Statistics": {
         "generator": AttendanceTaskGenerator,
         "param_func": random_attendance_task,
         "task_name": "Attendance Statistics",
-        "deadline": '2025-10-01T20:00:00'
+        "deadline": '2025-10-01T20:00:00',
+        "toolset": BASE_TOOLS + FILE_TOOLS
     },
     "Meeting Attend": {
         "generator": MeetingAttendGenerator,
         "param_func": random_meeting_attend_task,
         "task_name": "Meeting Attend",
-        "deadline": '2025-10-01T20:00:00'
+        "deadline": '2025-10-01T20:00:00',
+        "toolset": BASE_TOOLS + FILE_TOOLS + CALENDAR_TOOLS
     },
     "Meeting Book": {
         "generator": MeetingBookGenerator,
         "param_func": random_meeting_book_task,
         "task_name": "Meeting Book",
-        "deadline": '2025-10-01T20:00:00'
+        "deadline": '2025-10-01T20:00:00',
+        "toolset": BASE_TOOLS + MANUAL_TOOLS + CALENDAR_TOOLS
     },
     "Transaction Data Review": {
         "generator": TransactionGenerator,
         "param_func": random_transaction_task,
         "task_name": "Transaction Data Review",
-        "deadline": '2025-10-01T20:00:00'
+        "deadline": '2025-10-01T20:00:00',
+        "toolset": BASE_TOOLS + FILE_TOOLS
     },
     "Website Monitor": {
         "generator": WebsiteAnalysisGenerator,
         "param_func": random_website_monitor_task,
         "task_name": "Website Monitor",
-        "deadline": '2025-10-01T20:00:00'
+        "deadline": '2025-10-01T20:00:00',
+        "toolset": BASE_TOOLS + FILE_TOOLS + WEBSITE_TOOLS
     },
     "Data Completion": {
         "generator": DataCompletionGenerator,
         "param_func": random_data_completion_task,
         "task_name": "Data Completion",
-        "deadline": '2025-10-01T20:00:00'
+        "deadline": '2025-10-01T20:00:00',
+        "toolset": BASE_TOOLS + FILE_TOOLS
     },
     "KB Link Fix": {
         "generator": KbFixTaskGenerator,
         "param_func": random_kb_fix_task,
         "task_name": "KB Link Fix",
-        "deadline": '2025-10-01T20:00:00'
+        "deadline": '2025-10-01T20:00:00',
+        "toolset": BASE_TOOLS + FILE_TOOLS
     },
     "Sales Analysis": {
         "generator": SalesTaskGenerator,
         "param_func": random_sales_task,
         "task_name": "Sales Analysis",
-        "deadline": '2025-10-01T20:00:00'
+        "deadline": '2025-10-01T20:00:00',
+        "toolset": BASE_TOOLS + FILE_TOOLS
     },
     "ADs Strategy Plan": {
         "generator": AdsStrategyGenerator,
         "param_func": random_ads_strategy_task,
         "task_name": "ADs Strategy Plan",
-        "deadline": '2025-10-01T20:00:00'
+        "deadline": '2025-10-01T20:00:00',
+        "toolset": BASE_TOOLS + FILE_TOOLS + IMAGE_TOOLS
     },
     "Resume Select": {
         "generator": ResumeSelectGenerator,
         "param_func": random_resume_select_task,
         "task_name": "Resume Select",
-        "deadline": '2025-10-01T20:00:00'
+        "deadline": '2025-10-01T20:00:00',
+        "toolset": BASE_TOOLS + FILE_TOOLS
     },
     "Event Planning": {
         "generator": EventTaskGenerator,
         "param_func": random_event_planning_task,
         "task_name": "Event Planning",
-        "deadline": '2025-10-01T20:00:00'
+        "deadline": '2025-10-01T20:00:00',
+        "toolset": BASE_TOOLS + FILE_TOOLS + IMAGE_TOOLS
     }
 }
@@ -11,6 +11,7 @@ from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
 from environment import Environment
+from virtual_server.lazy_assets import LAZY_SUFFIX, render_asset
 
 
 parser = argparse.ArgumentParser(description="InternBench Human Interface Server")
@@ -227,7 +228,8 @@ def _call_tool(tool_name: str, **kwargs) -> JSONResponse:
     if tool is None:
         return JSONResponse(status_code=404, content={"detail": f"Tool '{tool_name}' not found."})
     try:
-        result = tool(**kwargs)
+        # Through the manager, so that writes invalidate the cached results of the agent's tools
+        result = env.tool_manager.call_tool(tool_name, **kwargs)
     except TypeError as exc:
         # Parameter mismatch or validation error coming from the tool layer.
         return JSONResponse(status_code=400, content={"detail": f"Invalid parameters for tool '{tool_name}': {exc}"})
@@ -406,6 +408,11 @@ async def api_list_cloud(payload: ListPathPayload):
 
     entries = []
     for child in sorted(target_dir.iterdir(), key=lambda p: (not p.is_dir(), p.name.lower())):
+        if child.name.endswith(LAZY_SUFFIX):
+            # An asset not rendered yet, rendered when copied
+            child = child.with_name(child.name[:-len(LAZY_SUFFIX)])
+            if child.exists():
+                continue
         entries.append(
             {
                 "name": child.name,
@@ -477,6 +484,7 @@ async def api_copy_to_workspace(payload: CopyFilePayload):
     except ValueError as exc:
         return JSONResponse(status_code=400, content={"detail": str(exc)})
 
+    render_asset(src_abs)
     if not src_abs.exists() or not src_abs.is_file():
         return JSONResponse(status_code=404, content={"detail": "Source file not found"})
 
@@ -489,6 +497,7 @@ async def api_copy_to_workspace(payload: CopyFilePayload):
         shutil.copy2(src_abs, dst_abs)
     except Exception as exc:  # pragma: no cover - safety net
         return JSONResponse(status_code=500, content={"detail": f"Copy failed: {exc}"})
+    env.tool_manager.invalidate(['workspace', 'cloud_disk'])
 
     return JSONResponse(
         content={
@@ -578,6 +587,7 @@ async def api_file_view_save(payload: FileViewSavePayload):
         abs_path.write_text(payload.content, encoding="utf-8")
     except Exception as exc:
         return JSONResponse(status_code=500, content={"detail": f"Failed to save file: {exc}"})
+    env.tool_manager.invalidate(['workspace'])
 
     return JSONResponse(content={"detail": "File saved successfully"})
 
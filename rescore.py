@@ -0,0 +1,107 @@
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from loguru import logger
+from tabulate import tabulate
+
+from environments.traineebench.schemas.registry import evaluate_task
+from environments.traineebench.schemas.answer_cache import evaluation_pass
+
+
+def find_runs(paths: List[str]) -> List[Path]:
+    """Task folders (holding a `config.json` and a `workspace`) under the given paths."""
+    runs = []
+    for path in paths:
+        for root, dirs, filenames in os.walk(path):
+            if 'config.json' in filenames and 'workspace' in dirs:
+                runs.append(Path(root))
+                # The agent's files are not runs
+                dirs[:] = []
+            else:
+                dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+    return sorted(runs)
+
+
+def _init_worker(log_level: str):
+    logger.remove()
+    logger.add(sys.stderr, level=log_level)
+
+
+def _evaluate_run(job: Tuple[str, List[Dict]]) -> List[Dict]:
+    run_path, tasks = job
+    results = []
+    # Answer files shared by several tasks of the run are parsed once
+    with evaluation_pass():
+        for task in tasks:
+            try:
+                results.append(evaluate_task(task, run_path, os.path.join(run_path, 'workspace')))
+            except Exception as e:
+                results.append({"task_name": task.get('task_name', ""), "error": f"{type(e).__name__}: {e}"})
+    return results
+
+
+def rescore(paths: List[str], workers: int = None, log_level: str = 'WARNING') -> Dict[str, List[Dict]]:
+    """
+    Re-evaluates the tasks of finished runs, in parallel, from their saved task folders
+    only: no environment, sandbox or chat server is built.
+
+    Args:
+        paths: Task folders, or folders containing them (e.g. a whole sweep).
+        workers: Number of processes, by default one per CPU.
+        log_level: Log level of the evaluators.
+
+    Returns:
+        The evaluation results of each run, in the format of `Environment.evaluate`; a task
+        whose evaluator raised has an `error` instead of scores.
+    """
+    jobs = []
+    for run_path in find_runs(paths):
+        with open(run_path / 'config.json', 'r', encoding='utf-8') as rf:
+            config = json.load(rf)
+        tasks = [task for task in config['tasks'] if task.get('evaluation')]
+        if tasks:
+            jobs.append((str(run_path), tasks))
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    # Large chunks amortize the transfer, small ones balance slow runs
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(log_level,)) as executor:
+        return dict(zip((run_path for run_path, _ in jobs), executor.map(_evaluate_run, jobs, chunksize=chunksize)))
+
+
+def format_table(results: Dict[str, List[Dict]]) -> str:
+    rows = []
+    total_score = full_score = 0
+    for run_path, evaluation_results in results.items():
+        scored = [r for r in evaluation_results if 'error' not in r]
+        run_total = sum(r['total_score'] for r in scored)
+        run_full = sum(r['full_score'] for r in scored)
+        total_score, full_score = total_score + run_total, full_score + run_full
+        rows.append([run_path, len(evaluation_results), len(evaluation_results) - len(scored), f'{run_total:g}/{run_full:g}'])
+    rows.append(['total', sum(row[1] for row in rows), sum(row[2] for row in rows), f'{total_score:g}/{full_score:g}'])
+    return tabulate(rows, headers=['run', 'tasks', 'errors', 'score'], tablefmt='github')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Re-score finished runs from their saved task folders, in parallel.')
+    parser.add_argument('paths', nargs='+', help='Task folders, or folders containing them.')
+    parser.add_argument('--workers', type=int, default=None, help='Number of processes (default: one per CPU).')
+    parser.add_argument('--output', default='', help='Write the evaluation results of every run to this JSON file.')
+    parser.add_argument('--log-level', default='WARNING', help='Log level of the evaluators.')
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+    results = rescore(args.paths, args.workers, args.log_level)
+    print(format_table(results))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as wf:
+            json.dump(
+                {run_path: {"evaluation_results": evaluation_results} for run_path, evaluation_results in results.items()},
+                wf, ensure_ascii=False, indent=4
+            )
@@ -0,0 +1,69 @@
+"""
+Test script for re-scoring finished runs from their saved task folders.
+"""
+
+import json
+from types import SimpleNamespace
+
+from environment import Environment
+from rescore import find_runs, _evaluate_run
+from tools_parser import ToolManager
+from environments.traineebench.schemas.registry import EVALUATOR_REGISTRY
+
+
+def count_words(*, workspace_path: str, filename: str, expected: int, **kwargs):
+    with open(f'{workspace_path}/{filename}', 'r', encoding='utf-8') as rf:
+        words = len(rf.read().split())
+    return {"total_score": float(words == expected), "full_score": 1.0, "notes": f"{words} words"}
+
+
+def broken(**kwargs):
+    raise KeyError('department')
+
+
+def make_run(root, tasks):
+    """A finished run: its `config.json` and the workspace left by the agent."""
+    (root / 'workspace' / 'reports' / 'workspace').mkdir(parents=True)
+    (root / 'workspace' / 'report.txt').write_text('three short words', encoding='utf-8')
+    # The agent's files are not searched, even when they look like a run
+    (root / 'workspace' / 'reports' / 'config.json').write_text('{}', encoding='utf-8')
+    (root / 'config.json').write_text(json.dumps({"tasks": tasks}), encoding='utf-8')
+    return root
+
+
+def test_rescore_runs(tmp_path, monkeypatch):
+    """Runs are found under a sweep, a raising evaluator is an `error` entry, and scores match Environment.evaluate."""
+    monkeypatch.setitem(EVALUATOR_REGISTRY, 'rescore_count_words', count_words)
+    monkeypatch.setitem(EVALUATOR_REGISTRY, 'rescore_broken', broken)
+    tasks = [
+        {"task_name": "count", "evaluation": {"name": "rescore_count_words", "args": {"filename": "report.txt", "expected": 3}}},
+        {"task_name": "miscount", "evaluation": {"name": "rescore_count_words", "args": {"filename": "report.txt", "expected": 4}}},
+        {"task_name": "chat"},
+    ]
+    good = make_run(tmp_path / 'sweep' / 'model_a' / 'run_0', tasks)
+    broken_tasks = [tasks[0], {"task_name": "broken", "evaluation": {"name": "rescore_broken", "args": {}}}]
+    bad = make_run(tmp_path / 'sweep' / 'model_b' / 'run_0', broken_tasks)
+    # Hidden folders are skipped
+    make_run(tmp_path / 'sweep' / '.trash' / 'run_0', tasks)
+
+    runs = find_runs([str(tmp_path / 'sweep')])
+    print(f"Runs found: {runs}")
+    assert runs == [good, bad]
+
+    # The tasks of a run are evaluated as `rescore` does, from the saved folder only
+    results = _evaluate_run((str(good), [task for task in tasks if task.get('evaluation')]))
+    print(f"Rescored: {results}")
+    env = SimpleNamespace(
+        tasks=tasks, task_root_path=str(good), workspace=str(good / 'workspace'),
+        tool_manager=ToolManager({}), log_path=None, total_tool_calls={},
+    )
+    assert results == Environment.evaluate(env)['evaluation_results']
+    assert [r['total_score'] for r in results] == [1.0, 0.0]
+
+    # A raising evaluator fails its task only
+    results = _evaluate_run((str(bad), broken_tasks))
+    print(f"Rescored with a broken evaluator: {results}")
+    assert results[0]['total_score'] == 1.0
+    assert results[1] == {"task_name": "broken", "error": "KeyError: 'department'"}
+
+    print("\n✓ Rescore test passed!")
@@ -0,0 +1,67 @@
+"""
+Test script for the result cache of ToolManager.call_tool.
+"""
+
+from tools_parser import ToolManager, _tool_effects
+from toolbox.cloud_disk_tool import OpenFolderInCloudDisk
+from toolbox.sandbox_tool import ExecuteCommand
+
+
+def test_result_cache(tmp_path):
+    """Read-only results are reused until a writer of their state runs; errors are not kept."""
+    files = {'a.txt': 'first'}
+    calls = []
+
+    def read_file(name: str) -> str:
+        calls.append(name)
+        return files[name] if name in files else f"Error: `{name}` does not exist."
+
+    def write_file(name: str, content: str) -> str:
+        files[name] = content
+        return 'ok'
+
+    manager = ToolManager({})
+    manager.cache_results = True
+    manager.register_tool('ReadFile', read_file, reads=['workspace'])
+    manager.register_tool('WriteFile', write_file, writes=['workspace'])
+    manager.register_tool('SendMessage', lambda: 'sent', writes=['chat_server'])
+
+    assert manager.call_tool('ReadFile', name='a.txt') == 'first'
+    assert manager.call_tool('ReadFile', name='a.txt') == 'first'
+    print(f"Calls after a repeated read: {calls}")
+    assert calls == ['a.txt']
+
+    # A writer of another state keeps the result, a writer of the workspace drops it
+    manager.call_tool('SendMessage')
+    assert manager.call_tool('ReadFile', name='a.txt') == 'first'
+    assert calls == ['a.txt']
+    manager.call_tool('WriteFile', name='a.txt', content='second')
+    assert manager.call_tool('ReadFile', name='a.txt') == 'second'
+    assert calls == ['a.txt', 'a.txt']
+
+    # Errors are not cached, so the file is found once it exists
+    assert manager.call_tool('ReadFile', name='b.txt').startswith('Error')
+    files['b.txt'] = 'created'
+    assert manager.call_tool('ReadFile', name='b.txt') == 'created'
+    assert calls == ['a.txt', 'a.txt', 'b.txt', 'b.txt']
+
+    print("\n✓ Tool result cache test passed!")
+
+
+def test_commands_invalidate_cloud_disk_reads():
+    """Sandbox commands may write `../cloud_disk`, so they drop cached cloud disk listings."""
+    manager = ToolManager({})
+    manager.cache_results = True
+    listings = []
+    manager.register_tool('OpenFolderInCloudDisk', lambda: listings.append(1) or 'listing', *_tool_effects(OpenFolderInCloudDisk))
+    manager.register_tool('ExecuteCommand', lambda command: 'Exit Code: 0', *_tool_effects(ExecuteCommand))
+
+    manager.call_tool('OpenFolderInCloudDisk')
+    manager.call_tool('OpenFolderInCloudDisk')
+    assert len(listings) == 1
+    manager.call_tool('ExecuteCommand', command='touch ../cloud_disk/new.txt')
+    manager.call_tool('OpenFolderInCloudDisk')
+    print(f"Listings computed: {len(listings)}")
+    assert len(listings) == 2
+
+    print("\n✓ Sandbox invalidation test passed!")
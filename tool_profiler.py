@@ -0,0 +1,258 @@
+import json
+import math
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List, Union
+
+from tabulate import tabulate
+
+
+PROFILE_SUFFIX = '_tool_profile.json'
+
+
+# Tools mostly report failures in their result instead of raising
+ERROR_PREFIXES = ('[Error]', 'Error', 'An unexpected error', 'An error occurred')
+
+
+def is_error_result(result) -> bool:
+    if isinstance(result, dict):
+        return 'error' in result
+    return isinstance(result, str) and result.lstrip().startswith(ERROR_PREFIXES)
+
+
+class Histogram:
+    """
+    A log-linear histogram in the style of HdrHistogram.
+
+    Each power of two is split into `SUB_BUCKETS` linear buckets, so any recorded value
+    is reproduced by its bucket within 1/SUB_BUCKETS (about 6%) at every magnitude, in
+    constant memory and O(1) per record. Histograms of different episodes merge by
+    adding bucket counts.
+
+    Example:
+        h = Histogram()
+        h.record(1250)
+        h.percentile(99)
+    """
+    SUB_BUCKETS = 16
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        if value < 1:
+            return 0
+        exponent = int(math.log2(value))
+        sub = int((value / (1 << exponent) - 1) * self.SUB_BUCKETS)
+        return 1 + exponent * self.SUB_BUCKETS + min(sub, self.SUB_BUCKETS - 1)
+
+    def _value(self, index: int) -> float:
+        """Upper bound of a bucket."""
+        if index == 0:
+            return 1.0
+        exponent, sub = divmod(index - 1, self.SUB_BUCKETS)
+        return (1 << exponent) * (1 + (sub + 1) / self.SUB_BUCKETS)
+
+    def record(self, value: float):
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self._value(index), self.max)
+        return self.max
+
+    def merge(self, other: 'Histogram'):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count, 'total': self.total,
+            'min': self.min if self.count else 0, 'max': self.max,
+            'buckets': {str(k): v for k, v in sorted(self.buckets.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Histogram':
+        h = cls()
+        h.buckets = {int(k): v for k, v in data['buckets'].items()}
+        h.count, h.total, h.max = data['count'], data['total'], data['max']
+        h.min = data['min'] if h.count else math.inf
+        return h
+
+
+class ToolProfiler:
+    """
+    Per-tool call counts, errors, result cache hits, wall time (microseconds) and result sizes (bytes).
+
+    `ToolManager.call_tool` records every call; `Environment` adds result sizes and
+    evaluator timings (as `evaluator:<name>`) and dumps the profile of an episode next
+    to its log. Profiles of many episodes and runs are aggregated with
+    `python tool_profiler.py outputs/ ...`.
+    """
+    def __init__(self):
+        self.latency: Dict[str, Histogram] = {}
+        self.result_size: Dict[str, Histogram] = {}
+        self.calls: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.cache_hits: Dict[str, int] = {}
+
+    def record(self, name: str, seconds: float, error: bool = False):
+        if name not in self.latency:
+            self.latency[name] = Histogram()
+            self.result_size[name] = Histogram()
+            self.calls[name] = 0
+            self.errors[name] = 0
+            self.cache_hits[name] = 0
+        self.latency[name].record(seconds * 1e6)
+        self.calls[name] += 1
+        if error:
+            self.errors[name] += 1
+
+    def record_error(self, name: str):
+        """Counts an error reported in the result of an already recorded call."""
+        if name in self.errors:
+            self.errors[name] += 1
+
+    def record_cache_hit(self, name: str):
+        """Marks an already recorded call as served from the tool result cache."""
+        if name in self.cache_hits:
+            self.cache_hits[name] += 1
+
+    def record_result_size(self, name: str, num_bytes: int):
+        if name in self.result_size:
+            self.result_size[name].record(num_bytes)
+
+    def timed(self, name: str):
+        """Context manager recording the wall time of a block, and an error if it raises."""
+        return _Timer(self, name)
+
+    def merge(self, other: 'ToolProfiler'):
+        for name in other.latency:
+            if name not in self.latency:
+                self.latency[name] = Histogram()
+                self.result_size[name] = Histogram()
+                self.calls[name] = 0
+                self.errors[name] = 0
+                self.cache_hits[name] = 0
+            self.latency[name].merge(other.latency[name])
+            self.result_size[name].merge(other.result_size[name])
+            self.calls[name] += other.calls[name]
+            self.errors[name] += other.errors[name]
+            self.cache_hits[name] += other.cache_hits[name]
+
+    def summary(self) -> Dict[str, Dict]:
+        """Compact per-tool statistics, hottest tools (by total time) first."""
+        rows = {}
+        for name in sorted(self.latency, key=lambda n: -self.latency[n].total):
+            latency, size = self.latency[name], self.result_size[name]
+            rows[name] = {
+                'calls': self.calls[name],
+                'errors': self.errors[name],
+                'cache_hits': self.cache_hits[name],
+                'total_s': round(latency.total / 1e6, 3),
+                'p50_ms': round(latency.percentile(50) / 1e3, 2),
+                'p90_ms': round(latency.percentile(90) / 1e3, 2),
+                'p99_ms': round(latency.percentile(99) / 1e3, 2),
+                'max_ms': round(latency.max / 1e3, 2),
+                'mean_result_bytes': round(size.total / size.count) if size.count else 0,
+                'max_result_bytes': int(size.max),
+            }
+        return rows
+
+    def format_table(self) -> str:
+        rows = self.summary()
+        if not rows:
+            return 'No tool calls recorded.'
+        headers = ['tool'] + list(next(iter(rows.values())).keys())
+        return tabulate([[name] + list(row.values()) for name, row in rows.items()], headers=headers)
+
+    def to_dict(self) -> Dict:
+        return {
+            name: {
+                'calls': self.calls[name],
+                'errors': self.errors[name],
+                'cache_hits': self.cache_hits[name],
+                'latency_us': self.latency[name].to_dict(),
+                'result_bytes': self.result_size[name].to_dict(),
+            }
+            for name in self.latency
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ToolProfiler':
+        profiler = cls()
+        for name, entry in data.items():
+            profiler.calls[name] = entry['calls']
+            profiler.errors[name] = entry['errors']
+            profiler.cache_hits[name] = entry.get('cache_hits', 0)
+            profiler.latency[name] = Histogram.from_dict(entry['latency_us'])
+            profiler.result_size[name] = Histogram.from_dict(entry['result_bytes'])
+        return profiler
+
+    def dump(self, path: Union[str, Path]):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as wf:
+            json.dump({'summary': self.summary(), 'histograms': self.to_dict()}, wf, ensure_ascii=False, indent=4)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'ToolProfiler':
+        with open(path, 'r', encoding='utf-8') as rf:
+            return cls.from_dict(json.load(rf)['histograms'])
+
+    @classmethod
+    def aggregate(cls, paths: List[Union[str, Path]]) -> 'ToolProfiler':
+        """Merge the profiles found in the given files and folders (searched recursively)."""
+        total = cls()
+        for path in map(Path, paths):
+            files = sorted(path.rglob(f'*{PROFILE_SUFFIX}')) if path.is_dir() else [path]
+            for file in files:
+                total.merge(cls.load(file))
+        return total
+
+
+class _Timer:
+    def __init__(self, profiler: ToolProfiler, name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, time.perf_counter() - self.start, error=exc_type is not None)
+        return False
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Aggregate per-tool latency profiles of episodes and runs.')
+    parser.add_argument('paths', nargs='+', help=f'`*{PROFILE_SUFFIX}` files or folders containing them.')
+    parser.add_argument('--output', default='', help='Also write the merged profile to this file.')
+    args = parser.parse_args()
+
+    merged = ToolProfiler.aggregate(args.paths)
+    print(merged.format_table())
+    if args.output:
+        merged.dump(args.output)
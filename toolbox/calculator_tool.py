@@ -168,6 +168,10 @@ def calculator(expression: str) -> str:
     return format_number(result)
 
 
+# Pure: the result only depends on the expression
+calculator.READS = ()
+
+
 if __name__ == '__main__':
     print(calculator("1+2"))  
     print(calculator("1+2*3"))    
@@ -8,6 +8,8 @@ from virtual_server.meeting_calendar import MeetingRoomCalendar
 
 
 class GetAvailableRooms:
+    READS = ('meeting_calendar',)
+
     def __init__(self, meeting_calendar: MeetingRoomCalendar):
         self.meeting_calendar = meeting_calendar
 
@@ -31,7 +33,52 @@ class GetAvailableRooms:
         return output_message
 
 
+class FindFreeSlots:
+    READS = ('meeting_calendar',)
+
+    def __init__(self, meeting_calendar: MeetingRoomCalendar):
+        self.meeting_calendar = meeting_calendar
+
+    def __call__(
+            self, attendees: str, duration_minutes: int,
+            window_start: str, window_end: str, max_results: int = 5
+        ) -> str:
+        """
+        Find the earliest time slots in which all the given people and a meeting room are free. Use this before `BookMeeting` instead of trying rooms and times one by one.
+
+        Args:
+            attendees: Comma-separated names of everyone who must attend, including yourself. e.g. `Alice Smith,Jeff Young,Brian Lewis`
+            duration_minutes: Length of the meeting in minutes, e.g. 60.
+            window_start: Earliest acceptable start time. ISO datetime string, e.g. 2025-10-20T09:00:00
+            window_end: Latest acceptable end time. ISO datetime string, e.g. 2025-10-20T17:00:00
+            max_results: Maximum number of slots to return.
+        """
+        try:
+            s = datetime.fromisoformat(window_start)
+            e = datetime.fromisoformat(window_end)
+        except ValueError:
+            output_message = "The input parameters `window_start` and `window_end` must be in ISO format like `2025-10-20T10:00:00`"
+            logger.info(output_message)
+            return output_message
+
+        people = [name.strip() for name in attendees.split(',') if name.strip()]
+        slots = self.meeting_calendar.find_free_slots(
+            people, int(duration_minutes), s, e, max_results=int(max_results)
+        )
+        if not slots:
+            output_message = f"[Calendar System] No free slot of {duration_minutes} minutes found for {', '.join(people)} between {window_start} and {window_end}"
+        else:
+            output_message = f"[Calendar System] Earliest free slots for {', '.join(people)}:\n"
+            output_message += '\n'.join(
+                f"   - {start.isoformat()} to {end.isoformat()} in {room}" for start, end, room in slots
+            )
+        logger.info(output_message)
+        return output_message
+
+
 class BookMeeting:
+    WRITES = ('meeting_calendar',)
+
     def __init__(self, meeting_calendar: MeetingRoomCalendar):
         self.meeting_calendar = meeting_calendar
 
@@ -78,6 +125,8 @@ class BookMeeting:
             
 
 class JumpTime:
+    WRITES = ('clock',)
+
     def __init__(self, meeting_calendar: MeetingRoomCalendar) -> None:
         self.meeting_calendar = meeting_calendar
 
@@ -94,6 +143,9 @@ class JumpTime:
         
 
 class AttendMeeting:
+    # Attending also moves the clock to the end of the meeting
+    WRITES = ('meeting_calendar', 'clock')
+
     def __init__(self, meeting_calendar: MeetingRoomCalendar):
         self.meeting_calendar = meeting_calendar
 
@@ -125,6 +177,8 @@ class AttendMeeting:
 
 
 class CancelMeeting:
+    WRITES = ('meeting_calendar',)
+
     def __init__(self, meeting_calendar: MeetingRoomCalendar):
         self.meeting_calendar = meeting_calendar
 
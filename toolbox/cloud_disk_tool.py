@@ -6,6 +6,9 @@ from loguru import logger
 
 
 class DownloadFileFromCloudDisk:
+    # Deferred assets are rendered into the cloud disk on their first download
+    WRITES = ('workspace', 'cloud_disk')
+
     def __init__(self, cloud_disk: "CloudDisk"):
         self.cloud_disk = cloud_disk
     def __call__(self, file_path: str, target_path: str) -> str:
@@ -31,23 +34,70 @@ class DownloadFileFromCloudDisk:
             return f"An unexpected error occurred while trying to download the file: {str(e)}"
         
 
+class DownloadFolderFromCloudDisk:
+    WRITES = ('workspace', 'cloud_disk')
+
+    def __init__(self, cloud_disk: "CloudDisk"):
+        self.cloud_disk = cloud_disk
+    def __call__(self, source: str, target_path: str = './') -> str:
+        """
+        Download many files from the cloud disk to the local workspace in one call: a whole folder, or all files matching a glob pattern. Prefer this over downloading files one by one.
+
+        Args:
+            source: A folder on the cloud disk like `sales/` (everything inside it is downloaded, keeping its subfolders), or a glob pattern like `sales/*.csv` or `attendance/**/*.csv` where `*` matches within a folder and `**` matches any number of folders. Do not include prefixes like `CloudDisk:` or `CloudDisk://`.
+            target_path: The folder in the local workspace to download into, like `./` or `data/sales`. Files keep their paths relative to the source folder (for a pattern, relative to the folder before the first wildcard).
+
+        Returns:
+            A short manifest with the number of files, their total size and the downloaded paths, or an error message.
+        """
+        try:
+            return self.cloud_disk.download_many(source=source, target_path=target_path)
+        except Exception as e:
+            return f"An unexpected error occurred while trying to download the files: {str(e)}"
+
+
 class OpenFolderInCloudDisk:
+    READS = ('cloud_disk',)
+
     def __init__(self, cloud_disk: "CloudDisk"):
         self.cloud_disk = cloud_disk
-    def __call__(self, folder_path: str) -> str:
+    def __call__(self, folder_path: str, recursive: bool = False) -> str:
         """
         List the contents of a specified folder on the cloud disk.
 
         Args:
             folder_path: The path of the folder on the cloud disk to be opened/listed. like `financial/approval`, `financial/`. Must be a non-empty string. **Use `./` to view files and folders in the root directory**. Do not include prefixes like `CloudDisk:` or `CloudDisk://`.
+            recursive: If true, list everything inside the folder and all its subfolders at once, with file sizes. Use `./` with `recursive=true` to see the whole cloud disk in one call.
             
         Returns:
             A string containing the space-separated names of files and subdirectories in the folder. Directories are appended with a '/'. Returns an error message if the path is invalid or does not exist.
         """
         try:
-            response = self.cloud_disk.open_folder(folder_path=folder_path)
+            response = self.cloud_disk.open_folder(folder_path=folder_path, recursive=recursive)
             # logger.info(f'[OpenFolderInCloudDisk]\n{response}')
             return response
         except Exception as e:
             # logger.info(f'[DownloadFileFromCloudDisk] An unexpected error occurred while trying to download the file: {str(e)}')
-            return f"An unexpected error occurred while trying to open the folder: {str(e)}"
\ No newline at end of file
+            return f"An unexpected error occurred while trying to open the folder: {str(e)}"
+
+
+class SearchCloudDisk:
+    READS = ('cloud_disk',)
+
+    def __init__(self, cloud_disk: "CloudDisk"):
+        self.cloud_disk = cloud_disk
+    def __call__(self, pattern: str, folder_path: str = './') -> str:
+        """
+        Search the whole cloud disk for files and folders in one call, instead of opening folders one by one.
+
+        Args:
+            pattern: Either a glob pattern over paths, where `*` matches within a folder and `**` matches any number of folders, like `**/*.csv`, `sales/2025-*/*.json`, `**/attendance*`; or a plain name fragment like `manual`, which finds every file or folder whose name contains it (case-insensitive).
+            folder_path: Only search inside this folder of the cloud disk. Defaults to the root directory `./`.
+
+        Returns:
+            The matching paths on the cloud disk (usable as `file_path` for downloads), with file sizes; folders end with '/'.
+        """
+        try:
+            return self.cloud_disk.search(pattern=pattern, folder_path=folder_path)
+        except Exception as e:
+            return f"An unexpected error occurred while searching the cloud disk: {str(e)}"
@@ -1,19 +1,25 @@
 import os
-import base64
 import mimetypes
 from pathlib import Path
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any
+if TYPE_CHECKING:
+    from virtual_server.cloud_disk import CloudDisk
 
-from virtual_server.cloud_disk import CloudDisk
+from virtual_server.image_cache import ImageEncoder
 
 # TODO: support more file types beyond image
 class ReadAsDataURL:
     MAX_BYTES = 10 * 1024 * 1024  # 10MB limit
     ALLOWED_MIME_PREFIXES = ("image/png", "image/jpeg", "image/webp")
+    READS = ('workspace', 'cloud_disk')
+    # A deferred asset is rendered into the cloud disk on its first read
+    WRITES = ('cloud_disk',)
 
     def __init__(self, cloud_disk: "CloudDisk"):
         self.cloud_disk = cloud_disk
         self.workspace_path = cloud_disk.root_path.parent / 'workspace'
+        # Downscaled, re-encoded images keep the payload small in every later LLM request
+        self.encoder = ImageEncoder(getattr(cloud_disk, 'image_config', None))
 
     def __call__(self, file_path: str, text: str = "") -> Dict[str, Any]:
         """
@@ -33,6 +39,9 @@ class ReadAsDataURL:
         #     return {"error": f"File not found: {file_path}"}
 
         local_path =  (self.workspace_path / file_path).resolve()
+        if not local_path.exists():
+            # Rendered assets such as heatmaps may be deferred until first access
+            self.cloud_disk.render_lazy_asset(file_path)
 
         cloud_path = (self.cloud_disk.root_path / file_path).resolve()
 
@@ -71,8 +80,7 @@ class ReadAsDataURL:
         if not any(mime.startswith(p.replace("image/", "image/")) for p in self.ALLOWED_MIME_PREFIXES):
             return {"error": f"Unsupported mime type: {mime}"}
 
-        with open(real_path, "rb") as f:
-            b64 = base64.b64encode(f.read()).decode("utf-8")
+        mime, b64, _ = self.encoder.encode(real_path, mime)
 
         data_url = f"data:{mime};base64,{b64}"
         content = []
@@ -0,0 +1,68 @@
+from typing import TYPE_CHECKING, Optional
+if TYPE_CHECKING:
+    from virtual_server.file_reader import FileReader
+
+from loguru import logger
+
+
+class ReadFile:
+    READS = ('workspace',)
+
+    def __init__(self, file_reader: "FileReader"):
+        self.file_reader = file_reader
+
+    def __call__(
+            self, file_path: str, start_line: int = 1, num_lines: int = 100,
+            byte_offset: Optional[int] = None, num_bytes: int = 4096
+        ) -> str:
+        """
+        Read part of a text file in your workspace with line numbers, instead of printing the whole file. Works on very large files: only the requested part is read. Use `start_line=1` for the head and a negative `start_line` for the tail, e.g. `start_line=-50` for the last 50 lines.
+
+        Args:
+            file_path: Path of the file in your workspace, e.g. `logs/server.log`.
+            start_line: First line to read (1-based); negative values count from the end of the file.
+            num_lines: Number of lines to read (at most 500).
+            byte_offset: Optional. Read raw bytes from this offset instead of lines (negative values count from the end), e.g. for files without line breaks.
+            num_bytes: Number of bytes to read with `byte_offset` (at most 65536).
+        """
+        try:
+            if byte_offset is not None:
+                output_message = self.file_reader.read_bytes(file_path, byte_offset, num_bytes)
+            else:
+                output_message = self.file_reader.read_lines(file_path, start_line, num_lines)
+        except (ValueError, FileNotFoundError) as e:
+            output_message = f"Error: {e}"
+        except Exception as e:
+            output_message = f"An unexpected error occurred while reading the file: {str(e)}"
+        logger.info(output_message[:500])
+        return output_message
+
+
+class GrepFile:
+    READS = ('workspace',)
+
+    def __init__(self, file_reader: "FileReader"):
+        self.file_reader = file_reader
+
+    def __call__(
+            self, file_path: str, pattern: str, context: int = 0,
+            ignore_case: bool = False, max_matches: int = 20
+        ) -> str:
+        """
+        Search a text file in your workspace for lines matching a regular expression and show them with their line numbers and surrounding lines, like `grep -n -C`. Matching lines are marked with `:`, context lines with `-`.
+
+        Args:
+            file_path: Path of the file in your workspace, e.g. `logs/server.log`.
+            pattern: Regular expression (Python syntax), e.g. `ERROR|Timeout` or `user_id=42\\b`.
+            context: Number of lines to show before and after each match (at most 20).
+            ignore_case: Whether to ignore upper and lower case.
+            max_matches: Maximum number of matching lines to show (at most 100).
+        """
+        try:
+            output_message = self.file_reader.grep(file_path, pattern, context, ignore_case, max_matches)
+        except (ValueError, FileNotFoundError) as e:
+            output_message = f"Error: {e}"
+        except Exception as e:
+            output_message = f"An unexpected error occurred while searching the file: {str(e)}"
+        logger.info(output_message[:500])
+        return output_message
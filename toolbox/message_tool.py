@@ -5,6 +5,8 @@ from virtual_server.chat_server import ChatServer
 
 
 class CreateChatGroup():
+    WRITES = ('chat_server',)
+
     def __init__(self, chat_server: ChatServer):
         self.chat_server = chat_server
     
@@ -31,6 +33,8 @@ class CreateChatGroup():
 
 
 class SendMessage():
+    WRITES = ('chat_server',)
+
     def __init__(self, chat_server: ChatServer):
         self.chat_server = chat_server
     
@@ -58,6 +62,8 @@ class SendMessage():
     
 
 class SendGroupMessage():
+    WRITES = ('chat_server',)
+
     def __init__(self, chat_server: ChatServer):
         self.chat_server = chat_server
 
@@ -85,6 +91,8 @@ class SendGroupMessage():
         
 
 class ListUsers():
+    READS = ('chat_server',)
+
     def __init__(self, chat_server: ChatServer):
         self.chat_server = chat_server
 
@@ -102,6 +110,8 @@ class ListUsers():
 
 
 class ListChatGroups():
+    READS = ('chat_server',)
+
     def __init__(self, chat_server: ChatServer):
         self.chat_server = chat_server
 
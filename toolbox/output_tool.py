@@ -0,0 +1,26 @@
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from virtual_server.output_store import OutputStore
+
+from loguru import logger
+
+
+class ReadToolOutput:
+    # Artifacts live in the workspace, where sandbox commands may change them
+    READS = ('workspace',)
+
+    def __init__(self, output_store: "OutputStore"):
+        self.output_store = output_store
+
+    def __call__(self, handle: str, offset: int = 0, length: int = 4000) -> str:
+        """
+        Read a page of a long tool output that was saved in your workspace instead of being shown in full. Long outputs only show their beginning and end, together with a handle like `.tool_outputs/ExecuteCommand-3f2a9c1e.txt`.
+
+        Args:
+            handle: The handle given with the shortened output.
+            offset: Position (in characters) of the first character to read, e.g. the offset suggested with the shortened output or at the end of the previous page.
+            length: Number of characters to read; long pages are shortened to the page limit.
+        """
+        output_message = self.output_store.read(handle, offset, length)
+        logger.info(f"[Output Store] Read '{handle}' from offset {offset}.")
+        return output_message
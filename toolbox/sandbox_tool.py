@@ -1,32 +1,44 @@
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    # Either sandbox backend may be passed; importing `docker` is not needed for the local one
+    from virtual_server.docker_sandbox import DockerSandbox
+    from virtual_server.output_store import OutputStore
+
 from loguru import logger
 
-from virtual_server.docker_sandbox import DockerSandbox
+from virtual_server.sandbox_utils import CommandResult
 
 class ExecuteCommand:
     """A tool to execute shell commands in a Docker sandbox."""
     MAX_DISPLAY_LEN = 10240
+    # Docker only mounts the workspace, but local commands can also reach `../cloud_disk`
+    WRITES = ('workspace', 'cloud_disk')
 
-    def __init__(self, docker_sandbox: DockerSandbox):
+    def __init__(self, docker_sandbox: "DockerSandbox", output_store: "OutputStore" = None):
         """
         Initializes the ExecuteCommand tool.
 
         Args:
             sandbox: An instance of DockerSandbox where commands will be executed.
+            output_store: Optional; long outputs are then kept up to its `max_output_bytes`
+                and shortened by the environment, which saves them in the workspace.
         """
         self.sandbox = docker_sandbox
+        self.max_output_bytes = output_store.max_output_bytes if output_store else self.MAX_DISPLAY_LEN
 
-    def _truncate(self, value) -> str:
+    def _format_output(self, result: CommandResult) -> str:
         """
-        Truncates the given value to MAX_DISPLAY_LEN characters if necessary.
+        Formats the (already streamed and truncated) command output.
         Appends a note about the original total length when truncation occurs.
         """
-        s = "" if value is None else str(value)
-        real_length = len(s)
-        if real_length > self.MAX_DISPLAY_LEN:
-            return s[:self.MAX_DISPLAY_LEN] + (
-                f"...(output total length {real_length} characters, display 1000 characters)"
+        output_str = result.output
+        if result.truncated:
+            output_str += (
+                f"...(output total length {result.output_bytes} bytes, display {self.max_output_bytes} bytes)"
             )
-        return s
+        if result.timed_out:
+            output_str += f"\n[Timeout] The command was killed after {result.wall_time:.0f} seconds."
+        return output_str
 
     def __call__(self, command: str) -> str:
         """
@@ -40,16 +52,63 @@ class ExecuteCommand:
             return "Error: Command must be a non-empty string."
             
         try:
-            exit_code, output = self.sandbox.run_command(command)
-            
-            # Truncate exit_code and output separately if they exceed 1000 chars
-            exit_code_str = self._truncate(exit_code)
-            output_str = self._truncate(output)
+            # Output beyond max_output_bytes is dropped while streaming, not after buffering
+            if self.sandbox.persistent_shell:
+                result = self.sandbox.get_session('shell').run(
+                    command, timeout=self.sandbox.command_timeout, max_output_bytes=self.max_output_bytes
+                )
+            else:
+                result = self.sandbox.execute(command, max_output_bytes=self.max_output_bytes)
             
-            formatted_output = f"Exit Code: {exit_code_str}\nOutput:\n{output_str}"
+            formatted_output = (
+                f"Exit Code: {result.exit_code}\nOutput:\n{self._format_output(result)}\n"
+                f"Usage: {result.usage_str()}"
+            )
             # logger.info(formatted_output)
             return formatted_output
         except Exception as e:
             logger.error(f"An error occurred while executing the command: {str(e)}")
             return f"An error occurred while executing the command: {str(e)}"
 
+
+class ExecutePython(ExecuteCommand):
+    """A tool to run Python code in a persistent interpreter inside the sandbox."""
+
+    def __call__(self, code: str) -> str:
+        """
+        Runs Python code in a persistent Python session in your workspace. Variables, imports and loaded data are kept between calls, so load a file once (e.g. `df = pd.read_csv('sales.csv')`) and reuse `df` in later calls. The value of the last expression is printed, like in an interactive interpreter.
+
+        Args:
+            code: The Python code to run. Must be a non-empty string.
+        """
+        if not code or not isinstance(code, str):
+            logger.error("Agent outputs empty Python code.")
+            return "Error: Code must be a non-empty string."
+
+        try:
+            result = self.sandbox.get_session('python').run(
+                code, timeout=self.sandbox.command_timeout, max_output_bytes=self.max_output_bytes
+            )
+            return (
+                f"Exit Code: {result.exit_code}\nOutput:\n{self._format_output(result)}\n"
+                f"Usage: {result.usage_str()}"
+            )
+        except Exception as e:
+            logger.error(f"An error occurred while executing the code: {str(e)}")
+            return f"An error occurred while executing the code: {str(e)}"
+
+
+class ResetSession:
+    """A tool to restart the persistent shell and Python sessions."""
+
+    def __init__(self, docker_sandbox: "DockerSandbox"):
+        self.sandbox = docker_sandbox
+
+    def __call__(self) -> str:
+        """
+        Restarts the persistent shell and Python sessions of the sandbox, e.g. when a command hangs or the state became confusing. All variables, the working directory and environment variables are reset; files in your workspace are kept.
+        """
+        self.sandbox.reset_sessions()
+        output_message = "[Sandbox] Sessions were reset. The next command starts in a clean session."
+        logger.info(output_message)
+        return output_message
@@ -0,0 +1,28 @@
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from virtual_server.search_index import SearchIndex
+
+from loguru import logger
+
+
+class SearchFileContents:
+    READS = ('cloud_disk', 'workspace')
+
+    def __init__(self, search_index: "SearchIndex"):
+        self.search_index = search_index
+
+    def __call__(self, query: str, scope: str = 'all', max_results: int = 5) -> str:
+        """
+        Find which text files (documents, manuals, CSV, JSON, logs, ...) of the cloud disk and your workspace mention some words, without downloading or reading them one by one. Files are ranked by relevance and shown with their best matching lines and line numbers. Files of the cloud disk still have to be downloaded before you can process them in your workspace.
+
+        Args:
+            query: Words to look for, e.g. `travel reimbursement limit`. Case and word order do not matter.
+            scope: Where to search: `all` (default), `cloud_disk` or `workspace`.
+            max_results: Number of files to show (at most 20).
+        """
+        try:
+            output_message = self.search_index.search(query, scope, max_results)
+        except Exception as e:
+            output_message = f"An unexpected error occurred while searching the files: {str(e)}"
+        logger.info(output_message[:500])
+        return output_message
@@ -0,0 +1,29 @@
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from virtual_server.workspace_db import WorkspaceDatabase
+
+from loguru import logger
+
+
+class QueryWorkspaceData:
+    # The database is query-only and reloads files changed in the workspace
+    READS = ('workspace',)
+
+    def __init__(self, workspace_db: "WorkspaceDatabase"):
+        self.workspace_db = workspace_db
+
+    def __call__(self, sql: str) -> str:
+        """
+        Run a read-only SQL (SQLite) query over the CSV and JSON files in your workspace, without starting a script. Every data file is a table named after its path without the extension, with other characters replaced by `_`: `sales.csv` is `sales` and `hr/attendance 2025.json` is `hr_attendance_2025`. Column types (INTEGER, REAL, TEXT) are inferred from the data. Prefer it over scripts for filtering, joins and aggregates, e.g. `SELECT region, SUM(amount) AS total FROM sales GROUP BY region ORDER BY total DESC`.
+
+        Args:
+            sql: A single SQLite SELECT statement (CTEs with `WITH` are allowed).
+        """
+        if not sql or not isinstance(sql, str):
+            return "Error: The query must be a non-empty string."
+        try:
+            output_message = self.workspace_db.query(sql)
+        except Exception as e:
+            output_message = f"An unexpected error occurred while running the query: {str(e)}"
+        logger.info(f"[Workspace DB] {sql}\n{output_message}")
+        return output_message
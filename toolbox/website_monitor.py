@@ -63,6 +63,9 @@ MOCK_ERROR_LOGS = {
 # --- Tool Functions (Classes) ---
 
 class GetHistoricalLoadTimes:
+    # Served from the static mock data
+    READS = ()
+
     def __call__(self, time_window: str = "last_7_days", page_url: Optional[str] = None) -> List[Dict]:
         """
         Retrieves historical average page load times for a given time window.
@@ -140,6 +143,8 @@ class GetRealTimeSystemHealth:
 # --- Redundant/Trap Functions ---
 
 class ListMonitoredServices:
+    READS = ()
+
     def __call__(self) -> List[str]:
         """
         Lists the IDs of all services currently being monitored.
@@ -150,6 +155,8 @@ class ListMonitoredServices:
         return result
 
 class GetPerformanceSummary:
+    READS = ()
+
     def __call__(self, time_window: str = "last_24_hours") -> Dict:
         """
         Provides a high-level, summarized overview of website performance.
@@ -178,6 +185,8 @@ class GetPerformanceSummary:
         return result
 
 class GetErrorLogs:
+    READS = ()
+
     def __call__(self, server_id: str, lines: int = 20) -> List[str]:
         """
         Retrieves the most recent lines from a server's error log.
@@ -1,11 +1,175 @@
 import importlib
+import importlib.util
 import inspect
+import hashlib
+import json
 import os
 import re
-from typing import Callable, List, Union, get_origin, get_args, Dict, Any
+import sys
+import types
+from pathlib import Path
+from typing import Callable, Collection, List, Union, get_origin, get_args, Dict, Any, Optional, Tuple
 import inspect
 from rich import print
 
+from tool_profiler import ToolProfiler, is_error_result
+
+
+# Tool schemas cached across processes, see `ToolSchemaCache`
+SCHEMA_CACHE_PATH = Path(os.environ.get(
+    'EVOENV_TOOL_SCHEMA_CACHE', Path.home() / '.cache' / 'evoenv' / 'tool_schemas.json'
+))
+
+
+class ToolSchemaCache:
+    """
+    Schemas of tool classes, computed once per tool class and version.
+
+    A schema is keyed by the tool's class, its optional `SCHEMA_VERSION` attribute and the
+    size and mtime of the module file, so editing a tool's docstring or signature
+    invalidates it. The cache lives in memory for the process and in a JSON file
+    (`EVOENV_TOOL_SCHEMA_CACHE`, default `~/.cache/evoenv/tool_schemas.json`), so creating
+    an environment does no signature inspection or docstring parsing once the tools have
+    been seen.
+    """
+    def __init__(self, path: Optional[Path] = SCHEMA_CACHE_PATH):
+        self.path = Path(path) if path else None
+        self.schemas: Optional[Dict[str, Dict]] = None
+        self.dirty = False
+
+    @staticmethod
+    def key(tool_name: str, tool_obj: Callable) -> Optional[str]:
+        owner = getattr(tool_obj, '__self__', None)
+        owner = type(owner) if owner is not None else tool_obj
+        module = sys.modules.get(getattr(owner, '__module__', ''), None)
+        module_file = getattr(module, '__file__', None)
+        if not module_file:
+            return None
+        st = os.stat(module_file)
+        version = getattr(owner, 'SCHEMA_VERSION', '')
+        return f'{owner.__module__}.{owner.__qualname__}:{tool_name}:{version}:{st.st_size}:{st.st_mtime_ns}'
+
+    def _load(self) -> Dict[str, Dict]:
+        if self.schemas is None:
+            self.schemas = {}
+            if self.path and self.path.is_file():
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as rf:
+                        self.schemas = json.load(rf)
+                except (OSError, ValueError):
+                    self.schemas = {}
+        return self.schemas
+
+    def get(self, tool_name: str, tool_obj: Callable) -> Dict:
+        key = self.key(tool_name, tool_obj)
+        if key is None:
+            return generate_tool_schema(tool_name, tool_obj)
+        schemas = self._load()
+        schema = schemas.get(key)
+        if schema is None:
+            schema = generate_tool_schema(tool_name, tool_obj)
+            schemas[key] = schema
+            self.dirty = True
+        return schema
+
+    def save(self):
+        if not (self.path and self.dirty):
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Drop entries of older versions of the same tools
+            latest = {}
+            for key, schema in self.schemas.items():
+                latest[key.rsplit(':', 3)[0]] = (key, schema)
+            content = json.dumps(dict(latest.values()), ensure_ascii=False)
+            tmp_path = self.path.with_name(f'.{self.path.name}.{os.getpid()}.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as wf:
+                wf.write(content)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except (OSError, TypeError) as e:
+            print(f"Could not write the tool schema cache '{self.path}': {e}")
+
+
+SCHEMA_CACHE = ToolSchemaCache()
+
+# Static manifest of a tools folder, written by `python tools_parser.py --write-manifest`
+MANIFEST_NAME = 'manifest.json'
+# Tools of a module listed in the manifest are imported on their first call; `EVOENV_LAZY_TOOLS=0` disables it
+LAZY_TOOLS = os.environ.get('EVOENV_LAZY_TOOLS', '1') != '0'
+# Results of read-only tools are memoized per episode; `EVOENV_TOOL_RESULT_CACHE=0` disables it
+CACHE_TOOL_RESULTS = os.environ.get('EVOENV_TOOL_RESULT_CACHE', '1') != '0'
+
+
+def _tools_folder_path(tools_folder: str) -> Path:
+    spec = importlib.util.find_spec(tools_folder)
+    if spec is not None and spec.submodule_search_locations:
+        return Path(list(spec.submodule_search_locations)[0])
+    return Path(tools_folder)
+
+
+def _source_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+_manifests: Dict[str, Dict] = {}
+
+
+def _tool_effects(tool: Any) -> Tuple[Optional[List[str]], Optional[List[str]]]:
+    """
+    The state a tool declares to read and to write, through its `READS` and `WRITES`
+    attributes (names of servers, plus `workspace` for the agent's workspace files).
+
+    A tool with `READS` is read-only: its result depends on nothing but its arguments and
+    that state (`READS = ()` for a pure tool), so it may be served from the result cache.
+    `WRITES` narrows which cached results a mutating tool invalidates; a tool declaring
+    neither is assumed to change anything.
+    """
+    reads, writes = getattr(tool, 'READS', None), getattr(tool, 'WRITES', None)
+    return (
+        list(reads) if reads is not None else None,
+        list(writes) if writes is not None else None,
+    )
+
+
+def load_toolbox_manifest(tools_folder: str = "toolbox") -> Dict[str, Dict]:
+    """The manifest of a tools folder (empty if there is none), read once per process."""
+    if tools_folder not in _manifests:
+        manifest_path = _tools_folder_path(tools_folder) / MANIFEST_NAME
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as rf:
+                _manifests[tools_folder] = json.load(rf)
+        except (OSError, ValueError):
+            _manifests[tools_folder] = {}
+    return _manifests[tools_folder]
+
+
+class LazyTool:
+    """
+    Stands in for a tool listed in the toolbox manifest until its first call, which imports
+    the tool's module, instantiates the tool with its servers and puts it in place of the
+    stand-in in `ToolManager.tools`.
+    """
+    def __init__(self, manager: "ToolManager", module_path: str, tool_name: str, init_params: Optional[List[str]]):
+        self.manager = manager
+        self.module_path = module_path
+        self.tool_name = tool_name
+        self.init_params = init_params
+
+    def resolve(self) -> Callable:
+        attr = getattr(importlib.import_module(self.module_path), self.tool_name)
+        if self.init_params is not None:
+            tool_obj = attr(**{
+                name: self.manager.servers[name] for name in self.init_params if name in self.manager.servers
+            }).__call__
+        else:
+            tool_obj = attr
+        self.manager.tools[self.tool_name] = tool_obj
+        return tool_obj
+
+    def __call__(self, **kwargs):
+        return self.resolve()(**kwargs)
+
 
 class ToolManager:
     def __init__(
@@ -15,16 +179,76 @@ class ToolManager:
         self.tools_schema = []
 
         self.servers = servers
-
-    def register_tool(self, tool_name: str, tool_func: Callable):
+        self.profiler = ToolProfiler()
+        self.validators: Dict[str, Callable[[Any], Optional[str]]] = {}
+        # (reads, writes) declared by each tool, see `_tool_effects`
+        self.effects: Dict[str, Tuple[Optional[List[str]], Optional[List[str]]]] = {}
+        # (tool name, canonical arguments) -> (state read, result) of read-only calls
+        self.result_cache: Dict[Tuple[str, str], Tuple[List[str], Any]] = {}
+        self.cache_results = CACHE_TOOL_RESULTS
+
+    def register_tool(
+            self, tool_name: str, tool_func: Callable,
+            reads: Optional[List[str]] = None, writes: Optional[List[str]] = None
+        ):
         self.tools[tool_name] = tool_func
+        self.effects[tool_name] = (reads, writes)
 
     def get_tool(self, tool_name: str):
         return self.tools.get(tool_name)
-    
-    def load_module_tools(self, tools_folder: str, module_name: str):
+
+    def call_tool(self, tool_name: str, **kwargs):
+        """
+        Calls a tool, recording its wall time and whether it raised in `self.profiler`.
+
+        A repeated call of a read-only tool with the same arguments returns the result of the
+        first one, until a tool writing to the state it reads is called. Only the wall time
+        is saved: the caller still charges the virtual clock for every call.
+        """
+        reads, writes = self.effects.get(tool_name, (None, None))
+        key = None
+        if reads is not None:
+            # Read-only tools write nothing unless they say so
+            writes = writes or []
+            if self.cache_results:
+                key = (tool_name, json.dumps(kwargs, sort_keys=True, ensure_ascii=False, default=str))
+                if key in self.result_cache:
+                    with self.profiler.timed(tool_name):
+                        result = self.result_cache[key][1]
+                    self.profiler.record_cache_hit(tool_name)
+                    return result
+
         try:
-            module = importlib.import_module(f"{tools_folder}.{module_name}")
+            with self.profiler.timed(tool_name):
+                result = self.tools[tool_name](**kwargs)
+        finally:
+            if reads is None or writes:
+                self.invalidate(writes)
+        if key is not None and not is_error_result(result):
+            self.result_cache[key] = (reads, result)
+        return result
+
+    def invalidate(self, states: Optional[List[str]] = None):
+        """
+        Drops the cached results that depend on any of `states`, or all of them if None.
+        Call it after changing a server or the workspace outside of `call_tool`.
+        """
+        if states is None:
+            self.result_cache.clear()
+            return
+        self.result_cache = {
+            key: entry for key, entry in self.result_cache.items()
+            if not any(state in entry[0] for state in states)
+        }
+    
+    # Tools and `__init__` parameter names per module, inspected once per process
+    _module_tools: Dict[str, List] = {}
+
+    @classmethod
+    def _inspect_module(cls, module) -> List:
+        tools = cls._module_tools.get(module.__name__)
+        if tools is None:
+            tools = []
             for attr_name in dir(module):
                 attr = getattr(module, attr_name)
                 if (
@@ -32,44 +256,119 @@ class ToolManager:
                     and not attr_name.startswith('_')
                     and getattr(attr, '__module__', None) == module.__name__
                 ):
+                    init_params = None
                     if inspect.isclass(attr):
                         try:
-                            init_signature = inspect.signature(attr.__init__)
-
-                            kwargs_to_pass = {}
-                            
-                            for param in init_signature.parameters.values():
-                                if param.name == 'self':
-                                    continue
-                                
-                                if param.name in self.servers:
-                                    kwargs_to_pass[param.name] = self.servers[param.name]
-                            
-                            instantiated = attr(**kwargs_to_pass)
-                        except Exception as e:
-                            print(f"Error instantiating class '{attr_name}' from module '{module.__name__}': {e}")
-                            continue
-                        
-                        tool_obj = instantiated.__call__
-                    else:
-                        tool_obj = attr
-                    if callable(tool_obj):
-                        self.register_tool(attr_name, tool_obj)
+                            init_params = [
+                                p for p in inspect.signature(attr.__init__).parameters if p != 'self'
+                            ]
+                        except (TypeError, ValueError):
+                            init_params = []
+                    tools.append((attr_name, attr, init_params))
+            cls._module_tools[module.__name__] = tools
+        return tools
+
+    def load_module_tools(self, tools_folder: str, module_name: str, toolset: Optional[Collection[str]] = None):
+        try:
+            module = importlib.import_module(f"{tools_folder}.{module_name}")
+            for attr_name, attr, init_params in self._inspect_module(module):
+                if toolset is not None and attr_name not in toolset:
+                    continue
+                if init_params is not None:
+                    try:
+                        kwargs_to_pass = {
+                            name: self.servers[name] for name in init_params if name in self.servers
+                        }
+                        instantiated = attr(**kwargs_to_pass)
+                    except Exception as e:
+                        print(f"Error instantiating class '{attr_name}' from module '{module.__name__}': {e}")
+                        continue
+                    
+                    tool_obj = instantiated.__call__
+                else:
+                    tool_obj = attr
+                if callable(tool_obj):
+                    self.register_tool(attr_name, tool_obj, *_tool_effects(attr))
 
         except Exception as e:
             print(f"Error loading module '{tools_folder}.{module_name}': {e}")
 
 
-    def load_tools(self, tools_folder: str="toolbox", modules: List[str] = None):
+    def load_lazy_module_tools(
+            self, tools_folder: str, module_name: str, entry: Dict, toolset: Optional[Collection[str]] = None
+        ) -> Dict[str, Dict]:
+        """
+        Registers the tools of a manifest entry as `LazyTool`s, without importing the module.
+        Like `load_module_tools`, tools missing a required server or not in `toolset` are left out.
+
+        Returns:
+            The manifest entries of the registered tools, by tool name.
+        """
+        loaded = {}
+        for tool in entry['tools']:
+            if toolset is not None and tool['name'] not in toolset:
+                continue
+            if any(name not in self.servers for name in tool.get('required_init_params', [])):
+                continue
+            self.register_tool(
+                tool['name'], LazyTool(self, f"{tools_folder}.{module_name}", tool['name'], tool['init_params']),
+                tool.get('reads'), tool.get('writes'),
+            )
+            loaded[tool['name']] = tool
+        return loaded
+
+    def load_tools(
+            self, tools_folder: str="toolbox", modules: List[str] = None, lazy: bool = None,
+            toolset: Optional[Collection[str]] = None
+        ):
+        """
+        Args:
+            tools_folder: Package of the tool modules.
+            modules: Module names to load, all modules of the folder by default.
+            lazy: Whether modules listed (and up to date) in the folder's manifest are imported
+                only when one of their tools is first called. Defaults to `LAZY_TOOLS`.
+            toolset: Names of the tools to load from these modules, all of them by default.
+                Only their schemas are sent to the agent.
+        """
+        lazy = LAZY_TOOLS if lazy is None else lazy
+        folder_path = _tools_folder_path(tools_folder)
         if modules is None:
             modules = [
-                filename[:-3] for filename in os.listdir(tools_folder)
+                filename[:-3] for filename in os.listdir(folder_path)
                 if filename.endswith('.py') and filename != '__init__.py'
             ]
+        manifest = load_toolbox_manifest(tools_folder) if lazy else {}
+        lazy_tools: Dict[str, Dict] = {}
         for module_name in modules:
-            self.load_module_tools(tools_folder, module_name)
+            entry = manifest.get(module_name)
+            module_file = folder_path / f'{module_name}.py'
+            # An edited module is loaded eagerly until the manifest is written again
+            if entry and module_file.is_file() and entry['sha256'] == _source_hash(module_file):
+                lazy_tools.update(self.load_lazy_module_tools(tools_folder, module_name, entry, toolset))
+            else:
+                self.load_module_tools(tools_folder, module_name, toolset)
         for k, v in self.tools.items():
-            self.tools_schema.append(generate_tool_schema(k,v))
+            if k in lazy_tools:
+                schema = lazy_tools[k]['schema']
+                variadic = (lazy_tools[k]['variadic'], lazy_tools[k]['accepts_any'])
+            else:
+                schema = SCHEMA_CACHE.get(k, v)
+                variadic = _variadic_params(v)
+            self.tools_schema.append(schema)
+            self.validators[k] = compile_validator(schema, variadic=variadic)
+        SCHEMA_CACHE.save()
+
+    def validate(self, tool_name: str, arguments: Any) -> Optional[str]:
+        """
+        Checks the arguments of a tool call against the tool's schema, see `compile_validator`.
+
+        Returns:
+            None if the call is valid, otherwise a short message for the agent.
+        """
+        validator = self.validators.get(tool_name)
+        if validator is None:
+            return f"Unknown tool `{tool_name}`. Available tools: {', '.join(self.tools)}."
+        return validator(arguments)
 
 
 def generate_tool_schema(func_name: str, func: Callable, enhance_des: str | None = None) -> str:
@@ -168,6 +467,135 @@ def generate_tool_schema(func_name: str, func: Callable, enhance_des: str | None
 
     return tool_schema
 
+# Python types accepted for each JSON schema type; bools are not numbers here
+_JSON_TYPES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+    "null": (type(None),),
+}
+
+
+def _compile_type_check(param_schema: Dict) -> Callable[[Any], Any]:
+    """
+    Returns a check that takes a value and returns it (coerced if needed), or raises
+    `TypeError` naming the expected type. Integers, numbers and booleans given as strings
+    (`"5"`, `"true"`) are coerced, since models often quote them.
+    """
+    if "oneOf" in param_schema:
+        checks = [_compile_type_check(option) for option in param_schema["oneOf"]]
+        expected = " or ".join(option.get("type", "any") for option in param_schema["oneOf"])
+
+        def check_one_of(value):
+            for check in checks:
+                try:
+                    return check(value)
+                except TypeError:
+                    continue
+            raise TypeError(expected)
+        return check_one_of
+
+    json_type = param_schema.get("type")
+    if json_type not in _JSON_TYPES:
+        return lambda value: value
+    py_types = _JSON_TYPES[json_type]
+    item_check = _compile_type_check(param_schema["items"]) if json_type == "array" and "items" in param_schema else None
+
+    def check(value):
+        if isinstance(value, py_types) and not (isinstance(value, bool) and json_type in ("integer", "number")):
+            if item_check is not None:
+                try:
+                    return [item_check(v) for v in value]
+                except TypeError:
+                    raise TypeError(f"array of {param_schema['items'].get('type', 'any')}")
+            return value
+        if isinstance(value, str):
+            text = value.strip()
+            try:
+                if json_type == "integer":
+                    return int(text)
+                if json_type == "number":
+                    return float(text)
+            except ValueError:
+                pass
+            if json_type == "boolean" and text.lower() in ("true", "false"):
+                return text.lower() == "true"
+        elif json_type == "integer" and isinstance(value, float) and value.is_integer():
+            return int(value)
+        raise TypeError(json_type)
+    return check
+
+
+def _variadic_params(func: Callable) -> Tuple[List[str], bool]:
+    """Names of the `*args` / `**kwargs` parameters of a tool, and whether it takes `**kwargs`."""
+    code = getattr(getattr(func, "__func__", func), "__code__", None)
+    if code is None:
+        return [], False
+    num_args = code.co_argcount + code.co_kwonlyargcount
+    num_variadic = bool(code.co_flags & inspect.CO_VARARGS) + bool(code.co_flags & inspect.CO_VARKEYWORDS)
+    return list(code.co_varnames[num_args:num_args + num_variadic]), bool(code.co_flags & inspect.CO_VARKEYWORDS)
+
+
+def compile_validator(
+        tool_schema: Dict, func: Callable = None, variadic: Tuple[List[str], bool] = None
+    ) -> Callable[[Any], Optional[str]]:
+    """
+    Compiles a tool's JSON schema into a validator of call arguments.
+
+    All the schema walking happens here, once per tool; a call is then checked with a
+    few set operations and one `isinstance` per argument. The validator coerces quoted
+    numbers and booleans in place and returns None for a valid call, or a one-line
+    message naming the bad arguments and the expected signature.
+
+    Args:
+        tool_schema: Schema generated by `generate_tool_schema`.
+        func: The tool itself; a tool taking `**kwargs` accepts any argument names.
+        variadic: `_variadic_params` of the tool, given instead of `func` (e.g. from the manifest).
+    """
+    function = tool_schema["function"]
+    name = function["name"]
+    properties = function["parameters"]["properties"]
+    if variadic is None:
+        variadic = _variadic_params(func) if func is not None else ([], False)
+    # *args / **kwargs appear in the schema as plain parameters
+    var_names, accepts_any = set(variadic[0]), variadic[1]
+    required = frozenset(function["parameters"]["required"]) - var_names
+    allowed = frozenset(properties) - var_names
+    checks = {
+        param: _compile_type_check(param_schema)
+        for param, param_schema in properties.items() if param not in var_names
+    }
+    signature = ", ".join(
+        f"{param}: {properties[param].get('type', 'any')}" + ("" if param in required else "?")
+        for param in properties if param not in var_names
+    )
+    usage = f"Expected `{name}({signature})`."
+
+    def validate(arguments: Any) -> Optional[str]:
+        if not isinstance(arguments, dict):
+            return f"Arguments must be a JSON object, got {type(arguments).__name__}. {usage}"
+        keys = arguments.keys()
+        if not accepts_any and not keys <= allowed:
+            unknown = ", ".join(sorted(keys - allowed))
+            return f"Unknown argument(s): {unknown}. {usage}"
+        if not required <= keys:
+            missing = ", ".join(sorted(required - keys))
+            return f"Missing required argument(s): {missing}. {usage}"
+        for param, value in arguments.items():
+            check = checks.get(param)
+            if check is None or (value is None and param not in required):
+                continue
+            try:
+                arguments[param] = check(value)
+            except TypeError as e:
+                return f"Argument `{param}` must be {e}, got {json.dumps(value, ensure_ascii=False)[:50]}. {usage}"
+        return None
+    return validate
+
+
 def generate_tool_des(func: Callable) -> str:
     doc = inspect.getdoc(func)
 
@@ -180,37 +608,101 @@ def generate_tool_des(func: Callable) -> str:
     return func_des
 
 
-# if __name__ == '__main__':
-#     import json
-
-#     os_config = {
-#         "action_costs": []
-#     }
-
-    # try:
-    #     sandbox=DockerSandbox('./sandbox_workspace')
-    #     scenario_clock = ScenarioClock(os_config)
-    #     tool_manager = ToolManager(
-    #         chat_server=ChatServer(),
-    #         cloud_disk=CloudDisk('./CloudDisk', './sandbox_workspace'),
-    #         sandbox=sandbox,
-    #         meeting_calendar=MeetingRoomCalendar(
-    #             'sandbox_workspace/meeting_calendar.db', scenario_clock
-    #         )
-    #     )
-    #     tool_manager.load_tools(
-    #         tools_folder='toolbox',
-    #         modules=[
-    #             'sandbox_tool', 'message_tool', 
-    #             'cloud_disk_tool', 'calendar_tool',
-    #             'calculator_tool', 'website_monitor'
-    #         ]
-    #     )
-
-    #     for elem in tool_manager.tools_schema:
-    #         print(elem)
-            
-    # except Exception as e:
-    #     raise e
-    # finally:
-    #     sandbox.close()
+def write_toolbox_manifest(tools_folder: str = "toolbox") -> Path:
+    """
+    Writes the static manifest of a tools folder: for every module, the hash of its source
+    and, for every tool, its `__init__` parameters, declared effects (`READS`/`WRITES`), schema
+    and variadic parameters. With it, `ToolManager.load_tools` serves schemas and validators
+    without importing the modules.
+    """
+    folder_path = _tools_folder_path(tools_folder)
+    manifest = {}
+    for filename in sorted(os.listdir(folder_path)):
+        if not filename.endswith('.py') or filename == '__init__.py':
+            continue
+        module_name = filename[:-3]
+        module = importlib.import_module(f"{tools_folder}.{module_name}")
+        tools = []
+        for attr_name, attr, init_params in ToolManager._inspect_module(module):
+            if init_params is not None:
+                init_signature = inspect.signature(attr.__init__)
+                required_init_params = [
+                    p.name for p in init_signature.parameters.values()
+                    if p.name != 'self' and p.default is inspect.Parameter.empty
+                    and p.kind not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+                ]
+                # Bound to the class only to drop `self` from the signature
+                tool_obj = types.MethodType(attr.__call__, attr)
+            else:
+                required_init_params = []
+                tool_obj = attr
+            var_names, accepts_any = _variadic_params(tool_obj)
+            reads, writes = _tool_effects(attr)
+            tools.append({
+                'name': attr_name,
+                'init_params': init_params,
+                'required_init_params': required_init_params,
+                'variadic': var_names,
+                'accepts_any': accepts_any,
+                'reads': reads,
+                'writes': writes,
+                'schema': generate_tool_schema(attr_name, tool_obj),
+            })
+        manifest[module_name] = {'sha256': _source_hash(folder_path / filename), 'tools': tools}
+    manifest_path = folder_path / MANIFEST_NAME
+    with open(manifest_path, 'w', encoding='utf-8') as wf:
+        json.dump(manifest, wf, ensure_ascii=False, indent=2)
+        wf.write('\n')
+    _manifests.pop(tools_folder, None)
+    return manifest_path
+
+
+def benchmark_startup(task_path: str, runs: int = 5) -> Dict[str, float]:
+    """
+    Measures `Environment` creation for a task in fresh interpreters, with lazy tools and
+    with every tool module imported eagerly.
+
+    Returns:
+        Median milliseconds from interpreter start to a ready environment, per mode.
+    """
+    import subprocess
+    import statistics
+
+    script = (
+        "import time; t = time.perf_counter()\n"
+        "from environment import Environment\n"
+        "env = Environment(sys.argv[1], log_level='ERROR')\n"
+        "schemas = env.tool_manager.tools_schema\n"
+        "print((time.perf_counter() - t) * 1000)\n"
+        "env.close()\n"
+    )
+    root = str(Path(__file__).resolve().parent)
+    results = {}
+    for mode, flag in (('eager', '0'), ('lazy', '1')):
+        env = {**os.environ, 'EVOENV_LAZY_TOOLS': flag, 'PYTHONPATH': root}
+        timings = []
+        for _ in range(runs):
+            output = subprocess.run(
+                [sys.executable, '-c', 'import sys\n' + script, task_path],
+                env=env, cwd=root, capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()
+            timings.append(float(output[-1]))
+        results[mode] = statistics.median(timings)
+    return results
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Toolbox manifest and startup benchmark.')
+    parser.add_argument('--tools-folder', default='toolbox')
+    parser.add_argument('--write-manifest', action='store_true', help='(Re)write the manifest of the tools folder.')
+    parser.add_argument('--benchmark', metavar='TASK_PATH', help='Measure environment startup for this task.')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.write_manifest:
+        print(f"Manifest written to {write_toolbox_manifest(args.tools_folder)}")
+    if args.benchmark:
+        for mode, ms in benchmark_startup(args.benchmark, args.runs).items():
+            print(f"{mode}: {ms:.1f} ms")
@@ -1,4 +1,22 @@
-from virtual_server.chat_server import ChatServer
-from virtual_server.cloud_disk import CloudDisk
-from virtual_server.docker_sandbox import DockerSandbox
-from virtual_server.meeting_calendar import MeetingRoomCalendar
\ No newline at end of file
+import importlib
+
+
+# Servers are imported on first use, so that e.g. `openai` and `docker` are only loaded
+# by tasks that need the chat server or the docker sandbox
+_SERVER_CLASSES = {
+    'ChatServer': 'virtual_server.chat_server',
+    'CloudDisk': 'virtual_server.cloud_disk',
+    'DockerSandbox': 'virtual_server.docker_sandbox',
+    'FileReader': 'virtual_server.file_reader',
+    'LocalSandbox': 'virtual_server.local_sandbox',
+    'MeetingRoomCalendar': 'virtual_server.meeting_calendar',
+    'OutputStore': 'virtual_server.output_store',
+    'SearchIndex': 'virtual_server.search_index',
+    'WorkspaceDatabase': 'virtual_server.workspace_db',
+}
+
+
+def __getattr__(name: str):
+    if name in _SERVER_CLASSES:
+        return getattr(importlib.import_module(_SERVER_CLASSES[name]), name)
+    raise AttributeError(f"module 'virtual_server' has no attribute '{name}'")
@@ -0,0 +1,187 @@
+import os
+import stat
+import errno
+import fcntl
+import shutil
+import hashlib
+from pathlib import Path
+from typing import Tuple, Union
+from loguru import logger
+
+
+# ioctl request of `FICLONE` (linux/fs.h): share the extents of a file, copy-on-write
+FICLONE = 0x40049409
+
+LINK_MODES = ('reflink', 'hardlink', 'copy')
+
+
+def _copy_file(src: Path, dst: Path):
+    """Like `shutil.copy2`, but leaves `dst` writable even when `src` is a read-only blob."""
+    shutil.copyfile(src, dst)
+    st = os.stat(src)
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def reflink(src: Path, dst: Path) -> bool:
+    """
+    Clone `src` into a new file `dst` sharing its data blocks (btrfs, xfs, overlayfs on those, ...).
+
+    Returns:
+        False if the filesystem does not support reflinks; `dst` is not created then.
+    """
+    with open(src, 'rb') as fsrc:
+        fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            fcntl.ioctl(fd, FICLONE, fsrc.fileno())
+        except OSError as e:
+            os.close(fd)
+            os.unlink(dst)
+            if e.errno in (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.EBADF):
+                return False
+            raise
+        os.close(fd)
+    st = os.stat(src)
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+    return True
+
+
+def materialize(src: Union[str, Path], dst: Union[str, Path], link_mode: str = 'reflink') -> str:
+    """
+    Place a copy of `src` at `dst` as cheaply as the filesystem allows.
+
+    Args:
+        src: Existing file.
+        dst: Destination file path, replaced if it exists.
+        link_mode: `reflink` clones the file copy-on-write and falls back to a copy.
+            `hardlink` shares the inode of a read-only `src` (e.g. a blob), so in-place
+            edits fail rather than corrupting every other link; a writable `src` is
+            cloned as with `reflink`. `copy` always copies.
+
+    Returns:
+        The method actually used: `hardlink`, `reflink` or `copy`.
+    """
+    if link_mode not in LINK_MODES:
+        raise ValueError(f"Unknown link mode `{link_mode}`, expected one of {LINK_MODES}.")
+    src, dst = Path(src), Path(dst)
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+    if link_mode == 'hardlink' and not os.stat(src).st_mode & 0o222:
+        try:
+            os.link(src, dst)
+            return 'hardlink'
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                raise
+    if link_mode in ('hardlink', 'reflink') and reflink(src, dst):
+        return 'reflink'
+    _copy_file(src, dst)
+    return 'copy'
+
+
+class BlobStore:
+    """
+    A content-addressed store of read-only files shared by all scenarios and days of a benchmark.
+
+    `dedupe_tree` replaces every file of a folder (e.g. a day's `cloud_disk`) by a reflink
+    (copy-on-write clone) of the blob with the same SHA-256, so manuals and datasets that
+    repeat across days share their data blocks. Each file keeps its own inode and stays
+    writable: writing to one day's file never changes another day's or the blob. On
+    filesystems without reflinks, or when the store is on another filesystem, files are
+    left as they are and nothing is stored. Blobs no tree refers to are removed by `gc`.
+
+    Example:
+        store = BlobStore('benchmark/.blobs')
+        store.dedupe_tree('benchmark/scenario_1/day_1/cloud_disk')
+    """
+    def __init__(self, root_path: Union[str, Path]):
+        self.root_path = Path(root_path)
+        self.root_path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def hash_file(path: Union[str, Path]) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root_path / digest[:2] / digest[2:]
+
+    def add(self, path: Union[str, Path]) -> Tuple[str, bool]:
+        """
+        Store a file and replace it by a reflink of its blob.
+
+        Returns:
+            (digest, True if the file now shares the data of an identical, already stored blob)
+        """
+        path = Path(path)
+        digest = self.hash_file(path)
+        blob = self.blob_path(digest)
+        if not blob.exists():
+            blob.parent.mkdir(exist_ok=True)
+            tmp_blob = blob.with_name(f'.{blob.name}.tmp')
+            if tmp_blob.exists():
+                tmp_blob.unlink()
+            if not reflink(path, tmp_blob):
+                # Without reflinks a blob would only be one more copy of the file
+                return digest, False
+            os.chmod(tmp_blob, 0o444)
+            os.replace(tmp_blob, blob)
+            return digest, False
+
+        tmp_path = path.with_name(f'.{path.name}.blob-tmp')
+        if tmp_path.exists():
+            tmp_path.unlink()
+        if not reflink(blob, tmp_path):
+            # The store is on another filesystem: keep the file as it is
+            return digest, False
+        st = os.stat(path)
+        os.chmod(tmp_path, stat.S_IMODE(st.st_mode))
+        os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp_path, path)
+        return digest, True
+
+    def dedupe_tree(self, folder: Union[str, Path]) -> Tuple[int, int]:
+        """
+        Add every regular file under `folder` to the store.
+
+        Returns:
+            (number of files, bytes saved by files whose content was already stored)
+        """
+        num_files, saved = 0, 0
+        for dirpath, _, filenames in os.walk(folder):
+            for name in filenames:
+                path = Path(dirpath) / name
+                if path.is_symlink() or not path.is_file():
+                    continue
+                _, shared = self.add(path)
+                num_files += 1
+                if shared:
+                    saved += path.stat().st_size
+        logger.info(f"[Blob Store] {num_files} files in '{folder}' stored, {saved / 1024:.1f} KB deduplicated.")
+        return num_files, saved
+
+    def gc(self, *folders: Union[str, Path]) -> int:
+        """
+        Removes the blobs whose content no file under `folders` has. Reflinked files keep
+        their data when their blob is removed; later trees just no longer share it.
+
+        Returns:
+            The number of blobs removed.
+        """
+        blobs = {blob.parent.name + blob.name: blob for blob in self.root_path.glob('*/*') if blob.is_file()}
+        sizes = {blob.stat().st_size for blob in blobs.values()}
+        root_path = self.root_path.resolve()
+        for folder in folders:
+            for dirpath, dirs, filenames in os.walk(folder):
+                dirs[:] = [d for d in dirs if (Path(dirpath) / d).resolve() != root_path]
+                for name in filenames:
+                    path = Path(dirpath) / name
+                    # Only files as large as a blob can have its content
+                    if path.is_symlink() or not path.is_file() or path.stat().st_size not in sizes:
+                        continue
+                    blobs.pop(self.hash_file(path), None)
+        for blob in blobs.values():
+            blob.unlink()
+        return len(blobs)
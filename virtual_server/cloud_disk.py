@@ -1,15 +1,87 @@
 import os
-import shutil
+import re
+import posixpath
 from loguru import logger
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from virtual_server.registry import register_server
 from virtual_server.base_server import BaseServer
+from virtual_server.blob_store import LINK_MODES, materialize
+from virtual_server.lazy_assets import LAZY_SUFFIX, render_asset
+
+
+# Longest recursive listing or search result returned to the agent
+MAX_LISTED_ENTRIES = 200
+
+
+def _format_size(size: int) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f'{size:.0f}{unit}' if unit == 'B' else f'{size:.1f}{unit}'
+        size /= 1024
+    return f'{size:.1f}GB'
+
+
+def _normalize_glob(pattern: str) -> str:
+    """`./sales/*.csv` or `/sales/*.csv` -> `sales/*.csv`, a glob relative to the cloud disk root."""
+    return posixpath.normpath(pattern.strip()).lstrip('/')
+
+
+def _glob_to_regex(pattern: str) -> re.Pattern:
+    """Translate a path glob to a regex; `*` and `?` stay within a folder, `**` spans folders."""
+    parts, i = [], 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+            continue
+        if c == '*':
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 1)
+            if end < 0:
+                parts.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end].replace('\\', '\\\\')
+                parts.append('[^' + body[1:] + ']' if body.startswith('!') else '[' + body + ']')
+                i = end
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return re.compile(''.join(parts))
 
 
 @register_server(server_name='cloud_disk')
 class CloudDisk(BaseServer):
-    def __init__(self, task_root_path: str, *args, **kwargs) -> None:
+    def __init__(self, task_root_path: str, cloud_disk_config: Optional[Dict] = None, *args, **kwargs) -> None:
+        """
+        Args:
+            task_root_path: Task folder holding `cloud_disk` and `workspace`.
+            cloud_disk_config: Optional `cloud_disk_config` section of `config.json`:
+                - link_mode: how downloads are placed in the workspace, `reflink` (default,
+                  copy-on-write clone with copy fallback), `hardlink` (shares the inode of
+                  read-only files, in-place edits fail; writable files are cloned) or `copy`.
+                  See `virtual_server/blob_store.py`.
+                - render_cache_path: optional folder keeping rendered lazy assets across days
+                  and runs, see `virtual_server/lazy_assets.py`.
+                - image: downscaling and caching of images read by `ReadAsDataURL`, see
+                  `virtual_server/image_cache.py`.
+        """
+        cloud_disk_config = cloud_disk_config or {}
+        self.link_mode = cloud_disk_config.get('link_mode', 'reflink')
+        if self.link_mode not in LINK_MODES:
+            raise ValueError(f"Unknown link mode `{self.link_mode}`, expected one of {LINK_MODES}.")
+        self.image_config: Dict = cloud_disk_config.get('image', {})
+        self.render_cache_path = cloud_disk_config.get('render_cache_path')
+
         cloud_disk_root_path = os.path.join(task_root_path, 'cloud_disk')
         workspace_path = os.path.join(task_root_path, 'workspace')
         self.root_path = Path(cloud_disk_root_path)
@@ -17,19 +89,30 @@ class CloudDisk(BaseServer):
 
         self.root_path.mkdir(parents=True, exist_ok=True)
         self.workspace_path.mkdir(parents=True, exist_ok=True)
+        # Folder listings keyed by relative path: (folder mtime, sorted entries)
+        self._tree_index: Dict[str, Tuple[int, List[Tuple[str, bool, int]]]] = {}
 
     def log_and_return_message(self, message: str):
         logger.info(message)
         return message
 
+    def render_lazy_asset(self, file_path: str) -> bool:
+        """Renders a deferred asset of the cloud disk on its first access. Returns True if it was rendered."""
+        try:
+            return render_asset(self.root_path / file_path, self.render_cache_path)
+        except Exception as e:
+            logger.error(f"[Cloud Disk] Failed to render '{file_path}': {e}")
+            return False
+
     def download_file(self, file_path: str, target_path: str):
+        self.render_lazy_asset(file_path)
         source_real_path = self.root_path / file_path
         if not source_real_path.exists():
             error_message = f"Error: Source file '{source_real_path}' does not exist."
-            self.log_and_return_message(error_message)
+            return self.log_and_return_message(error_message)
         if not source_real_path.is_file():
             error_message = f"Error: Source path '{source_real_path}' is a directory, not a file."
-            self.log_and_return_message(error_message)
+            return self.log_and_return_message(error_message)
         
         target_real_path = self.workspace_path / target_path
         final_destination_path = None
@@ -47,36 +130,201 @@ class CloudDisk(BaseServer):
                 target_real_path.parent.mkdir(parents=True, exist_ok=True)
                 final_destination_path = target_real_path
                 logger.debug(f"Target '{target_real_path}' is a file path. Saving file to this location.")
-            shutil.copy2(source_real_path, final_destination_path)
+            # A reflink or hardlink takes the same time for any file size
+            method = materialize(source_real_path, final_destination_path, self.link_mode)
+            logger.debug(f"Downloaded '{file_path}' by {method}.")
             
             success_message = f"Successfully downloaded '{file_path}' to '{target_path}'"
-            self.log_and_return_message(success_message)
+            return self.log_and_return_message(success_message)
         except Exception as e:
             error_message = f"An error occurred during download: {e}"
-            self.log_and_return_message(error_message)
+            return self.log_and_return_message(error_message)
+
+    def _normalize(self, folder_path: str) -> str:
+        """Relative folder key of the tree index, '' for the root."""
+        rel = os.path.normpath(folder_path.strip() or '.').replace(os.sep, '/')
+        return '' if rel == '.' else rel.strip('/')
+
+    def _list_dir(self, rel: str) -> List[Tuple[str, bool, int]]:
+        """
+        Cached, sorted `(relative path, is_dir, size)` entries of a folder.
+
+        A cached listing is reused while the folder's mtime is unchanged, which
+        covers files being added, removed or renamed. Rewriting a file does not
+        change its folder's mtime, so sizes are as of the last listing change;
+        `_current_sizes` refreshes the ones shown. Assets not rendered yet are
+        listed under their own name with size -1.
+        """
+        real_path = self.root_path / rel if rel else self.root_path
+        mtime = os.stat(real_path).st_mtime_ns
+        cached = self._tree_index.get(rel)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        prefix = f'{rel}/' if rel else ''
+        entries, lazy = [], []
+        with os.scandir(real_path) as it:
+            for entry in it:
+                if entry.name.endswith(LAZY_SUFFIX):
+                    lazy.append(entry.name[:-len(LAZY_SUFFIX)])
+                    continue
+                is_dir = entry.is_dir()
+                entries.append((prefix + entry.name, is_dir, 0 if is_dir else entry.stat().st_size))
+        if lazy:
+            present = {path for path, _, _ in entries}
+            entries += [(prefix + name, False, -1) for name in lazy if prefix + name not in present]
+        entries.sort()
+        self._tree_index[rel] = (mtime, entries)
+        return entries
+
+    def walk(self, folder_path: str = '') -> Iterator[Tuple[str, bool, int]]:
+        """Yields `(path relative to the cloud disk root, is_dir, size)` for everything below a folder, in pre-order."""
+        stack = [iter(self._list_dir(self._normalize(folder_path)))]
+        while stack:
+            for entry in stack[-1]:
+                yield entry
+                if entry[1]:
+                    stack.append(iter(self._list_dir(entry[0])))
+                    break
+            else:
+                stack.pop()
+
+    def _current_sizes(self, entries: List[Tuple[str, bool, int]]) -> List[Tuple[str, bool, int]]:
+        """`entries` with the sizes of the files that will be listed read again."""
+        fresh = []
+        for path, is_dir, size in entries[:MAX_LISTED_ENTRIES]:
+            if not is_dir and size >= 0:
+                try:
+                    size = os.stat(self.root_path / path).st_size
+                except OSError:
+                    pass
+            fresh.append((path, is_dir, size))
+        return fresh + entries[MAX_LISTED_ENTRIES:]
 
-    def open_folder(self, folder_path: str):
+    def _format_entries(self, entries: List[Tuple[str, bool, int]], header: str) -> str:
+        lines = [
+            f'{path}/' if is_dir else (f'{path} ({_format_size(size)})' if size >= 0 else path)
+            for path, is_dir, size in entries[:MAX_LISTED_ENTRIES]
+        ]
+        if len(entries) > MAX_LISTED_ENTRIES:
+            lines.append(f'... and {len(entries) - MAX_LISTED_ENTRIES} more, narrow down the folder or pattern.')
+        return header + '\n' + '\n'.join(lines)
+
+    def open_folder(self, folder_path: str, recursive: bool = False):
         real_folder_path = self.root_path / folder_path
-        if not os.path.isdir(real_folder_path):
-            erro_message = f'Error: {folder_path} is not a directory. can not open it.'
-            self.log_and_return_message(erro_message)
-        
         if not os.path.exists(real_folder_path):
             erro_message = f'Error: {folder_path} does not exist.'
-            self.log_and_return_message(erro_message)
+            return self.log_and_return_message(erro_message)
 
-        outputs = []
-        for item in os.listdir(real_folder_path):
-            item_path = real_folder_path / item
-            if item_path.is_dir():
-                outputs.append(f'{item}/')
-            else:
-                outputs.append(item)
+        if not os.path.isdir(real_folder_path):
+            erro_message = f'Error: {folder_path} is not a directory. can not open it.'
+            return self.log_and_return_message(erro_message)
 
-        output_str = '\n'.join(outputs)
+        if recursive:
+            entries = self._current_sizes(list(self.walk(folder_path)))
+            output_str = self._format_entries(entries, f"[Cloud Disk] {len(entries)} entries under '{folder_path}':")
+        else:
+            outputs = []
+            for path, is_dir, _ in self._list_dir(self._normalize(folder_path)):
+                item = path.rsplit('/', 1)[-1]
+                outputs.append(f'{item}/' if is_dir else item)
+            output_str = '\n'.join(outputs)
         logger.info(f"[List Folder] Contents of '{folder_path}': \n{output_str}")
         return output_str
+
+    def _match(self, pattern: str, base: str) -> List[Tuple[str, bool, int]]:
+        """Entries under folder `base` matching a glob (relative to `base`) or a name fragment."""
+        if any(c in pattern for c in '*?['):
+            regex = _glob_to_regex(_normalize_glob(pattern))
+            prefix_len = len(base) + 1 if base else 0
+            return [e for e in self.walk(base) if regex.fullmatch(e[0][prefix_len:])]
+        needle = pattern.lower()
+        return [e for e in self.walk(base) if needle in e[0].rsplit('/', 1)[-1].lower()]
+
+    def search(self, pattern: str, folder_path: str = ''):
+        """
+        Search the whole cloud disk in one pass over the cached tree index.
+
+        A pattern with `*`, `?` or `[` is a glob over paths relative to `folder_path`,
+        where `**` matches any number of folders (e.g. `**/*.csv`). Any other pattern
+        matches file and folder names containing it, ignoring case. Results are paths
+        from the cloud disk root, ready for `download_file`.
+        """
+        pattern = pattern.strip()
+        if not pattern:
+            return self.log_and_return_message('Error: The search pattern must be a non-empty string.')
+        if not os.path.isdir(self.root_path / folder_path):
+            return self.log_and_return_message(f'Error: {folder_path} is not a directory.')
+
+        matches = self._current_sizes(self._match(pattern, self._normalize(folder_path)))
+        if not matches:
+            output_str = f"[Cloud Disk] Nothing matches '{pattern}'."
+        else:
+            output_str = self._format_entries(matches, f"[Cloud Disk] {len(matches)} matches for '{pattern}':")
+        logger.info(output_str)
+        return output_str
     
+    def download_many(self, source: str, target_path: str):
+        """
+        Download a whole folder, or every file matching a glob, in one pass.
+
+        A folder keeps its inner layout below `target_path`. For a glob like
+        `sales/2025-*/*.csv`, paths are kept relative to the folder before the first
+        wildcard (`sales`). Files are placed with `materialize`, so with reflinks the
+        pass costs one clone per file regardless of size.
+
+        Returns:
+            A compact manifest: number of files, total size and the downloaded paths.
+        """
+        source = source.strip()
+        if not source:
+            return self.log_and_return_message('Error: The source must be a non-empty folder path or glob pattern.')
+        if any(c in source for c in '*?['):
+            glob = _normalize_glob(source)
+            head = re.split(r'[*?\[]', glob, maxsplit=1)[0]
+            base = self._normalize(head.rsplit('/', 1)[0] if '/' in head else '')
+            if not os.path.isdir(self.root_path / base):
+                return self.log_and_return_message(f"Error: Folder '{base}' of pattern '{source}' does not exist.")
+            pattern = glob[len(base) + 1 if base else 0:]
+            files = [e for e in self._match(pattern, base) if not e[1]]
+        else:
+            real_path = self.root_path / source
+            if not real_path.exists():
+                return self.log_and_return_message(f"Error: Source folder '{source}' does not exist.")
+            if not real_path.is_dir():
+                return self.log_and_return_message(f"Error: '{source}' is a file, use the single file download instead.")
+            base = self._normalize(source)
+            files = [e for e in self.walk(base) if not e[1]]
+        if not files:
+            return self.log_and_return_message(f"[Cloud Disk] No files match '{source}', nothing downloaded.")
+
+        target_root = self.workspace_path / target_path
+        prefix_len = len(base) + 1 if base else 0
+        methods, total, downloaded = {}, 0, []
+        try:
+            created = set()
+            for path, _, size in files:
+                if size < 0:
+                    self.render_lazy_asset(path)
+                rel = path[prefix_len:]
+                destination = target_root / rel
+                if destination.parent not in created:
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+                    created.add(destination.parent)
+                method = materialize(self.root_path / path, destination, self.link_mode)
+                methods[method] = methods.get(method, 0) + 1
+                # The listed size may predate a rewrite of the file
+                size = os.path.getsize(destination)
+                total += size
+                downloaded.append((rel, False, size))
+        except Exception as e:
+            done = f' after {len(downloaded)} files' if downloaded else ''
+            return self.log_and_return_message(f"An error occurred during download{done}: {e}")
+        logger.debug(f"Downloaded {len(downloaded)} files from '{source}' by {methods}.")
+
+        target_name = os.path.normpath(target_path).replace(os.sep, '/')
+        header = f"Successfully downloaded {len(downloaded)} files ({_format_size(total)}) from '{source}' to '{target_name}/':"
+        return self.log_and_return_message(self._format_entries(downloaded, header))
+
     def close(self):
         return
 
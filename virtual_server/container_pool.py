@@ -0,0 +1,303 @@
+import os
+import time
+import atexit
+import shutil
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import docker
+import shortuuid
+from loguru import logger
+
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_POOL_ROOT = os.path.join(os.path.dirname(CURRENT_DIR), '.sandbox_pool')
+# Kills what an episode left running except PID 1 (`sleep infinity`) and the preloaded
+# forkserver (see `virtual_server/forkserver.py`); images without it get `kill -9 -1`
+RESET_PROCESSES_COMMAND = 'python3 /opt/evoenv/forkserver.py --reset 2>/dev/null || kill -9 -1'
+
+
+@dataclass
+class PooledContainer:
+    """A warm container together with the host directory mounted at /workspace"""
+    container: Any
+    slot_dir: str
+    # Task workspace currently bound to the slot, None while idle
+    host_workspace: Optional[str] = None
+
+
+class ContainerPool:
+    """
+    A process-wide pool of pre-started sandbox containers.
+
+    Docker cannot change the mounts of a running container, so every pooled
+    container mounts its own slot directory at /workspace. Leasing a container
+    moves the episode's workspace into the slot and leaves a symlink at the
+    original path, so host-side servers (cloud disk, evaluators) keep using the
+    task path transparently. Releasing moves the files back, kills any leftover
+    processes and returns the container to the idle list.
+
+    Example:
+        pool = get_container_pool(client, 'my-env:3.1', run_kwargs, size=2, max_size=8)
+        lease = pool.lease('/path/to/task/workspace')
+        lease.container.exec_run(['/bin/sh', '-c', 'ls'], workdir='/workspace')
+        pool.release(lease)
+    """
+    def __init__(
+        self,
+        client: docker.DockerClient,
+        image_tag: str,
+        run_kwargs: Dict[str, Any],
+        size: int = 2,
+        max_size: int = 8,
+        pool_root: str = DEFAULT_POOL_ROOT,
+        lease_timeout: float = 120,
+    ):
+        """
+        :param client: Docker client used to start containers.
+        :param image_tag: Image every pooled container is started from.
+        :param run_kwargs: Keyword arguments for `containers.run`, without `volumes`.
+        :param size: Number of idle containers kept warm.
+        :param max_size: Hard cap on idle plus leased containers.
+        :param pool_root: Host directory holding the per-container slot directories.
+        :param lease_timeout: Seconds to wait for a container when the pool is at its cap.
+        """
+        if max_size < 1 or size > max_size:
+            raise ValueError(f'Invalid pool size: size={size}, max_size={max_size}')
+        self.client = client
+        self.image_tag = image_tag
+        self.run_kwargs = run_kwargs
+        self.size = size
+        self.max_size = max_size
+        self.lease_timeout = lease_timeout
+        self.pool_root = os.path.abspath(os.path.join(pool_root, shortuuid.uuid()))
+        os.makedirs(self.pool_root, exist_ok=True)
+
+        self._idle: List[PooledContainer] = []
+        self._leased: List[PooledContainer] = []
+        self._starting = 0
+        # Idle containers taken out for a health check
+        self._checking = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self._refill()
+
+    @property
+    def total(self) -> int:
+        return len(self._idle) + len(self._leased) + self._starting + self._checking
+
+    def _start_one(self) -> PooledContainer:
+        slot_dir = os.path.join(self.pool_root, shortuuid.uuid())
+        os.makedirs(slot_dir)
+        container = self.client.containers.run(
+            self.image_tag,
+            volumes={slot_dir: {'bind': '/workspace', 'mode': 'rw'}},
+            labels={'evoenv.sandbox_pool': self.pool_root},
+            **self.run_kwargs
+        )
+        logger.info(f"Pooled container {container.short_id} started.")
+        return PooledContainer(container=container, slot_dir=slot_dir)
+
+    def _start_in_background(self):
+        try:
+            pooled = self._start_one()
+        except Exception as e:
+            logger.error(f"Failed to start pooled container: {e}")
+            pooled = None
+        with self._cond:
+            self._starting -= 1
+            discard = pooled is not None and self._closed
+            if pooled is not None and not discard:
+                self._idle.append(pooled)
+            self._cond.notify_all()
+        if discard:
+            self._destroy(pooled)
+
+    def _refill(self):
+        """Start containers in the background until `size` are idle or the cap is reached."""
+        with self._cond:
+            missing = 0 if self._closed else min(
+                self.size - len(self._idle) - self._starting,
+                self.max_size - self.total
+            )
+            self._starting += max(missing, 0)
+        for _ in range(max(missing, 0)):
+            threading.Thread(target=self._start_in_background, daemon=True).start()
+
+    def _is_healthy(self, pooled: PooledContainer, probe: bool = False) -> bool:
+        try:
+            pooled.container.reload()
+            if pooled.container.status != 'running':
+                return False
+            if probe:
+                return pooled.container.exec_run(['true']).exit_code == 0
+            return True
+        except Exception:
+            return False
+
+    def _destroy(self, pooled: PooledContainer):
+        try:
+            pooled.container.remove(force=True)
+        except docker.errors.NotFound:
+            pass
+        except Exception as e:
+            logger.error(f"Error removing pooled container {pooled.container.short_id}: {e}")
+        shutil.rmtree(pooled.slot_dir, ignore_errors=True)
+
+    def _acquire(self) -> PooledContainer:
+        deadline = time.monotonic() + self.lease_timeout
+        while True:
+            candidate = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Container pool is closed.")
+                    if self._idle:
+                        candidate = self._idle.pop(0)
+                        # Still counted in `total` while its health is checked outside the lock
+                        self._checking += 1
+                        break
+                    if self.total < self.max_size:
+                        # Nothing warm yet: start one synchronously outside the lock
+                        self._starting += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RuntimeError(
+                            f"No sandbox container became available within {self.lease_timeout}s "
+                            f"(pool cap is {self.max_size})."
+                        )
+                    self._cond.wait(remaining)
+            if candidate is None:
+                break
+            # Docker API calls never run under the lock, so a slow daemon only delays this lease
+            healthy = self._is_healthy(candidate)
+            with self._cond:
+                self._checking -= 1
+                if healthy:
+                    self._leased.append(candidate)
+                    return candidate
+                self._cond.notify_all()
+            logger.warning(f"Discarding unhealthy pooled container {candidate.container.short_id}.")
+            self._destroy(candidate)
+
+        try:
+            pooled = self._start_one()
+        finally:
+            with self._cond:
+                self._starting -= 1
+        with self._cond:
+            self._leased.append(pooled)
+        return pooled
+
+    def lease(self, host_workspace: str) -> PooledContainer:
+        """
+        Lease a warm container and bind `host_workspace` to its /workspace.
+
+        :param host_workspace: Absolute path of the episode's workspace directory.
+        :return: The leased container; pass it back to `release` when done.
+        """
+        if os.path.islink(host_workspace):
+            # Left behind by an episode that never released its container
+            stale_slot = os.path.realpath(host_workspace)
+            os.unlink(host_workspace)
+            os.makedirs(host_workspace)
+            if os.path.isdir(stale_slot):
+                _move_contents(stale_slot, host_workspace)
+
+        pooled = self._acquire()
+        try:
+            _move_contents(host_workspace, pooled.slot_dir)
+            os.rmdir(host_workspace)
+            os.symlink(pooled.slot_dir, host_workspace, target_is_directory=True)
+            pooled.host_workspace = host_workspace
+        except Exception:
+            with self._cond:
+                self._leased.remove(pooled)
+            self._unbind(pooled, host_workspace)
+            self._destroy(pooled)
+            raise
+        logger.success(f"Leased pooled container {pooled.container.short_id}.")
+        self._refill()
+        return pooled
+
+    def _unbind(self, pooled: PooledContainer, host_workspace: str):
+        if os.path.islink(host_workspace):
+            os.unlink(host_workspace)
+        os.makedirs(host_workspace, exist_ok=True)
+        _move_contents(pooled.slot_dir, host_workspace)
+
+    def release(self, pooled: PooledContainer):
+        """
+        Move the workspace back to the task folder, reset the container and return it to the pool.
+        """
+        healthy = False
+        try:
+            if pooled.host_workspace:
+                self._unbind(pooled, pooled.host_workspace)
+                pooled.host_workspace = None
+            pooled.container.exec_run(['/bin/sh', '-c', RESET_PROCESSES_COMMAND])
+            healthy = not os.listdir(pooled.slot_dir) and self._is_healthy(pooled, probe=True)
+        except Exception as e:
+            logger.error(f"Error resetting pooled container {pooled.container.short_id}: {e}")
+
+        with self._cond:
+            if pooled in self._leased:
+                self._leased.remove(pooled)
+            keep = healthy and not self._closed and len(self._idle) < self.size
+            if keep:
+                self._idle.append(pooled)
+            # The last container of a closed pool removes the pool directory
+            remove_root = self._closed and self.total == 0
+            self._cond.notify_all()
+        if not keep:
+            self._destroy(pooled)
+        if remove_root:
+            shutil.rmtree(self.pool_root, ignore_errors=True)
+        self._refill()
+
+    def close(self):
+        """Remove all idle containers; leased containers are removed when released."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            # Decided under the lock: the slots of leased containers still hold episode workspaces
+            remove_root = self.total == 0
+            self._cond.notify_all()
+        for pooled in idle:
+            self._destroy(pooled)
+        if remove_root:
+            shutil.rmtree(self.pool_root, ignore_errors=True)
+
+
+def _move_contents(src_dir: str, dst_dir: str):
+    """Move every entry of `src_dir` into `dst_dir`; a rename when both are on the same filesystem."""
+    for entry in os.listdir(src_dir):
+        shutil.move(os.path.join(src_dir, entry), os.path.join(dst_dir, entry))
+
+
+_POOLS: Dict[Tuple, ContainerPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_container_pool(
+    client: docker.DockerClient, image_tag: str, run_kwargs: Dict[str, Any], **pool_kwargs
+) -> ContainerPool:
+    """
+    Return the process-wide pool for an image and container settings, creating it on first use.
+    """
+    key = (image_tag, tuple(sorted((k, repr(v)) for k, v in run_kwargs.items())))
+    with _POOLS_LOCK:
+        if key not in _POOLS:
+            _POOLS[key] = ContainerPool(client, image_tag, run_kwargs, **pool_kwargs)
+        return _POOLS[key]
+
+
+@atexit.register
+def close_all_pools():
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.close()
+        _POOLS.clear()
@@ -1,11 +1,29 @@
 import docker
 import os
 import shortuuid
+import time
+import queue
 import platform
+import threading
+from typing import Dict, List, Optional
 from loguru import logger
 
 from virtual_server.registry import register_server
 from virtual_server.base_server import BaseServer
+from virtual_server.container_pool import RESET_PROCESSES_COMMAND, ContainerPool, PooledContainer, get_container_pool
+from virtual_server.sandbox_utils import (
+    CommandResult, OutputCollector, build_limited_command, forkserver_config, parse_times_output, prlimit_prefix
+)
+from virtual_server.sandbox_session import DockerTransport, SessionSupport, SessionTransport
+
+
+# Installed by the Dockerfile, see `virtual_server/forkserver.py`
+FORKSERVER_SCRIPT = '/opt/evoenv/forkserver.py'
+FORKSERVER_BIN = '/opt/evoenv/bin'
+
+# Images already checked or built by pooled sandboxes in this process
+_CHECKED_IMAGES = set()
+_CHECKED_IMAGES_LOCK = threading.Lock()
 
 
 def is_wsl():
@@ -13,7 +31,7 @@ def is_wsl():
 
 
 @register_server(server_name='docker_sandbox')
-class DockerSandbox(BaseServer):
+class DockerSandbox(SessionSupport, BaseServer):
     """
     A highly isolated sandbox environment built and run via a Dockerfile.
     Upon initialization, this class checks if the specified image tag exists.
@@ -24,6 +42,8 @@ class DockerSandbox(BaseServer):
     - Only mounts the specified local workspace directory as read-write.
     It is recommended to use a 'with' statement to manage sandbox instances,
     ensuring proper cleanup of container resources.
+    Set `"sandbox_config": {"backend": "local"}` to use the Docker-free
+    `LocalSandbox` instead, e.g. on hosts without a Docker daemon.
     Example:
         # Assuming the Dockerfile is in the "./" directory
         with DockerSandbox(
@@ -38,10 +58,11 @@ class DockerSandbox(BaseServer):
         self,
         task_root_path: str,
         dockerfile_path: str = 'virtual_server/Dockerfile',
-        image_tag: str = 'my-env:3.0',
+        image_tag: str = 'my-env:3.1',
         mem_limit: str = "256m",
         pids_limit: int = 100,
         cpu_shares: int = 512,
+        sandbox_config: Optional[Dict] = None,
         *args, **kwargs
     ):
         """
@@ -52,11 +73,27 @@ class DockerSandbox(BaseServer):
         :param mem_limit: Memory limit for the container (e.g., "256m", "1g").
         :param pids_limit: Maximum number of processes allowed in the container.
         :param cpu_shares: Relative weight for CPU resources.
+        :param sandbox_config: Optional `sandbox_config` section of `config.json`:
+            - pool: e.g. `{"size": 2, "max_size": 8}` leases a warm container from a
+              process-wide `ContainerPool` instead of starting a fresh one.
+            - command_timeout: default wall-clock limit per command in seconds (default 300).
+            - command_limits: per-command rlimits, e.g. `{"cpu_seconds": 120, "memory_mb": 1024, "max_processes": 64}`.
+            - persistent_shell: run `ExecuteCommand` in a persistent shell session (default False).
+            - forkserver: `true` or e.g. `{"preload": ["pandas", "numpy", "scipy"]}` runs `python`
+              commands in forks of a preloaded interpreter (see `virtual_server/forkserver.py`).
         """
+        sandbox_config = sandbox_config or {}
+        self._sessions = {}
+        self.persistent_shell = sandbox_config.get('persistent_shell', False)
+        self.forkserver = forkserver_config(sandbox_config)
+        self.command_timeout = sandbox_config.get('command_timeout', 300)
+        self.command_limits: Dict = sandbox_config.get('command_limits', {})
         self._session_id = shortuuid.uuid()
         self.image_tag = image_tag
         self.client = docker.from_env()
         self.container = None
+        self._lease: Optional[PooledContainer] = None
+        self._pool: Optional[ContainerPool] = None
         # Resource limits
         self.resource_limits = {
             "mem_limit": mem_limit,
@@ -68,15 +105,52 @@ class DockerSandbox(BaseServer):
         self.host_workspace = os.path.abspath(workspace_dir)
         os.makedirs(self.host_workspace, exist_ok=True)
         try:
-            # 1. Build the image from Dockerfile if it does not exist
-            self._build_image_if_needed(dockerfile_path)
-            # 2. Start the container
-            self._start_container()
+            pool_config = sandbox_config.get('pool')
+            if pool_config and pool_config.get('size', 0) > 0:
+                self._lease_from_pool(dockerfile_path, pool_config)
+            else:
+                # 1. Build the image from Dockerfile if it does not exist
+                self._build_image_if_needed(dockerfile_path)
+                # 2. Start the container
+                self._start_container()
+            if self.forkserver is not None:
+                self._start_forkserver()
         except Exception as e:
             logger.error(f"Sandbox environment setup failed: {e}")
             self.close()  # Attempt to clean up on startup failure
             raise
 
+    def _container_run_kwargs(self) -> Dict:
+        """Settings shared by dedicated and pooled containers, everything except the workspace mount."""
+        return dict(
+            command="sleep infinity",  # Keep the container running
+            detach=True,
+            # Security settings
+            network_disabled=True,     # Disable networking
+            read_only=True,            # Make root filesystem read-only
+            security_opt=["no-new-privileges"],
+            cap_drop=['ALL'],
+            # Run as a non-root user
+            user="root" if is_wsl() else f"{os.getuid()}:{os.getgid()}",
+            **self.resource_limits
+        )
+
+    def _lease_from_pool(self, dockerfile_path: str, pool_config: Dict):
+        """Leases a warm container and binds this task's workspace to it."""
+        run_kwargs = self._container_run_kwargs()
+        pool_kwargs = {
+            k: v for k, v in pool_config.items()
+            if k in ('size', 'max_size', 'pool_root', 'lease_timeout')
+        }
+        with _CHECKED_IMAGES_LOCK:
+            if self.image_tag not in _CHECKED_IMAGES:
+                # The image only needs to be checked once per process
+                self._build_image_if_needed(dockerfile_path)
+                _CHECKED_IMAGES.add(self.image_tag)
+        self._pool = get_container_pool(self.client, self.image_tag, run_kwargs, **pool_kwargs)
+        self._lease = self._pool.lease(self.host_workspace)
+        self.container = self._lease.container
+
     def _build_image_if_needed(self, dockerfile_path: str):
         """Checks if the image exists, and builds it from the Dockerfile if not."""
         try:
@@ -109,44 +183,131 @@ class DockerSandbox(BaseServer):
         logger.info("Starting a network-isolated container...")
         self.container = self.client.containers.run(
             self.image_tag,
-            command="sleep infinity",  # Keep the container running
-            detach=True,
-            # Security settings
-            network_disabled=True,     # Disable networking
-            read_only=True,            # Make root filesystem read-only
-            security_opt=["no-new-privileges"],
-            cap_drop=['ALL'],
             # Mount workspace as read-write
             volumes={self.host_workspace: {'bind': '/workspace', 'mode': 'rw'}},
-            # Run as a non-root user
-            user="root" if is_wsl() else f"{os.getuid()}:{os.getgid()}",
-            **self.resource_limits
+            **self._container_run_kwargs()
         )
         logger.success(f"Container {self.container.short_id} started successfully.")
 
-    def run_command(self, command: str) -> tuple[int, str]:
-        """Executes a command inside the container's workspace."""
+    def _start_forkserver(self):
+        """Starts the forkserver daemon; it exits before preloading if the (pooled) container already runs one."""
+        self.container.exec_run(
+            ['python3', FORKSERVER_SCRIPT, '--serve', '--preload', ','.join(self.forkserver['preload'])],
+            detach=True,
+        )
+
+    def execute(
+        self, command: str, timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None
+    ) -> CommandResult:
+        """
+        Executes a command inside the container's workspace, streaming its output.
+
+        Output is read incrementally and only the first `max_output_bytes` bytes are
+        kept, so a runaway command cannot exhaust host memory. The command runs under
+        `timeout` and the per-command rlimits from `sandbox_config.command_limits`;
+        CPU time is reported from the shell's `times` builtin.
+
+        :param command: The shell command to run.
+        :param timeout: Wall-clock limit in seconds, defaults to `sandbox_config.command_timeout`.
+        :param max_output_bytes: Keep at most this many bytes of output, None keeps everything.
+        :return: A `CommandResult` with exit code, output and resource usage.
+        """
         if not self.container:
             raise RuntimeError("Container is not running.")
-        # logger.info(f"\n> Executing command: '{command}'")
-        exec_result = self.container.exec_run(
-            ["/bin/sh", "-c", command],
+        timeout = timeout if timeout is not None else self.command_timeout
+        marker = f"__EVOENV_DONE_{shortuuid.uuid()}__"
+        script = build_limited_command(
+            command, timeout, self.command_limits, marker,
+            path_prefix=FORKSERVER_BIN if self.forkserver is not None else None
+        )
+
+        exec_id = self.client.api.exec_create(
+            self.container.id,
+            ["/bin/sh", "-c", script],
             workdir="/workspace",  # Execute inside the mounted workspace
-            demux=True
+        )['Id']
+        stream = self.client.api.exec_start(exec_id, stream=True, demux=True)
+
+        # Read in a helper thread so a silent, hung command cannot block past the deadline
+        chunks: queue.Queue = queue.Queue()
+        def _reader():
+            try:
+                for stdout_chunk, stderr_chunk in stream:
+                    chunks.put(stdout_chunk or b'')
+                    chunks.put(stderr_chunk or b'')
+            finally:
+                chunks.put(None)
+        threading.Thread(target=_reader, daemon=True).start()
+
+        collector = OutputCollector(max_output_bytes)
+        start = time.monotonic()
+        # Grace period on top of the in-container `timeout -k 2`
+        deadline = start + timeout + 10 if timeout else None
+        backstop_hit = False
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            try:
+                chunk = chunks.get(timeout=remaining) if remaining is None or remaining > 0 else None
+            except queue.Empty:
+                chunk = None
+            if chunk is None:
+                if deadline is not None and time.monotonic() >= deadline:
+                    backstop_hit = True
+                break
+            collector.feed(chunk)
+        wall_time = time.monotonic() - start
+
+        output, frame, output_bytes = collector.split_frame(marker.encode())
+        cpu_user = cpu_sys = None
+        if frame is not None:
+            frame_text = frame.decode('utf-8', errors='ignore')
+            header, _, times_text = frame_text.partition('\n')
+            exit_code = int(header.split()[-1])
+            cpu_user, cpu_sys = parse_times_output(times_text)
+        elif backstop_hit:
+            logger.warning(f"Command did not exit {wall_time:.0f}s after its timeout, killing all sandbox processes.")
+            self.container.exec_run(['/bin/sh', '-c', RESET_PROCESSES_COMMAND])
+            exit_code = -1
+        else:
+            exit_code = self.client.api.exec_inspect(exec_id).get('ExitCode')
+            exit_code = -1 if exit_code is None else exit_code
+
+        timed_out = backstop_hit or bool(timeout and exit_code in (124, 137) and wall_time >= timeout)
+        return CommandResult(
+            exit_code=exit_code,
+            output=output.decode('utf-8', errors='ignore').strip(),
+            timed_out=timed_out,
+            truncated=max_output_bytes is not None and output_bytes > max_output_bytes,
+            output_bytes=output_bytes,
+            wall_time=wall_time,
+            cpu_user=cpu_user,
+            cpu_sys=cpu_sys,
         )
-        exit_code = exec_result.exit_code
-        stdout_bytes, stderr_bytes = exec_result.output
-        output = ""
-        if stdout_bytes:
-            output += stdout_bytes.decode('utf-8', errors='ignore')
-        if stderr_bytes:
-            output += stderr_bytes.decode('utf-8', errors='ignore')
-        # logger.info(f"Exit code: {exit_code}")
-        # logger.info(f"Output:\n{output.strip()}")
-        return exit_code, output.strip()
+
+    def _open_session_transport(self, argv: List[str]) -> SessionTransport:
+        if not self.container:
+            raise RuntimeError("Container is not running.")
+        if self.forkserver is not None:
+            argv = ['/bin/sh', '-c', f'PATH={FORKSERVER_BIN}:"$PATH"; export PATH; exec "$@"', 'sh'] + argv
+        # The session process itself runs under the per-command rlimits
+        return DockerTransport(self.client, self.container, prlimit_prefix(self.command_limits) + argv)
+
+    def run_command(self, command: str, timeout: Optional[float] = None) -> tuple[int, str]:
+        """Executes a command inside the container's workspace."""
+        result = self.execute(command, timeout=timeout)
+        return result.exit_code, result.output
     
     def close(self):
         """Stops and removes the container, cleaning up resources."""
+        self.close_sessions()
+        if self._lease is not None:
+            # Pooled containers are reset and kept warm for the next episode
+            lease, self._lease = self._lease, None
+            self.container = None
+            self._pool.release(lease)
+            logger.success("Sandbox returned to the container pool.")
+            return
         if self.container:
             logger.info("Cleaning up sandbox resources...")
             try:
@@ -0,0 +1,311 @@
+import os
+import re
+import mmap
+import bisect
+from array import array
+from collections import OrderedDict
+from loguru import logger
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from virtual_server.registry import register_server
+from virtual_server.base_server import BaseServer
+
+
+# Longest slices returned to the agent
+MAX_LINES = 500
+MAX_BYTES = 64 * 1024
+MAX_LINE_CHARS = 1000
+MAX_MATCHES = 100
+# Files up to this size are indexed completely on first access, so their line count is known
+EAGER_INDEX_BYTES = 64 * 1024 * 1024
+
+
+class LineIndex:
+    """
+    Sparse line-offset index of a file: the byte offset of every `STRIDE`-th line.
+
+    The index is extended lazily, only as far as the lines asked for, by counting newlines
+    chunk by chunk with numpy. A line is then found by jumping to the checkpoint before it
+    and skipping at most `STRIDE - 1` newlines, so the cost of reading a slice does not
+    depend on where it is in the file.
+    """
+    STRIDE = 1024
+    CHUNK_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, size: int):
+        self.size = size
+        # Byte offsets of lines 0, STRIDE, 2 * STRIDE, ... (0-based)
+        self.checkpoints = array('q', [0])
+        self.scanned = 0
+        self.newlines = 0
+        self._last_byte = None
+
+    @property
+    def complete(self) -> bool:
+        return self.scanned >= self.size
+
+    @property
+    def num_lines(self) -> Optional[int]:
+        """Number of lines, once the whole file is indexed; a last line without a newline counts."""
+        if not self.complete:
+            return None
+        return self.newlines + (1 if self.size and self._last_byte != 0x0A else 0)
+
+    def extend(self, mm: mmap.mmap, until_line: Optional[int] = None, until_offset: Optional[int] = None):
+        """Indexes the file until `until_line` or `until_offset` is covered, or to its end."""
+        while not self.complete:
+            if until_line is not None and self.newlines > until_line:
+                return
+            if until_offset is not None and self.scanned > until_offset:
+                return
+            end = min(self.scanned + self.CHUNK_BYTES, self.size)
+            chunk = np.frombuffer(mm, dtype=np.uint8, count=end - self.scanned, offset=self.scanned)
+            positions = np.flatnonzero(chunk == 0x0A) + self.scanned
+            # The newline numbered k (1-based) starts line k
+            numbers = np.arange(self.newlines + 1, self.newlines + 1 + len(positions))
+            self.checkpoints.extend((positions[numbers % self.STRIDE == 0] + 1).tolist())
+            self.newlines += len(positions)
+            self.scanned = end
+            if self.complete and self.size:
+                self._last_byte = mm[self.size - 1]
+
+    def line_offset(self, mm: mmap.mmap, line: int) -> Optional[int]:
+        """Byte offset where a line (0-based) starts, or None past the end of the file."""
+        self.extend(mm, until_line=line)
+        if line > self.newlines:
+            return None
+        pos = self.checkpoints[line // self.STRIDE]
+        for _ in range(line % self.STRIDE):
+            pos = mm.find(b'\n', pos) + 1
+        if pos >= self.size and line > 0:
+            return None
+        return pos
+
+    def line_number(self, mm: mmap.mmap, offset: int) -> int:
+        """Line (0-based) holding the byte at `offset`."""
+        self.extend(mm, until_offset=offset)
+        k = bisect.bisect_right(self.checkpoints, offset) - 1
+        return k * self.STRIDE + mm[self.checkpoints[k]:offset].count(b'\n')
+
+
+class _MappedFile:
+    def __init__(self, path: Path, stat_key: Tuple[int, int, int]):
+        self.stat_key = stat_key
+        self.size = stat_key[1]
+        self.file = open(path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self.index = LineIndex(self.size)
+        if self.mm is not None and self.size <= EAGER_INDEX_BYTES:
+            self.index.extend(self.mm)
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+        self.file.close()
+
+
+def _decode(data: bytes) -> str:
+    text = data.decode('utf-8', errors='replace').rstrip('\r')
+    return text if len(text) <= MAX_LINE_CHARS else text[:MAX_LINE_CHARS] + '...'
+
+
+@register_server(server_name='file_reader')
+class FileReader(BaseServer):
+    """
+    Reads slices of workspace files through `mmap`: line ranges, head and tail, byte ranges
+    and grep with context, without loading whole files into memory or into the agent's
+    context.
+
+    Mapped files and their `LineIndex` are kept for the episode (the most recent
+    `MAX_OPEN_FILES`) and rebuilt when a file's inode, size or mtime changes.
+
+    Example:
+        reader = FileReader(task_root_path="./my_task")
+        print(reader.read_lines('logs/server.log', start_line=-20))
+        print(reader.grep('logs/server.log', 'ERROR|Timeout', context=2))
+    """
+    MAX_OPEN_FILES = 16
+
+    def __init__(self, task_root_path: str, *args, **kwargs) -> None:
+        """
+        Args:
+            task_root_path: Task folder holding the `workspace`.
+        """
+        self.workspace_path = Path(task_root_path) / 'workspace'
+        self._files: 'OrderedDict[str, _MappedFile]' = OrderedDict()
+
+    def _open(self, file_path: str) -> _MappedFile:
+        path = (self.workspace_path / file_path).resolve()
+        if not path.is_relative_to(self.workspace_path.resolve()):
+            raise ValueError(f"'{file_path}' is outside of your workspace.")
+        if not path.is_file():
+            raise FileNotFoundError(f"File '{file_path}' does not exist in your workspace.")
+        st = os.stat(path)
+        stat_key = (st.st_ino, st.st_size, st.st_mtime_ns)
+        key = str(path)
+        mapped = self._files.get(key)
+        if mapped is not None and mapped.stat_key == stat_key:
+            self._files.move_to_end(key)
+            return mapped
+        if mapped is not None:
+            mapped.close()
+        mapped = self._files[key] = _MappedFile(path, stat_key)
+        self._files.move_to_end(key)
+        if len(self._files) > self.MAX_OPEN_FILES:
+            self._files.popitem(last=False)[1].close()
+        logger.debug(f"[File Reader] Mapped '{file_path}' ({st.st_size} bytes).")
+        return mapped
+
+    def _size_str(self, mapped: _MappedFile) -> str:
+        num_lines = mapped.index.num_lines
+        return f"{mapped.size} bytes" + (f", {num_lines} lines" if num_lines is not None else "")
+
+    def read_lines(self, file_path: str, start_line: int = 1, num_lines: int = 100) -> str:
+        """
+        Args:
+            file_path: Path in the workspace.
+            start_line: First line (1-based); a negative value counts from the end, e.g. -20
+                for the last 20 lines.
+            num_lines: Number of lines, at most `MAX_LINES`.
+        """
+        mapped = self._open(file_path)
+        num_lines = max(1, min(int(num_lines), MAX_LINES))
+        start_line = int(start_line)
+        if mapped.mm is None:
+            return f"'{file_path}' is empty."
+        mm, index = mapped.mm, mapped.index
+
+        first = start_line
+        if start_line < 0 and index.num_lines is not None:
+            first = max(1, index.num_lines + start_line + 1)
+        if first < 0:
+            # Counted back from the end of a file too large to count its lines
+            # Start of the line after the last one; a final newline does not start another line
+            pos = mapped.size if mm[mapped.size - 1:] == b'\n' else mapped.size + 1
+            for _ in range(-start_line):
+                if pos == 0:
+                    break
+                pos = mm.rfind(b'\n', 0, pos - 1) + 1
+            first = None
+        else:
+            first = max(first, 1)
+            pos = index.line_offset(mm, first - 1)
+            if pos is None:
+                return f"Error: '{file_path}' has fewer than {first} lines ({self._size_str(mapped)})."
+        lines = []
+        while len(lines) < num_lines and pos < mapped.size:
+            end = mm.find(b'\n', pos)
+            end = mapped.size if end < 0 else end
+            lines.append(mm[pos:end])
+            pos = end + 1
+
+        if first is None:
+            body = '\n'.join(_decode(line) for line in lines)
+            header = f"[{file_path}] {len(lines)} lines from line {start_line} counted from the end ({self._size_str(mapped)})"
+        else:
+            body = '\n'.join(f"{first + i:>6}| {_decode(line)}" for i, line in enumerate(lines))
+            header = f"[{file_path}] lines {first}-{first + len(lines) - 1} ({self._size_str(mapped)})"
+        return f"{header}\n{body}"
+
+    def read_bytes(self, file_path: str, offset: int = 0, length: int = 4096) -> str:
+        """
+        Args:
+            file_path: Path in the workspace.
+            offset: First byte; a negative value counts from the end.
+            length: Number of bytes, at most `MAX_BYTES`.
+        """
+        mapped = self._open(file_path)
+        if mapped.mm is None:
+            return f"'{file_path}' is empty."
+        offset = int(offset)
+        offset = max(0, mapped.size + offset) if offset < 0 else min(offset, mapped.size)
+        end = min(offset + max(0, min(int(length), MAX_BYTES)), mapped.size)
+        text = mapped.mm[offset:end].decode('utf-8', errors='replace')
+        return f"[{file_path}] bytes {offset}-{end} of {mapped.size}\n{text}"
+
+    def grep(
+            self, file_path: str, pattern: str, context: int = 0,
+            ignore_case: bool = False, max_matches: int = 20
+        ) -> str:
+        """
+        Args:
+            file_path: Path in the workspace.
+            pattern: Regular expression (Python syntax) searched line by line.
+            context: Lines shown before and after each matching line.
+            ignore_case: Case-insensitive search.
+            max_matches: Maximum number of matching lines, at most `MAX_MATCHES`.
+        """
+        mapped = self._open(file_path)
+        if mapped.mm is None:
+            return f"'{file_path}' is empty."
+        try:
+            regex = re.compile(pattern.encode('utf-8'), re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+        except re.error as e:
+            return f"Error: Invalid pattern `{pattern}`: {e}"
+        mm, index = mapped.mm, mapped.index
+        context = max(0, min(int(context), 20))
+        max_matches = max(1, min(int(max_matches), MAX_MATCHES))
+
+        # Shown lines as [line, marker, text], and `None` between separate blocks
+        blocks: List[Optional[list]] = []
+        matches, last_shown, pos = 0, -1, 0
+        more = False
+        while True:
+            m = regex.search(mm, pos)
+            if m is None:
+                break
+            line_start = mm.rfind(b'\n', 0, m.start()) + 1
+            if line_start >= mapped.size:
+                # An empty match after the final newline is not a line
+                break
+            line_end = mm.find(b'\n', line_start)
+            line_end = mapped.size if line_end < 0 else line_end
+            if m.end() > line_end:
+                # Like grep, a match must lie within one line, e.g. for `\s` or `[^x]`
+                m = regex.search(mm, line_start, line_end)
+                if m is None:
+                    pos = line_end + 1
+                    if pos >= mapped.size:
+                        break
+                    continue
+            if matches == max_matches:
+                more = True
+                break
+            matches += 1
+            number = index.line_number(mm, line_start)
+
+            if number <= last_shown:
+                # Already shown as context of the previous match
+                next(entry for entry in reversed(blocks) if entry and entry[0] == number)[1] = ':'
+            first = max(number - context, last_shown + 1)
+            if blocks and first > last_shown + 1:
+                blocks.append(None)
+            start = index.line_offset(mm, first)
+            for n in range(first, number + context + 1):
+                if start is None or start >= mapped.size:
+                    break
+                end = mm.find(b'\n', start)
+                end = mapped.size if end < 0 else end
+                if n > last_shown:
+                    blocks.append([n, ':' if n == number else '-', _decode(mm[start:end])])
+                    last_shown = n
+                start = end + 1
+            # One hit per line
+            pos = line_end + 1
+            if pos >= mapped.size:
+                break
+
+        if not matches:
+            return f"[{file_path}] No line matches `{pattern}` ({self._size_str(mapped)})."
+        header = f"[{file_path}] {matches}{'+' if more else ''} matching lines for `{pattern}` ({self._size_str(mapped)})"
+        footer = f"\n(Stopped after {max_matches} matches; narrow the pattern to see the others.)" if more else ""
+        body = '\n'.join(f"{entry[0] + 1:>6}{entry[1]} {entry[2]}" if entry else '--' for entry in blocks)
+        return f"{header}\n{body}{footer}"
+
+    def close(self):
+        for mapped in self._files.values():
+            mapped.close()
+        self._files.clear()
@@ -0,0 +1,444 @@
+"""
+Preloaded Python forkserver for the sandbox.
+
+The server imports heavy libraries (pandas, numpy, scipy) once and forks a fresh
+child for every `python` command, so each script runs in its own process but
+skips the import cost. A `python` shim placed first in PATH forwards the command
+line, working directory, environment, rlimits and stdio file descriptors to the
+server, and falls back to the real interpreter for unsupported options or when
+the server is not running.
+
+This file only uses the standard library: it is copied into the sandbox image
+and also run directly by `LocalSandbox`.
+
+Usage:
+    python forkserver.py --serve --address @evoenv-forkserver --preload pandas,numpy,scipy
+    python forkserver.py --install-shims /opt/evoenv/bin
+    python forkserver.py --reset
+    python forkserver.py --benchmark 10
+"""
+import os
+import sys
+import resource
+# Everything else is imported where it is used, to keep the shim fast
+
+
+DEFAULT_ADDRESS = '@evoenv-forkserver'
+DEFAULT_PRELOAD = ('pandas', 'numpy', 'scipy')
+ADDRESS_ENV = 'EVOENV_FORKSERVER'
+# Limits the shim forwards so forked children get the same rlimits as a cold interpreter
+FORWARDED_RLIMITS = ('RLIMIT_CPU', 'RLIMIT_AS', 'RLIMIT_NPROC')
+
+
+def _socket_address(address: str) -> str:
+    """`@name` is a Linux abstract socket, which needs no writable filesystem."""
+    return '\0' + address[1:] if address.startswith('@') else address
+
+
+def _parse_python_args(args):
+    """
+    Map a python command line onto a forkserver request.
+
+    Returns:
+        (mode, target, argv, unbuffered), or None if the options are not supported
+    """
+    unbuffered = False
+    while args and args[0] == '-u':
+        unbuffered = True
+        args = args[1:]
+    if not args or args[0] == '-':
+        if not args and sys.stdin.isatty():
+            return None  # Interactive interpreter
+        return 'stdin', None, ['-'] + args[1:] if args else [''], unbuffered
+    if args[0] == '-c' and len(args) > 1:
+        return 'code', args[1], ['-c'] + args[2:], unbuffered
+    if args[0] == '-m' and len(args) > 1:
+        return 'module', args[1], [args[1]] + args[2:], unbuffered
+    if args[0].startswith('-'):
+        return None
+    return 'script', args[0], list(args), unbuffered
+
+
+# ---------------------------------------------------------------- client
+
+def run_client(args):
+    """Entry point of the `python` shim; never returns."""
+    # The C modules avoid importing `enum`/`re`, which would cost more than the fork itself
+    import array
+    import _signal
+    import _socket
+    request = _parse_python_args(args)
+    address = os.environ.get(ADDRESS_ENV, DEFAULT_ADDRESS)
+    sock = None
+    if request is not None:
+        try:
+            sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+            sock.connect(_socket_address(address))
+        except OSError:
+            sock = None
+    if sock is None:
+        # Unsupported options or no server: run the real interpreter
+        os.execv(sys.executable, [sys.executable] + list(args))
+
+    mode, target, argv, unbuffered = request
+    # A Python literal, read back with `ast.literal_eval`
+    header = repr({
+        'mode': mode,
+        'target': target,
+        'argv': argv,
+        'unbuffered': unbuffered,
+        'cwd': os.getcwd(),
+        'env': dict(os.environ),
+        'rlimits': {
+            name: resource.getrlimit(getattr(resource, name)) for name in FORWARDED_RLIMITS
+        },
+    }).encode()
+    sock.sendmsg(
+        [len(header).to_bytes(4, 'big')],
+        [(_socket.SOL_SOCKET, _socket.SCM_RIGHTS, array.array('i', [0, 1, 2]))]
+    )
+    sock.sendall(header)
+
+    # If this shim is killed (e.g. by `timeout`), the closed connection makes the server kill the child
+    status = b''
+    while not status.endswith(b'\n'):
+        chunk = sock.recv(64)
+        if not chunk:
+            os._exit(1)
+        status += chunk
+    exit_code = int(status)
+    if exit_code < 0:
+        # Die from the same signal, so the shell reports 128 + signal like for a cold interpreter
+        try:
+            _signal.signal(-exit_code, _signal.SIG_DFL)
+        except OSError:
+            pass  # SIGKILL and SIGSTOP cannot be handled anyway
+        os.kill(os.getpid(), -exit_code)
+        exit_code = 128 - exit_code
+    os._exit(exit_code)
+
+
+# ---------------------------------------------------------------- server
+
+def _recv_exactly(conn, size: int) -> bytes:
+    data = b''
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError('Client closed the connection.')
+        data += chunk
+    return data
+
+
+def _run_child(request):
+    """Runs the forwarded command in the forked child. Returns the exit code."""
+    import types
+    import runpy
+    import traceback
+    sys.argv = request['argv']
+    if request['unbuffered']:
+        sys.stdout.reconfigure(write_through=True)
+        sys.stderr.reconfigure(write_through=True)
+    mode, target = request['mode'], request['target']
+    try:
+        if mode == 'script':
+            sys.path[0] = os.path.dirname(os.path.abspath(target))
+            runpy.run_path(target, run_name='__main__')
+        elif mode == 'module':
+            sys.path[0] = os.getcwd()
+            runpy.run_module(target, run_name='__main__', alter_sys=True)
+        else:
+            sys.path[0] = ''
+            filename = '<string>' if mode == 'code' else '<stdin>'
+            source = target if mode == 'code' else sys.stdin.read()
+            main = types.ModuleType('__main__')
+            sys.modules['__main__'] = main
+            exec(compile(source, filename, 'exec'), main.__dict__)
+        return 0
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        exc_type, exc_value, exc_tb = sys.exc_info()
+        # Hide the forkserver frames, like a cold interpreter would
+        hidden = (__file__, runpy.__file__, '<frozen runpy>')
+        while exc_tb is not None and exc_tb.tb_frame.f_code.co_filename in hidden:
+            exc_tb = exc_tb.tb_next
+        traceback.print_exception(exc_type, exc_value, exc_tb)
+        return 1
+
+
+def _child_main(request, fds):
+    os.setsid()
+    for target_fd, fd in zip((0, 1, 2), fds):
+        os.dup2(fd, target_fd)
+        os.close(fd)
+    os.chdir(request['cwd'])
+    os.environ.clear()
+    os.environ.update(request['env'])
+    for name, limits in request['rlimits'].items():
+        try:
+            resource.setrlimit(getattr(resource, name), tuple(limits))
+        except (ValueError, OSError):
+            pass
+    exit_code = _run_child(request)
+    try:
+        import atexit
+        atexit._run_exitfuncs()
+        sys.stdout.flush()
+        sys.stderr.flush()
+    finally:
+        os._exit(exit_code & 0xFF)
+
+
+def _supervise(conn):
+    """
+    Runs in a fork of the server for one request: forks the child that runs the
+    command and reports its exit status, killing it if the client goes away.
+    """
+    import ast
+    import select
+    import signal
+    import socket
+    header_len, fds, _, _ = socket.recv_fds(conn, 4, 3)
+    header_len += _recv_exactly(conn, 4 - len(header_len))
+    request = ast.literal_eval(_recv_exactly(conn, int.from_bytes(header_len, 'big')).decode())
+
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    pid = os.fork()
+    if pid == 0:
+        conn.close()
+        _child_main(request, fds)
+    for fd in fds:
+        os.close(fd)
+
+    try:
+        exit_fd = os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        exit_fd = None
+    while True:
+        waited, status = os.waitpid(pid, os.WNOHANG)
+        if waited:
+            conn.sendall(f'{os.waitstatus_to_exitcode(status)}\n'.encode())
+            return
+        readable, _, _ = select.select([conn] + ([exit_fd] if exit_fd is not None else []), [], [],
+                                       None if exit_fd is not None else 0.01)
+        if conn in readable and not conn.recv(1):
+            # The client was killed, e.g. by a timeout: take the command down with it
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            os.waitpid(pid, 0)
+            return
+
+
+def serve(address: str, preload):
+    """Preloads the modules, then forks a supervised child for every connection."""
+    import signal
+    import socket
+    # A pooled container keeps its server across leases; do not preload a second one for nothing
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(_socket_address(address))
+        print(f'forkserver: {address} is already served, exiting.', file=sys.stderr)
+        return
+    except OSError:
+        pass
+    finally:
+        probe.close()
+    for module in preload:
+        try:
+            __import__(module)
+        except ImportError as e:
+            print(f'forkserver: cannot preload {module}: {e}', file=sys.stderr)
+
+    if not address.startswith('@') and os.path.exists(address):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(address)
+        except OSError:
+            # Left behind by a server that was killed
+            os.unlink(address)
+        finally:
+            probe.close()
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        # Bind only after preloading; until then shims fall back to a cold interpreter
+        listener.bind(_socket_address(address))
+    except OSError:
+        print(f'forkserver: {address} is already in use, exiting.', file=sys.stderr)
+        return
+    listener.listen(64)
+    # Supervisors are reaped automatically
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    null = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(null, 0)
+
+    try:
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except InterruptedError:
+                continue
+            if os.fork() == 0:
+                listener.close()
+                try:
+                    _supervise(conn)
+                finally:
+                    os._exit(0)
+            conn.close()
+    finally:
+        listener.close()
+        if not address.startswith('@'):
+            os.unlink(address)
+
+
+# ---------------------------------------------------------------- reset
+
+def _cmdline(pid: int):
+    with open(f'/proc/{pid}/cmdline', 'rb') as f:
+        return f.read().split(b'\0')
+
+
+def _is_server_cmdline(cmdline) -> bool:
+    return b'--serve' in cmdline and any(arg.endswith(b'forkserver.py') for arg in cmdline)
+
+
+def processes_to_reset(proc_root: str = '/proc'):
+    """
+    Pids of the processes `reset` kills: all but PID 1, this process, its parent and the
+    forkserver itself. Supervisors and the commands they run share the server's command
+    line but have a forkserver as parent, so they are killed.
+    """
+    keep = {1, os.getpid(), os.getppid()}
+    pids = []
+    for name in os.listdir(proc_root):
+        if not name.isdigit() or int(name) in keep:
+            continue
+        pid = int(name)
+        try:
+            if _is_server_cmdline(_cmdline(pid)):
+                with open(f'{proc_root}/{pid}/stat', 'rb') as f:
+                    ppid = int(f.read().rsplit(b')', 1)[1].split()[1])
+                try:
+                    parent_is_server = ppid > 0 and _is_server_cmdline(_cmdline(ppid))
+                except OSError:
+                    parent_is_server = False
+                if not parent_is_server:
+                    continue
+        except (OSError, ValueError, IndexError):
+            continue  # Exited meanwhile
+        pids.append(pid)
+    return pids
+
+
+def reset(rounds: int = 10):
+    """
+    Kills everything an episode left running in a pooled container, like `kill -9 -1`,
+    but keeps the forkserver so its preloaded modules survive the next lease.
+    """
+    import signal
+    for _ in range(rounds):
+        killed = 0
+        for pid in processes_to_reset():
+            try:
+                os.kill(pid, signal.SIGKILL)
+                killed += 1
+            except OSError:
+                pass
+        # A process may have forked while the list was read
+        if not killed:
+            return
+
+
+# ---------------------------------------------------------------- tooling
+
+def install_shims(bin_dir: str, python: str = sys.executable, script: str = os.path.abspath(__file__)):
+    """Writes `python` and `python3` shims into `bin_dir`; put it first in PATH to route commands to the server."""
+    os.makedirs(bin_dir, exist_ok=True)
+    for name in ('python', 'python3'):
+        path = os.path.join(bin_dir, name)
+        with open(path, 'w') as f:
+            f.write(f'#!/bin/sh\nexec {python} -S -E {script} --client "$@"\n')
+        os.chmod(path, 0o755)
+
+
+def benchmark(runs: int, preload, code: str = None):
+    """Compares cold interpreter starts with forkserver starts for the same snippet."""
+    import time
+    import signal
+    import tempfile
+    import subprocess
+    code = code or 'import ' + ', '.join(preload)
+    work_dir = tempfile.mkdtemp(prefix='evoenv_forkserver_')
+    address = os.path.join(work_dir, 'forkserver.sock')
+    bin_dir = os.path.join(work_dir, 'bin')
+    install_shims(bin_dir)
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--serve', '--address', address, '--preload', ','.join(preload)],
+        start_new_session=True,
+    )
+    try:
+        while not os.path.exists(address):
+            if server.poll() is not None:
+                raise RuntimeError('forkserver exited during startup')
+            time.sleep(0.05)
+        env = dict(os.environ, **{ADDRESS_ENV: address})
+
+        def _time(argv):
+            samples = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                subprocess.run(argv, env=env, check=True)
+                samples.append(time.perf_counter() - start)
+            samples.sort()
+            return samples[len(samples) // 2], sum(samples) / len(samples)
+
+        cold = _time([sys.executable, '-c', code])
+        warm = _time([os.path.join(bin_dir, 'python'), '-c', code])
+        print(f'snippet: {code!r}, {runs} runs')
+        print(f'cold interpreter: median {cold[0] * 1000:8.1f} ms, mean {cold[1] * 1000:8.1f} ms')
+        print(f'forkserver      : median {warm[0] * 1000:8.1f} ms, mean {warm[1] * 1000:8.1f} ms')
+        print(f'speedup         : {cold[0] / warm[0]:.1f}x')
+    finally:
+        os.killpg(server.pid, signal.SIGKILL)
+        server.wait()
+        for name in os.listdir(bin_dir):
+            os.unlink(os.path.join(bin_dir, name))
+        os.rmdir(bin_dir)
+        if os.path.exists(address):
+            os.unlink(address)
+        os.rmdir(work_dir)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--client':
+        run_client(sys.argv[2:])
+
+    import argparse
+    parser = argparse.ArgumentParser(description='Preloaded Python forkserver for the sandbox.')
+    parser.add_argument('--serve', action='store_true', help='Run the server.')
+    parser.add_argument('--address', default=os.environ.get(ADDRESS_ENV, DEFAULT_ADDRESS),
+                        help='Unix socket path, or @name for an abstract socket.')
+    parser.add_argument('--preload', default=','.join(DEFAULT_PRELOAD), help='Comma-separated modules to import.')
+    parser.add_argument('--install-shims', metavar='BIN_DIR', help='Write python/python3 shims into BIN_DIR.')
+    parser.add_argument('--reset', action='store_true', help='Kill every process but PID 1 and the server.')
+    parser.add_argument('--benchmark', type=int, metavar='RUNS', help='Compare cold and warm start latency.')
+    args = parser.parse_args()
+
+    preload = [m for m in args.preload.split(',') if m]
+    if args.install_shims:
+        install_shims(args.install_shims)
+    elif args.reset:
+        reset()
+    elif args.benchmark:
+        benchmark(args.benchmark, preload)
+    elif args.serve:
+        serve(args.address, preload)
+    else:
+        parser.print_help()
@@ -0,0 +1,155 @@
+import io
+import os
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+from loguru import logger
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow ships with matplotlib; without it images are sent as they are
+    Image = None
+
+
+FORMAT_MIMES = {'webp': 'image/webp', 'jpeg': 'image/jpeg', 'png': 'image/png'}
+
+DEFAULT_IMAGE_CONFIG = {
+    'max_side': 1024,
+    'format': 'webp',
+    'quality': 80,
+    'cache_path': None,
+}
+
+
+class ImageEncoder:
+    """
+    Turns image files into compact base64 data URLs for multimodal messages.
+
+    Images are downscaled so that their longer side is at most `max_side` and re-encoded
+    to `format`; the original bytes are kept when re-encoding would not make them smaller.
+    Encoded results are cached by the SHA-256 of the file content and the encoding
+    settings: in memory for the process, and on disk when `cache_path` is set. The content
+    hash of a path is itself memoized by (device, inode, size, mtime) for the last
+    `DIGEST_CACHE_ENTRIES` files of the encoder, so a repeated read of the same file costs
+    one `stat`.
+
+    Example:
+        encoder = ImageEncoder({'max_side': 768})
+        mime, b64, info = encoder.encode('workspace/heatmap.png', 'image/png')
+    """
+    MEMORY_CACHE_ENTRIES = 64
+    DIGEST_CACHE_ENTRIES = 256
+
+    # Shared by all encoders of the process, e.g. the environments of a benchmark run
+    _memory_cache: 'OrderedDict[str, Tuple[str, str]]' = OrderedDict()
+    # Tools run from several threads (human interface, pooled environments)
+    _memory_cache_lock = threading.Lock()
+
+    def __init__(self, image_config: Optional[Dict] = None):
+        """
+        Args:
+            image_config: Optional `cloud_disk_config.image` section of `config.json`:
+                - max_side: longest side in pixels after downscaling, 0 keeps the size (default 1024).
+                - format: `webp` (default), `jpeg` or `png`.
+                - quality: lossy quality for webp/jpeg (default 80).
+                - cache_path: folder for encoded images shared across runs (default: memory only).
+        """
+        config = {**DEFAULT_IMAGE_CONFIG, **(image_config or {})}
+        self.max_side = int(config['max_side'] or 0)
+        self.format = str(config['format']).lower().replace('jpg', 'jpeg')
+        if self.format not in FORMAT_MIMES:
+            raise ValueError(f"Unknown image format `{self.format}`, expected one of {tuple(FORMAT_MIMES)}.")
+        self.quality = int(config['quality'])
+        self.cache_path = Path(config['cache_path']) if config['cache_path'] else None
+        if self.cache_path:
+            self.cache_path.mkdir(parents=True, exist_ok=True)
+        # (device, inode, size, mtime) -> SHA-256 of the content, least recently used first
+        self._digests: 'OrderedDict[Tuple[int, int, int, int], str]' = OrderedDict()
+        self._digests_lock = threading.Lock()
+
+    def _digest(self, path: Path) -> str:
+        st = os.stat(path)
+        key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        with self._digests_lock:
+            digest = self._digests.get(key)
+            if digest is not None:
+                self._digests.move_to_end(key)
+                return digest
+        with open(path, 'rb') as f:
+            digest = hashlib.file_digest(f, 'sha256').hexdigest()
+        with self._digests_lock:
+            self._digests[key] = digest
+            if len(self._digests) > self.DIGEST_CACHE_ENTRIES:
+                self._digests.popitem(last=False)
+        return digest
+
+    def _reencode(self, data: bytes, mime: str) -> Tuple[str, bytes]:
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+            resized = bool(self.max_side) and max(image.size) > self.max_side
+            if resized:
+                image.thumbnail((self.max_side, self.max_side), Image.LANCZOS)
+            has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha and self.format != 'jpeg' else 'RGB')
+            buffer = io.BytesIO()
+            if self.format == 'png':
+                image.save(buffer, 'PNG', optimize=True)
+            elif self.format == 'webp':
+                image.save(buffer, 'WEBP', quality=self.quality, method=4)
+            else:
+                image.save(buffer, 'JPEG', quality=self.quality, optimize=True)
+        encoded = buffer.getvalue()
+        if not resized and len(encoded) >= len(data):
+            return mime, data
+        return FORMAT_MIMES[self.format], encoded
+
+    def encode(self, path: Union[str, Path], mime: str) -> Tuple[str, str, Dict]:
+        """
+        Args:
+            path: Image file.
+            mime: MIME type of the file, returned unchanged if the original bytes are kept.
+
+        Returns:
+            (mime type, base64 payload, info with `original_bytes`, `encoded_bytes` and `cached`)
+        """
+        path = Path(path)
+        digest = self._digest(path)
+        key = f'{digest}-{self.max_side}-{self.format}-{self.quality}'
+        original_bytes = os.path.getsize(path)
+
+        with self._memory_cache_lock:
+            cached = self._memory_cache.get(key)
+            if cached is not None:
+                self._memory_cache.move_to_end(key)
+        if cached is not None:
+            return cached[0], cached[1], {'original_bytes': original_bytes, 'encoded_bytes': len(cached[1]) * 3 // 4, 'cached': True}
+
+        disk_file = self.cache_path / key if self.cache_path else None
+        if disk_file is not None and disk_file.exists():
+            out_mime, _, payload = disk_file.read_text().partition('\n')
+            from_disk = True
+        else:
+            data = path.read_bytes()
+            out_mime, encoded = mime, data
+            if Image is not None:
+                try:
+                    out_mime, encoded = self._reencode(data, mime)
+                except Exception as e:
+                    logger.warning(f"[Image Cache] Could not re-encode '{path}', sending it as it is: {e}")
+            payload = base64.b64encode(encoded).decode('ascii')
+            from_disk = False
+            if disk_file is not None:
+                tmp_file = disk_file.with_name(f'.{key}.tmp')
+                tmp_file.write_text(f'{out_mime}\n{payload}')
+                os.replace(tmp_file, disk_file)
+
+        with self._memory_cache_lock:
+            self._memory_cache[key] = (out_mime, payload)
+            if len(self._memory_cache) > self.MEMORY_CACHE_ENTRIES:
+                self._memory_cache.popitem(last=False)
+        encoded_bytes = len(payload) * 3 // 4
+        logger.debug(f"[Image Cache] '{path.name}': {original_bytes} -> {encoded_bytes} bytes ({out_mime}).")
+        return out_mime, payload, {'original_bytes': original_bytes, 'encoded_bytes': encoded_bytes, 'cached': from_disk}
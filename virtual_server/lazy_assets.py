@@ -0,0 +1,92 @@
+import os
+import json
+import hashlib
+import importlib
+from pathlib import Path
+from typing import Optional, Union
+from loguru import logger
+
+from virtual_server.blob_store import materialize
+
+
+# A deferred asset `report.png` is stored as the recipe `report.png.lazy.json` next to it
+LAZY_SUFFIX = '.lazy.json'
+
+
+def recipe_path(path: Union[str, Path]) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + LAZY_SUFFIX)
+
+
+def defer_render(path: Union[str, Path], renderer: str, lazy: bool = True, **kwargs) -> str:
+    """
+    Register an asset as a render recipe instead of rendering it now.
+
+    The recipe is materialized into `path` the first time the asset is accessed through
+    the cloud disk or `ReadAsDataURL` (see `render_asset`), so generation time only goes
+    to assets that are actually used.
+
+    Args:
+        path: Where the rendered asset belongs, e.g. `cloud_disk/ads_strategy/heatmap.png`.
+        renderer: `module:function` called as `function(path, **kwargs)`; it must be
+            deterministic and importable from the environment.
+        lazy: Render right away when False.
+        **kwargs: JSON-serializable arguments of the renderer.
+
+    Returns:
+        The asset path.
+    """
+    path = Path(path)
+    recipe = {'renderer': renderer, 'kwargs': kwargs}
+    if not lazy:
+        _call_renderer(recipe, path)
+        return str(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(recipe_path(path), 'w', encoding='utf-8') as wf:
+        json.dump(recipe, wf, ensure_ascii=False, sort_keys=True)
+    return str(path)
+
+
+def _call_renderer(recipe: dict, path: Path):
+    module_name, _, function_name = recipe['renderer'].partition(':')
+    renderer = getattr(importlib.import_module(module_name), function_name)
+    renderer(str(path), **recipe['kwargs'])
+
+
+def render_asset(path: Union[str, Path], cache_path: Optional[Union[str, Path]] = None) -> bool:
+    """
+    Materialize a deferred asset if `path` does not exist yet but its recipe does.
+
+    Rendered assets replace their recipe. With `cache_path`, renders are also kept there
+    keyed by the SHA-256 of the recipe, so an asset shared by several days or runs is
+    rendered once and then cloned.
+
+    Returns:
+        True if the asset was materialized by this call.
+    """
+    path = Path(path)
+    recipe_file = recipe_path(path)
+    if path.exists() or not recipe_file.is_file():
+        return False
+
+    raw = recipe_file.read_bytes()
+    cached = None
+    if cache_path:
+        digest = hashlib.sha256(raw).hexdigest()
+        cached = Path(cache_path) / f'{digest}{path.suffix}'
+        if cached.is_file():
+            materialize(cached, path, 'reflink')
+            os.unlink(recipe_file)
+            logger.debug(f"[Lazy Assets] '{path.name}' restored from the render cache.")
+            return True
+
+    # Render next to the target so that a crash never leaves a partial asset behind
+    tmp_path = path.with_name(f'.{path.stem}.rendering{path.suffix}')
+    _call_renderer(json.loads(raw), tmp_path)
+    if cached is not None:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        materialize(tmp_path, cached, 'reflink')
+    os.replace(tmp_path, path)
+    os.unlink(recipe_file)
+    logger.debug(f"[Lazy Assets] '{path.name}' rendered on first access.")
+    return True
@@ -0,0 +1,234 @@
+import os
+import sys
+import time
+import shutil
+import signal
+import tempfile
+import selectors
+import subprocess
+from typing import Dict, List, Optional
+from loguru import logger
+
+from virtual_server.registry import register_server
+from virtual_server.base_server import BaseServer
+from virtual_server import forkserver
+from virtual_server.sandbox_utils import CommandResult, OutputCollector, forkserver_config, prlimit_prefix
+from virtual_server.sandbox_session import LocalTransport, SessionSupport, SessionTransport
+
+
+@register_server(server_name='local_sandbox')
+class LocalSandbox(SessionSupport, BaseServer):
+    """
+    A Docker-free sandbox that runs commands as local subprocesses.
+
+    It exposes the same `execute` / `run_command` interface as `DockerSandbox`
+    and is selected with `"sandbox_config": {"backend": "local"}` in `config.json`.
+    Every command:
+    - Runs in the task workspace with a private HOME/TMPDIR and a scrubbed environment.
+    - Gets per-command rlimits (`command_limits`, applied by `prlimit`) and a wall-clock timeout.
+    - Optionally runs in fresh user and network namespaces (`disable_network`)
+      via `unshare`, so it has no network access.
+    It starts instantly, but the isolation is weaker than a container: the
+    process can still read the host filesystem with the host user's permissions.
+    Example:
+        with LocalSandbox(task_root_path="./my_task") as sandbox:
+            exit_code, output = sandbox.run_command("python --version")
+            print(output)
+    """
+    def __init__(
+        self,
+        task_root_path: str,
+        sandbox_config: Optional[Dict] = None,
+        *args, **kwargs
+    ):
+        """
+        Initializes the local sandbox.
+        :param task_root_path: Task folder; commands run in its `workspace` directory.
+        :param sandbox_config: Optional `sandbox_config` section of `config.json`:
+            - command_timeout: default wall-clock limit per command in seconds (default 300).
+            - command_limits: per-command rlimits, e.g. `{"cpu_seconds": 120, "memory_mb": 1024}`.
+              `max_processes` is ignored: RLIMIT_NPROC counts every process of the host user,
+              not just the command's.
+            - disable_network: run commands in an empty network namespace (default False).
+            - persistent_shell: run `ExecuteCommand` in a persistent shell session (default False).
+            - forkserver: `true` or e.g. `{"preload": ["pandas", "numpy", "scipy"]}` runs `python`
+              commands in forks of a preloaded interpreter (see `virtual_server/forkserver.py`).
+        """
+        sandbox_config = sandbox_config or {}
+        self._sessions = {}
+        self.persistent_shell = sandbox_config.get('persistent_shell', False)
+        self.forkserver = forkserver_config(sandbox_config)
+        self._forkserver_proc: Optional[subprocess.Popen] = None
+        self.command_timeout = sandbox_config.get('command_timeout', 300)
+        self.command_limits: Dict = sandbox_config.get('command_limits', {})
+        if self.command_limits.get('max_processes'):
+            logger.warning("`max_processes` is ignored by the local sandbox: RLIMIT_NPROC would cap all processes of the host user.")
+        # Applied by `prlimit` in front of the command: `preexec_fn` is unsafe in this threaded process
+        self._limit_prefix = prlimit_prefix({**self.command_limits, 'max_processes': None})
+        if self._limit_prefix and shutil.which('prlimit') is None:
+            raise RuntimeError("`command_limits` require the `prlimit` command (util-linux).")
+        self.disable_network = sandbox_config.get('disable_network', False)
+
+        workspace_dir = os.path.join(task_root_path, 'workspace')
+        self.host_workspace = os.path.abspath(workspace_dir)
+        os.makedirs(self.host_workspace, exist_ok=True)
+
+        # HOME and TMPDIR live outside the workspace so they do not show up in evaluations
+        self._home = tempfile.mkdtemp(prefix='evoenv_sandbox_')
+        # Do not leak host secrets such as API keys into agent commands
+        self.env = {
+            'PATH': os.environ.get('PATH', '/usr/local/bin:/usr/bin:/bin'),
+            'LANG': os.environ.get('LANG', 'C.UTF-8'),
+            'HOME': self._home,
+            'TMPDIR': self._home,
+            'WORKSPACE': self.host_workspace,
+        }
+
+        self._unshare = None
+        if self.disable_network:
+            self._unshare = shutil.which('unshare')
+            if self._unshare is None:
+                raise RuntimeError("`disable_network` requires the `unshare` command (util-linux).")
+        if self.forkserver is not None:
+            self._start_forkserver()
+        logger.success(f"Local sandbox ready in {self.host_workspace}.")
+
+    def _start_forkserver(self):
+        """Starts a forkserver for this sandbox and puts its `python` shims first in PATH."""
+        bin_dir = os.path.join(self._home, 'bin')
+        address = os.path.join(self._home, 'forkserver.sock')
+        forkserver.install_shims(bin_dir)
+        self.env['PATH'] = bin_dir + os.pathsep + self.env['PATH']
+        self.env[forkserver.ADDRESS_ENV] = address
+        # Wrapped like commands, so forked children share the sandbox's network namespace
+        self._forkserver_proc = subprocess.Popen(
+            self._wrap_argv([
+                sys.executable, forkserver.__file__, '--serve',
+                '--address', address, '--preload', ','.join(self.forkserver['preload'])
+            ]),
+            cwd=self.host_workspace,
+            env=self.env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+    def _wrap_argv(self, argv: List[str], limited: bool = False) -> List[str]:
+        if limited:
+            argv = self._limit_prefix + argv
+        if self._unshare:
+            return [self._unshare, '--user', '--map-root-user', '--net', '--'] + argv
+        return argv
+
+    def _open_session_transport(self, argv: List[str]) -> SessionTransport:
+        return LocalTransport(self._wrap_argv(argv, limited=True), cwd=self.host_workspace, env=self.env)
+
+    def _session_shell(self) -> str:
+        return shutil.which('bash', path=self.env['PATH']) or '/bin/sh'
+
+    def execute(
+        self, command: str, timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None
+    ) -> CommandResult:
+        """
+        Executes a command in the workspace, streaming its output.
+
+        :param command: The shell command to run.
+        :param timeout: Wall-clock limit in seconds, defaults to `sandbox_config.command_timeout`.
+        :param max_output_bytes: Keep at most this many bytes of output, None keeps everything.
+        :return: A `CommandResult` with exit code, output and resource usage.
+        """
+        timeout = timeout if timeout is not None else self.command_timeout
+        argv = self._wrap_argv(['/bin/sh', '-c', command], limited=True)
+
+        start = time.monotonic()
+        proc = subprocess.Popen(
+            argv,
+            cwd=self.host_workspace,
+            env=self.env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            # Own process group, so a timeout kills everything the command spawned
+            start_new_session=True,
+        )
+
+        collector = OutputCollector(max_output_bytes)
+        deadline = start + timeout if timeout else None
+        timed_out = False
+        fd = proc.stdout.fileno()
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while True:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    timed_out = True
+                    break
+                if not selector.select(remaining):
+                    continue
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                collector.feed(chunk)
+
+        # A command may close its output and keep running, so the deadline also bounds the reaping
+        pid, delay = 0, 0.001
+        while not timed_out:
+            pid, status, rusage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                break
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                timed_out = True
+                break
+            time.sleep(delay if remaining is None else min(delay, remaining))
+            delay = min(delay * 2, 0.05)
+        if timed_out:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        if not pid:
+            _, status, rusage = os.wait4(proc.pid, 0)
+        # Tell Popen the child has been reaped
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        proc.stdout.close()
+        wall_time = time.monotonic() - start
+
+        return CommandResult(
+            # Same exit code as coreutils `timeout` in the Docker backend
+            exit_code=124 if timed_out else proc.returncode,
+            output=bytes(collector.head).decode('utf-8', errors='ignore').strip(),
+            timed_out=timed_out,
+            truncated=max_output_bytes is not None and collector.total > max_output_bytes,
+            output_bytes=collector.total,
+            wall_time=wall_time,
+            cpu_user=rusage.ru_utime,
+            cpu_sys=rusage.ru_stime,
+        )
+
+    def run_command(self, command: str, timeout: Optional[float] = None) -> tuple[int, str]:
+        """Executes a command inside the workspace."""
+        result = self.execute(command, timeout=timeout)
+        return result.exit_code, result.output
+
+    def close(self):
+        """Kills the sessions and the forkserver and removes the private HOME/TMPDIR."""
+        self.close_sessions()
+        if self._forkserver_proc is not None:
+            try:
+                os.killpg(self._forkserver_proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            self._forkserver_proc.wait()
+            self._forkserver_proc = None
+        if self._home:
+            shutil.rmtree(self._home, ignore_errors=True)
+            self._home = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -2,7 +2,9 @@ import os
 import sqlite3
 import datetime
 import json
-from typing import List, Optional, Dict, TYPE_CHECKING
+import heapq
+import itertools
+from typing import List, Optional, Dict, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
 from loguru import logger
 
@@ -39,21 +41,49 @@ class BookingResult:
 
 @register_server(server_name='meeting_calendar')
 class MeetingRoomCalendar(BaseServer):
-    def __init__(self, task_root_path: str, clock: 'VirtualClock', *args, **kwargs):
+    def __init__(
+            self, task_root_path: str, clock: 'VirtualClock',
+            calendar_config: Optional[Dict] = None, *args, **kwargs
+        ):
         """
         Initialize the calendar system
         
         Args:
-            db_path: Path to the SQLite database file
+            task_root_path: Task folder which holds `meeting_calendar.db`
+            clock: Scenario clock shared with the environment
+            calendar_config: Optional `calendar_config` section of `config.json`:
+                - room_names: explicit list of room names, or
+                - num_rooms: number of rooms named Room_01, Room_02, ... (default 10)
+                - business_start / business_end: opening hours (default 9 and 17)
+                - horizon_days: number of days from the scenario start that can be booked
         """
+        calendar_config = calendar_config or {}
         self.db_path = os.path.join(task_root_path, 'meeting_calendar.db')
-        self.room_names = [f"Room_{i+1:02d}" for i in range(10)]  # Room_01 to Room_10
-        self.business_start = 9  # 9:00 AM
-        self.business_end = 17   # 5:00 PM
-        
-        self._init_database()
+        if calendar_config.get('room_names'):
+            self.room_names = list(calendar_config['room_names'])
+        else:
+            num_rooms = calendar_config.get('num_rooms', 10)
+            width = max(2, len(str(num_rooms)))
+            self.room_names = [f"Room_{i+1:0{width}d}" for i in range(num_rooms)]  # Room_01 to Room_10 by default
+        self._room_set = set(self.room_names)
+        self.business_start = calendar_config.get('business_start', 9)  # 9:00 AM
+        self.business_end = calendar_config.get('business_end', 17)     # 5:00 PM
+        if not 0 <= self.business_start < self.business_end <= 24:
+            raise ValueError(f'Invalid business hours: {self.business_start}-{self.business_end}')
+        # Meetings never span more than one business day, which bounds every
+        # time-window query from below and lets SQLite range-scan the start_time index
+        self.max_meeting_length = datetime.timedelta(hours=self.business_end - self.business_start)
 
         self.clock = clock
+
+        self.horizon_end = None
+        horizon_days = calendar_config.get('horizon_days')
+        if horizon_days and clock is not None:
+            self.horizon_end = datetime.datetime.combine(
+                clock.now_dt.date() + datetime.timedelta(days=horizon_days), datetime.time(0)
+            )
+        
+        self._init_database()
     
     def _init_database(self):
         """Initialize the database and create tables if they don't exist"""
@@ -75,11 +105,21 @@ class MeetingRoomCalendar(BaseServer):
                     UNIQUE(start_time, end_time, room_name)
                 )
             ''')
+            # UNIQUE(start_time, ...) already indexes start_time; these cover
+            # per-room and per-applicant lookups on large calendars
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_meetings_room_start
+                ON meetings (room_name, start_time)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_meetings_applicant_start
+                ON meetings (applicant, start_time)
+            ''')
             conn.commit()
 
     def _is_business_hours(self, start_time: datetime.datetime, end_time: datetime.datetime) -> bool:
         """
-        Check if the meeting time is within business hours (9 AM - 5 PM)
+        Check if the meeting time is within business hours (9 AM - 5 PM by default)
         
         Args:
             start_time: Meeting start time
@@ -88,17 +128,52 @@ class MeetingRoomCalendar(BaseServer):
         Returns:
             True if within business hours, False otherwise
         """
-        start_hour = start_time.hour
-        end_hour = end_time.hour
-        
-        # Check if start time is within business hours
-        if start_hour < self.business_start or start_hour >= self.business_end:
-            return False
+        day_start = datetime.datetime.combine(start_time.date(), datetime.time(0))
+        opening = day_start + datetime.timedelta(hours=self.business_start)
+        closing = day_start + datetime.timedelta(hours=self.business_end)
+
+        return opening <= start_time < end_time <= closing
+
+    def _within_horizon(self, end_time: datetime.datetime) -> bool:
+        """
+        Check if the meeting ends inside the planning horizon
         
-        if end_hour > self.business_end or (end_hour == self.business_end and end_time.minute > 0):
-            return False
+        Args:
+            end_time: Meeting end time
             
-        return True
+        Returns:
+            True if there is no horizon or the meeting ends before it, False otherwise
+        """
+        return self.horizon_end is None or end_time <= self.horizon_end
+
+    def _business_hours_str(self) -> str:
+        return f"{self.business_start:02d}:00 and {self.business_end:02d}:00"
+
+    def _fetch_overlapping(self, cursor: sqlite3.Cursor, columns: str,
+                           start_time: datetime.datetime, end_time: datetime.datetime) -> List[tuple]:
+        """
+        Fetch meetings overlapping a time window
+
+        Args:
+            cursor: Open database cursor
+            columns: Comma-separated column list to select
+            start_time: Window start
+            end_time: Window end
+
+        Returns:
+            List of result rows
+        """
+        # The lower bound on start_time is implied by the overlap condition and
+        # the maximum meeting length, but lets SQLite use the index
+        cursor.execute(f'''
+            SELECT {columns} FROM meetings
+            WHERE start_time < ? AND start_time > ? AND end_time > ?
+        ''', (
+            end_time.isoformat(),
+            (start_time - self.max_meeting_length).isoformat(),
+            start_time.isoformat()
+        ))
+        return cursor.fetchall()
     
     def _time_overlaps(self, start1: datetime.datetime, end1: datetime.datetime,
                       start2: datetime.datetime, end2: datetime.datetime) -> bool:
@@ -152,52 +227,37 @@ class MeetingRoomCalendar(BaseServer):
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
-            for person in all_participants:
-                person_conflicts = []
-                
-                # Find meetings where this person is the applicant
-                cursor.execute('''
-                    SELECT id, start_time, end_time, room_name, summary, attendees
-                    FROM meetings 
-                    WHERE applicant = ? AND start_time < ? AND end_time > ?
-                ''', (person, end_time.isoformat(), start_time.isoformat()))
-                
-                for row in cursor.fetchall():
-                    person_conflicts.append({
-                        'id': row[0],
-                        'start_time': datetime.datetime.fromisoformat(row[1]),
-                        'end_time': datetime.datetime.fromisoformat(row[2]),
-                        'room_name': row[3],
-                        'summary': row[4],
-                        'role': 'applicant',
-                        'attendees': row[5]
-                    })
-                
-                # Find meetings where this person is an attendee
-                cursor.execute('''
-                    SELECT id, start_time, end_time, applicant, room_name, summary, attendees
-                    FROM meetings 
-                    WHERE attendees LIKE ? AND start_time < ? AND end_time > ?
-                ''', (f'%{person}%', end_time.isoformat(), start_time.isoformat()))
-                
-                for row in cursor.fetchall():
-                    # Double-check that the person is actually in the attendees list
-                    # (to avoid false positives from partial name matches)
-                    meeting_attendees = self._parse_attendees(row[6])
-                    if person in meeting_attendees:
-                        person_conflicts.append({
-                            'id': row[0],
-                            'start_time': datetime.datetime.fromisoformat(row[1]),
-                            'end_time': datetime.datetime.fromisoformat(row[2]),
-                            'applicant': row[3],
-                            'room_name': row[4],
-                            'summary': row[5],
-                            'role': 'attendee',
-                            'attendees': row[6]
-                        })
-                
-                if person_conflicts:
-                    conflicts[person] = person_conflicts
+            # One bounded query for the window instead of two LIKE scans per person
+            rows = self._fetch_overlapping(
+                cursor, 'id, start_time, end_time, applicant, room_name, summary, attendees',
+                start_time, end_time
+            )
+        
+        for person in all_participants:
+            person_conflicts = []
+            for row in rows:
+                if row[3] == person:
+                    role = 'applicant'
+                # Match whole names only (to avoid false positives from partial name matches)
+                elif person in self._parse_attendees(row[6]):
+                    role = 'attendee'
+                else:
+                    continue
+                conflict = {
+                    'id': row[0],
+                    'start_time': datetime.datetime.fromisoformat(row[1]),
+                    'end_time': datetime.datetime.fromisoformat(row[2]),
+                    'room_name': row[4],
+                    'summary': row[5],
+                    'role': role,
+                    'attendees': row[6]
+                }
+                if role == 'attendee':
+                    conflict['applicant'] = row[3]
+                person_conflicts.append(conflict)
+            
+            if person_conflicts:
+                conflicts[person] = person_conflicts
         
         return conflicts
     
@@ -213,24 +273,163 @@ class MeetingRoomCalendar(BaseServer):
         Returns:
             List of available room names
         """
-        if not self._is_business_hours(start_time, end_time):
+        if not self._is_business_hours(start_time, end_time) or not self._within_horizon(end_time):
             return []
         
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
             # Get all meetings that might conflict with the requested time
-            cursor.execute('''
-                SELECT room_name FROM meetings 
-                WHERE start_time < ? AND end_time > ?
-            ''', (end_time.isoformat(), start_time.isoformat()))
+            rows = self._fetch_overlapping(cursor, 'room_name', start_time, end_time)
             
-            occupied_rooms = {row[0] for row in cursor.fetchall()}
+            occupied_rooms = {row[0] for row in rows}
             available_rooms = [room for room in self.room_names if room not in occupied_rooms]
             
             return available_rooms
     
-    def get_time_to_next_meeting(self, person_name: str, 
+    def _merge_intervals(self, intervals: List[Tuple[datetime.datetime, datetime.datetime]]
+                         ) -> List[Tuple[datetime.datetime, datetime.datetime]]:
+        """
+        Merge overlapping or touching intervals
+
+        Args:
+            intervals: List of (start, end) tuples, in any order
+
+        Returns:
+            Sorted list of disjoint (start, end) tuples
+        """
+        merged = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        return merged
+
+    def _business_windows(self, window_start: datetime.datetime,
+                          window_end: datetime.datetime
+                          ) -> List[Tuple[datetime.datetime, datetime.datetime]]:
+        """
+        Split a search window into per-day business-hour windows
+
+        Args:
+            window_start: Start of the search window
+            window_end: End of the search window
+
+        Returns:
+            Sorted list of (start, end) tuples clipped to business hours
+        """
+        windows = []
+        day = window_start.date()
+        while day <= window_end.date():
+            day_start = datetime.datetime.combine(day, datetime.time(self.business_start))
+            day_end = datetime.datetime.combine(day, datetime.time(0)) + datetime.timedelta(hours=self.business_end)
+            start, end = max(day_start, window_start), min(day_end, window_end)
+            if start < end:
+                windows.append((start, end))
+            day += datetime.timedelta(days=1)
+        return windows
+
+    def _subtract_intervals(self, windows: List[Tuple[datetime.datetime, datetime.datetime]],
+                            busy: List[Tuple[datetime.datetime, datetime.datetime]]
+                            ) -> List[Tuple[datetime.datetime, datetime.datetime]]:
+        """
+        Remove merged busy intervals from sorted windows with a single sweep
+
+        Args:
+            windows: Sorted, disjoint (start, end) tuples
+            busy: Sorted, disjoint (start, end) tuples as returned by `_merge_intervals`
+
+        Returns:
+            Sorted list of free (start, end) tuples
+        """
+        free = []
+        i = 0
+        for start, end in windows:
+            # Skip busy intervals that end before this window starts
+            while i < len(busy) and busy[i][1] <= start:
+                i += 1
+            cursor = start
+            j = i
+            while j < len(busy) and busy[j][0] < end:
+                if busy[j][0] > cursor:
+                    free.append((cursor, busy[j][0]))
+                cursor = max(cursor, busy[j][1])
+                j += 1
+            if cursor < end:
+                free.append((cursor, end))
+        return free
+
+    def find_free_slots(self, attendees: List[str], duration_minutes: int,
+                        window_start: datetime.datetime, window_end: datetime.datetime,
+                        max_results: int = 5, step_minutes: int = 30
+                        ) -> List[Tuple[datetime.datetime, datetime.datetime, str]]:
+        """
+        Find the earliest room/time slots in which all attendees and a room are free
+
+        All meetings overlapping the window are loaded with one query. The busy
+        intervals of the attendees are merged into a single sorted list, which is
+        swept against the business-hour windows and then against each room's own
+        merged busy list.
+
+        Args:
+            attendees: Names of everyone who must attend (including the applicant)
+            duration_minutes: Meeting length in minutes
+            window_start: Earliest acceptable start time
+            window_end: Latest acceptable end time
+            max_results: Maximum number of slots to return
+            step_minutes: Granularity of candidate start times, aligned to the hour
+
+        Returns:
+            List of (start_time, end_time, room_name) tuples ordered by start time, then room
+        """
+        duration = datetime.timedelta(minutes=duration_minutes)
+        step = datetime.timedelta(minutes=step_minutes)
+        if duration <= datetime.timedelta(0) or step <= datetime.timedelta(0) or max_results <= 0:
+            return []
+        if self.horizon_end is not None:
+            window_end = min(window_end, self.horizon_end)
+
+        wanted = set(attendees)
+        people_busy = []
+        rooms_busy: Dict[str, List[Tuple[datetime.datetime, datetime.datetime]]] = {
+            room: [] for room in self.room_names
+        }
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            rows = self._fetch_overlapping(
+                cursor, 'start_time, end_time, applicant, attendees, room_name',
+                window_start, window_end
+            )
+
+            for row in rows:
+                interval = (datetime.datetime.fromisoformat(row[0]), datetime.datetime.fromisoformat(row[1]))
+                if row[4] in rooms_busy:
+                    rooms_busy[row[4]].append(interval)
+                if row[2] in wanted or wanted.intersection(self._parse_attendees(row[3])):
+                    people_busy.append(interval)
+
+        people_free = self._subtract_intervals(
+            self._business_windows(window_start, window_end),
+            self._merge_intervals(people_busy)
+        )
+
+        def _room_slots(room: str):
+            for start, end in self._subtract_intervals(people_free, self._merge_intervals(rooms_busy[room])):
+                # Align the first candidate to the step grid
+                offset = (start - start.replace(minute=0, second=0, microsecond=0)) % step
+                slot_start = start if not offset else start + (step - offset)
+                while slot_start + duration <= end:
+                    yield slot_start, slot_start + duration, room
+                    slot_start += step
+
+        return list(itertools.islice(
+            heapq.merge(*(_room_slots(room) for room in self.room_names)),
+            max_results
+        ))
+
+    def get_time_to_next_meeting(self, person_name: str,
                                 current_time: datetime.datetime) -> Optional[int]:
         """
         Get minutes until the next meeting for a person
@@ -288,12 +487,21 @@ class MeetingRoomCalendar(BaseServer):
         """
         # Validate business hours
         if not self._is_business_hours(start_time, end_time):
-            message = "Meeting Booking Failed: Meeting time must be between 9:00 AM and 5:00 PM"
+            message = f"Meeting Booking Failed: Meeting time must be between {self._business_hours_str()} on the same day"
+            return BookingResult(success=False, message=message)
+        
+        # Validate planning horizon
+        if not self._within_horizon(end_time):
+            message = f"Meeting Booking Failed: Meetings can only be booked before {self.horizon_end.isoformat()}"
             return BookingResult(success=False, message=message)
         
         # Validate room name
-        if room_name not in self.room_names:
-            message = f"Meeting Booking Failed: Invalid room name. Available rooms: {', '.join(self.room_names)}"
+        if room_name not in self._room_set:
+            if len(self.room_names) > 20:
+                rooms_str = f"{', '.join(self.room_names[:20])}, ... ({len(self.room_names)} rooms in total)"
+            else:
+                rooms_str = ', '.join(self.room_names)
+            message = f"Meeting Booking Failed: Invalid room name. Available rooms: {rooms_str}"
             return BookingResult(success=False, message=message)
         
         # Check if room is available
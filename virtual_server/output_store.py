@@ -0,0 +1,121 @@
+import hashlib
+from loguru import logger
+from pathlib import Path
+from typing import Dict, Optional
+
+from virtual_server.registry import register_server
+from virtual_server.base_server import BaseServer
+
+
+DEFAULT_OUTPUT_CONFIG = {
+    'threshold': 6000,
+    'head_chars': 2000,
+    'tail_chars': 1000,
+    'page_chars': 4000,
+    'max_output_bytes': 1024 * 1024,
+}
+
+
+@register_server(server_name='output_store')
+class OutputStore(BaseServer):
+    """
+    Keeps large tool outputs out of the agent's context.
+
+    An output longer than `threshold` characters is saved in the workspace under
+    `.tool_outputs/`, and the agent only receives its head and tail together with a handle,
+    i.e. the artifact's path in the workspace. The rest is read page by page with
+    `ReadToolOutput`, or with any command in the sandbox. Every tool result of a step is
+    thus at most `threshold` characters long, whatever the tool printed.
+
+    Example:
+        store = OutputStore(task_root_path="./my_task")
+        text = store.spill('ExecuteCommand', output)
+        page = store.read('.tool_outputs/ExecuteCommand-3f2a9c1e.txt', offset=2000)
+    """
+    FOLDER = '.tool_outputs'
+    # Room left for the position line of a page
+    FOOTER_CHARS = 200
+
+    def __init__(self, task_root_path: str, output_config: Optional[Dict] = None, *args, **kwargs) -> None:
+        """
+        Args:
+            task_root_path: Task folder holding the `workspace`.
+            output_config: Optional `output_config` section of `config.json`:
+                - threshold: longest output, in characters, returned as it is (default 6000).
+                - head_chars / tail_chars: preview of a spilled output (default 2000 / 1000).
+                - page_chars: longest page returned by `ReadToolOutput` (default 4000).
+                - max_output_bytes: output of a sandbox command kept for spilling (default 1MB).
+        """
+        config = {**DEFAULT_OUTPUT_CONFIG, **(output_config or {})}
+        self.threshold = int(config['threshold'])
+        self.head_chars = min(int(config['head_chars']), self.threshold)
+        self.tail_chars = min(int(config['tail_chars']), self.threshold - self.head_chars)
+        # A page is never spilled again
+        self.page_chars = max(1, min(int(config['page_chars']), self.threshold - self.FOOTER_CHARS))
+        self.max_output_bytes = int(config['max_output_bytes'])
+
+        self.workspace_path = Path(task_root_path) / 'workspace'
+        self.root_path = self.workspace_path / self.FOLDER
+
+    def spill(self, tool_name: str, text: str) -> str:
+        """
+        Returns `text` itself if it is short enough, otherwise saves it as an artifact and
+        returns its preview. Identical outputs share one artifact.
+        """
+        if len(text) <= self.threshold:
+            return text
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:8]
+        handle = f'{self.FOLDER}/{tool_name}-{digest}.txt'
+        path = self.workspace_path / handle
+        if not path.is_file():
+            self.root_path.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f'.{path.name}.tmp')
+            tmp_path.write_text(text, encoding='utf-8')
+            tmp_path.replace(path)
+        logger.debug(f"[Output Store] {len(text)} characters of `{tool_name}` saved as '{handle}'.")
+
+        def note(omitted: int, offset: int) -> str:
+            return (
+                f"\n\n[Output Store] {omitted} characters omitted. The full output ({len(text)} characters, "
+                f"{text.count(chr(10)) + 1} lines) is saved in your workspace as `{handle}`; read more with "
+                f"`ReadToolOutput(handle=\"{handle}\", offset={offset})`.\n\n"
+            )
+
+        # The preview stays within `threshold` with its note, whose numbers are at most len(text)
+        budget = max(0, self.threshold - len(note(len(text), len(text))))
+        tail_chars = min(self.tail_chars, max(0, budget - self.head_chars))
+        head_chars = min(self.head_chars, budget - tail_chars)
+        tail = text[-tail_chars:] if tail_chars else ''
+        return f"{text[:head_chars]}{note(len(text) - head_chars - tail_chars, head_chars)}{tail}"
+
+    def read(self, handle: str, offset: int = 0, length: Optional[int] = None) -> str:
+        """
+        Args:
+            handle: Path of the artifact in the workspace, as given in the preview.
+            offset: First character to return.
+            length: Number of characters, at most `page_chars` (the default).
+
+        Returns:
+            The page followed by its position in the artifact, or an error message.
+        """
+        path = (self.workspace_path / handle).resolve()
+        if not path.is_relative_to(self.root_path.resolve()) or not path.is_file():
+            return f"Error: Unknown output handle '{handle}'."
+        text = path.read_text(encoding='utf-8', errors='replace')
+
+        def footer(start: int, end: int) -> str:
+            position = f"\n\n[Output Store] Characters {start}-{end} of {len(text)} in '{handle}'"
+            return position + (f"; continue with offset={end}." if end < len(text) else "; end of output.")
+
+        offset = max(0, int(offset))
+        length = self.page_chars if length is None else max(0, min(int(length), self.page_chars))
+        # A page is never spilled again, even with a long handle
+        length = min(length, max(1, self.threshold - len(footer(len(text), len(text) - 1))))
+        if offset >= len(text):
+            return f"Error: Offset {offset} is beyond the end of '{handle}' ({len(text)} characters)."
+        end = min(offset + length, len(text))
+        return f"{text[offset:end]}{footer(offset, end)}"
+
+    def close(self):
+        # Artifacts stay in the workspace with the rest of the agent's files
+        return
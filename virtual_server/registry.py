@@ -1,8 +1,23 @@
+import importlib
 from typing import Any, Dict
 from virtual_server.base_server import BaseServer
 
 SERVER_REGISTRY: Dict[str, BaseServer] = {}
 
+# Static manifest of the built-in servers: a server's module is imported, and the server
+# registered, the first time it is created
+SERVER_MODULES: Dict[str, str] = {
+    'chat_server': 'virtual_server.chat_server',
+    'cloud_disk': 'virtual_server.cloud_disk',
+    'docker_sandbox': 'virtual_server.docker_sandbox',
+    'file_reader': 'virtual_server.file_reader',
+    'local_sandbox': 'virtual_server.local_sandbox',
+    'meeting_calendar': 'virtual_server.meeting_calendar',
+    'output_store': 'virtual_server.output_store',
+    'search_index': 'virtual_server.search_index',
+    'workspace_db': 'virtual_server.workspace_db',
+}
+
 def register_server(server_name: str):
     """
     a decorator for server registry
@@ -31,10 +46,12 @@ def create_server(server_name: str, **kwargs: Any) -> Any:
     Returns:
         An instance of the corresponding Server class.
     """
+    if server_name not in SERVER_REGISTRY and server_name in SERVER_MODULES:
+        importlib.import_module(SERVER_MODULES[server_name])
     server_class = SERVER_REGISTRY.get(server_name)
     
     if server_class is None:
-        raise ValueError(f"Server '{server_name}' can not be found in the registry. Please Check `virtual_server/__init__.py`.\n\nAvailable servers:\n{list(SERVER_REGISTRY.keys())}")
+        raise ValueError(f"Server '{server_name}' can not be found in the registry. Please Check `SERVER_MODULES` in `virtual_server/registry.py`.\n\nAvailable servers:\n{sorted(set(SERVER_REGISTRY) | set(SERVER_MODULES))}")
         
     try:
         instance = server_class(**kwargs)
@@ -0,0 +1,359 @@
+import os
+import json
+import time
+import queue
+import signal
+import threading
+import subprocess
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterator, List, Optional
+
+import shortuuid
+from docker.utils.socket import frames_iter
+from loguru import logger
+
+from virtual_server.sandbox_utils import CommandResult, OutputCollector, parse_times_output
+
+
+# Driver of the persistent Python session. It reads one JSON request per line
+# from a private copy of stdin, runs the code in a single globals dict and
+# prints the frame `<marker> <exit code> <cpu user> <cpu sys>` followed by the end token.
+PYTHON_DRIVER = r'''
+import os, sys, ast, json, traceback
+_channel = os.fdopen(os.dup(0), 'rb')
+_null = os.open(os.devnull, os.O_RDONLY)
+os.dup2(_null, 0)
+os.dup2(1, 2)
+sys.stdin = open(os.devnull)
+_globals = {'__name__': '__main__', '__builtins__': __builtins__}
+while True:
+    _line = _channel.readline()
+    if not _line:
+        break
+    _request = json.loads(_line)
+    _t0 = os.times()
+    _rc = 0
+    try:
+        _tree = ast.parse(_request['code'], '<session>', 'exec')
+        _last = None
+        if _tree.body and isinstance(_tree.body[-1], ast.Expr):
+            _last = ast.Expression(_tree.body.pop().value)
+        exec(compile(_tree, '<session>', 'exec'), _globals)
+        if _last is not None:
+            _value = eval(compile(_last, '<session>', 'eval'), _globals)
+            if _value is not None:
+                print(repr(_value))
+    except SyntaxError:
+        traceback.print_exception(*sys.exc_info()[:2], None)
+        _rc = 1
+    except SystemExit as _e:
+        _rc = _e.code if isinstance(_e.code, int) else (0 if _e.code is None else 1)
+    except BaseException:
+        _type, _value, _tb = sys.exc_info()
+        traceback.print_exception(_type, _value, _tb.tb_next)
+        _rc = 1
+    _t1 = os.times()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    _user = _t1.user - _t0.user + _t1.children_user - _t0.children_user
+    _sys = _t1.system - _t0.system + _t1.children_system - _t0.children_system
+    sys.stdout.write('\n%s %d %.3f %.3f\n%s\n' % (_request['marker'], _rc, _user, _sys, _request['end']))
+    sys.stdout.flush()
+'''
+
+
+class SessionTransport(ABC):
+    """A long-running process in the sandbox that reads requests on stdin and writes output on stdout."""
+    @abstractmethod
+    def write(self, data: bytes):
+        return
+
+    @abstractmethod
+    def read_chunks(self) -> Iterator[bytes]:
+        """Yields output chunks until the process exits."""
+        return
+
+    @abstractmethod
+    def kill(self):
+        """Kills the process together with everything it started."""
+        return
+
+
+class LocalTransport(SessionTransport):
+    """Session process started as a local subprocess in its own process group."""
+    def __init__(self, argv: List[str], cwd: str, env: Dict[str, str]):
+        self.proc = subprocess.Popen(
+            argv,
+            cwd=cwd,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    def write(self, data: bytes):
+        self.proc.stdin.write(data)
+        self.proc.stdin.flush()
+
+    def read_chunks(self) -> Iterator[bytes]:
+        fd = self.proc.stdout.fileno()
+        while True:
+            try:
+                chunk = os.read(fd, 65536)
+            except OSError:
+                return
+            if not chunk:
+                return
+            yield chunk
+
+    def kill(self):
+        try:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        self.proc.wait()
+        for stream in (self.proc.stdin, self.proc.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class DockerTransport(SessionTransport):
+    """Session process started with `docker exec` and an attached stdin socket."""
+    def __init__(self, client, container, argv: List[str], workdir: str = '/workspace'):
+        self.container = container
+        # `setsid` makes the session a process group leader; its pid is printed first so it can be killed as a group
+        exec_id = client.api.exec_create(
+            container.id,
+            ['setsid', '/bin/sh', '-c', 'echo $$; exec "$@"', 'sh'] + argv,
+            stdin=True,
+            workdir=workdir,
+        )['Id']
+        self._socket = client.api.exec_start(exec_id, socket=True)
+        self._raw = getattr(self._socket, '_sock', self._socket)
+        self._frames = frames_iter(self._socket, tty=False)
+        self._pending = b''
+        self.pid = None
+        for _, data in self._frames:
+            self._pending += data or b''
+            if b'\n' in self._pending:
+                line, self._pending = self._pending.split(b'\n', 1)
+                self.pid = int(line.strip())
+                break
+        if self.pid is None:
+            raise RuntimeError("Sandbox session exited during startup.")
+
+    def write(self, data: bytes):
+        self._raw.sendall(data)
+
+    def read_chunks(self) -> Iterator[bytes]:
+        if self._pending:
+            yield self._pending
+            self._pending = b''
+        try:
+            for _, data in self._frames:
+                if data:
+                    yield data
+        except OSError:
+            return
+
+    def kill(self):
+        try:
+            self.container.exec_run(['kill', '-9', '--', f'-{self.pid}'])
+        except Exception as e:
+            logger.error(f"Error killing sandbox session {self.pid}: {e}")
+        try:
+            self._socket.close()
+        except OSError:
+            pass
+
+
+class SandboxSession:
+    """
+    A persistent shell or Python session inside a sandbox.
+
+    The working directory, environment variables and (for Python) globals survive
+    between calls. Every request is framed by a random marker so its output and
+    exit code can be split from the stream. A request that times out kills the
+    session; it is restarted with a clean state on the next call.
+    """
+    KINDS = ('shell', 'python')
+
+    def __init__(self, kind: str, open_transport: Callable[[List[str]], SessionTransport], shell: str = 'bash'):
+        """
+        :param kind: `shell` or `python`.
+        :param open_transport: Starts the session process from an argv in the sandbox backend.
+        :param shell: Shell used by `shell` sessions.
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown session kind `{kind}`, expected one of {self.KINDS}.")
+        self.kind = kind
+        self.shell = shell
+        self._open_transport = open_transport
+        self._transport: Optional[SessionTransport] = None
+        self._chunks: Optional[queue.Queue] = None
+        # Cumulative children CPU times reported by the shell's `times`
+        self._shell_cpu = (0.0, 0.0)
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self._transport is not None
+
+    def _argv(self) -> List[str]:
+        if self.kind == 'python':
+            return ['python3', '-u', '-c', PYTHON_DRIVER]
+        return [self.shell, '--noprofile', '--norc'] if self.shell.endswith('bash') else [self.shell]
+
+    def _start(self):
+        self._transport = self._open_transport(self._argv())
+        self._chunks = queue.Queue()
+        self._shell_cpu = (0.0, 0.0)
+        transport, chunks = self._transport, self._chunks
+
+        def _reader():
+            try:
+                for chunk in transport.read_chunks():
+                    chunks.put(chunk)
+            finally:
+                chunks.put(None)
+        threading.Thread(target=_reader, daemon=True).start()
+        logger.info(f"Started a persistent {self.kind} session.")
+
+    def _build_request(self, code: str, marker: str, end: str) -> bytes:
+        if self.kind == 'python':
+            return (json.dumps({'code': code, 'marker': marker, 'end': end}) + '\n').encode()
+        # A quoted here-document passes the command verbatim; `eval` keeps `cd` and `export`
+        # in this shell, and stdin is detached so commands cannot consume later requests
+        return (
+            f"__evoenv_cmd=$(cat <<'{marker}_EOF'\n"
+            f"{code}\n"
+            f"{marker}_EOF\n"
+            f")\n"
+            f"eval \"$__evoenv_cmd\" < /dev/null 2>&1\n"
+            f"__evoenv_rc=$?\n"
+            f"printf '\\n%s %s\\n' '{marker}' \"$__evoenv_rc\"\n"
+            f"times\n"
+            f"printf '%s\\n' '{end}'\n"
+        ).encode()
+
+    def _parse_frame(self, frame: bytes):
+        """Returns (exit code, cpu user, cpu sys) from a frame."""
+        header, _, rest = frame.decode('utf-8', errors='ignore').partition('\n')
+        fields = header.split()
+        exit_code = int(fields[1])
+        if self.kind == 'python':
+            return exit_code, float(fields[2]), float(fields[3])
+        cpu_user, cpu_sys = parse_times_output(rest)
+        if cpu_user is None:
+            return exit_code, None, None
+        prev_user, prev_sys = self._shell_cpu
+        self._shell_cpu = (cpu_user, cpu_sys)
+        return exit_code, cpu_user - prev_user, cpu_sys - prev_sys
+
+    def run(self, code: str, timeout: Optional[float] = None, max_output_bytes: Optional[int] = None) -> CommandResult:
+        """
+        Runs a shell command or Python snippet in the session.
+
+        :param code: Shell command or Python source.
+        :param timeout: Wall-clock limit in seconds; on timeout the session is killed.
+        :param max_output_bytes: Keep at most this many bytes of output, None keeps everything.
+        :return: A `CommandResult`; its output notes when the session was restarted.
+        """
+        with self._lock:
+            if self._transport is None:
+                self._start()
+            marker = f"__EVOENV_SESSION_{shortuuid.uuid()}__"
+            end = f"__EVOENV_END_{shortuuid.uuid()}__"
+            end_token = end.encode() + b'\n'
+
+            start = time.monotonic()
+            collector = OutputCollector(max_output_bytes)
+            deadline = start + timeout if timeout else None
+            status = 'done'
+            try:
+                self._transport.write(self._build_request(code, marker, end))
+            except OSError:
+                status = 'exited'
+            while status == 'done':
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    status = 'timeout'
+                    break
+                try:
+                    chunk = self._chunks.get(timeout=remaining)
+                except queue.Empty:
+                    continue
+                if chunk is None:
+                    status = 'exited'
+                    break
+                collector.feed(chunk)
+                if end_token in collector.tail:
+                    break
+            wall_time = time.monotonic() - start
+
+            output, frame, output_bytes = collector.split_frame(marker.encode())
+            cpu_user = cpu_sys = None
+            if status == 'done' and frame is not None:
+                exit_code, cpu_user, cpu_sys = self._parse_frame(frame)
+                # Drop the newline printed in front of the frame
+                output_bytes = max(output_bytes - 1, 0)
+                output = output[:output_bytes]
+            else:
+                exit_code = 124 if status == 'timeout' else -1
+                self.close()
+            text = output.decode('utf-8', errors='ignore').strip()
+            if status != 'done':
+                text += (
+                    f"\n[Session] The {self.kind} session {'timed out' if status == 'timeout' else 'exited'} "
+                    f"and will restart on the next call; its variables, working directory and environment were reset."
+                )
+            return CommandResult(
+                exit_code=exit_code,
+                output=text.strip(),
+                timed_out=status == 'timeout',
+                truncated=max_output_bytes is not None and output_bytes > max_output_bytes,
+                output_bytes=output_bytes,
+                wall_time=wall_time,
+                cpu_user=cpu_user,
+                cpu_sys=cpu_sys,
+            )
+
+    def close(self):
+        """Kills the session process; the next `run` starts a fresh one."""
+        if self._transport is not None:
+            transport, self._transport = self._transport, None
+            transport.kill()
+
+
+class SessionSupport(ABC):
+    """
+    Persistent sessions for a sandbox backend.
+
+    Backends set `self._sessions = {}` in `__init__` and implement `_open_session_transport`.
+    """
+    _sessions: Dict[str, SandboxSession]
+
+    @abstractmethod
+    def _open_session_transport(self, argv: List[str]) -> SessionTransport:
+        return
+
+    def _session_shell(self) -> str:
+        return 'bash'
+
+    def get_session(self, kind: str = 'shell') -> SandboxSession:
+        """Returns the episode's `shell` or `python` session, creating it on first use."""
+        if kind not in self._sessions:
+            self._sessions[kind] = SandboxSession(kind, self._open_session_transport, shell=self._session_shell())
+        return self._sessions[kind]
+
+    def reset_sessions(self):
+        """Kills all sessions; they restart with a clean state on their next call."""
+        for session in self._sessions.values():
+            session.close()
+
+    def close_sessions(self):
+        self.reset_sessions()
+        self._sessions.clear()
@@ -0,0 +1,156 @@
+import re
+import shlex
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass
+class CommandResult:
+    """Data class to represent one sandbox command execution"""
+    exit_code: int
+    output: str
+    timed_out: bool = False
+    truncated: bool = False
+    # Total size of the command output, including any truncated part
+    output_bytes: int = 0
+    wall_time: float = 0.0
+    cpu_user: Optional[float] = None
+    cpu_sys: Optional[float] = None
+
+    def usage_str(self) -> str:
+        usage = f"wall {self.wall_time:.2f}s"
+        if self.cpu_user is not None and self.cpu_sys is not None:
+            usage += f" | cpu {self.cpu_user:.2f}s user, {self.cpu_sys:.2f}s sys"
+        usage += f" | output {self.output_bytes} bytes"
+        return usage
+
+
+class OutputCollector:
+    """
+    Collects a streamed command output with bounded memory.
+
+    Only the first `max_bytes` bytes are kept for display, plus a small tail
+    window so a trailing frame marker can still be found after truncation.
+    """
+    TAIL_BYTES = 4096
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+
+    def feed(self, chunk: bytes):
+        if not chunk:
+            return
+        self.total += len(chunk)
+        if self.max_bytes is None:
+            self.head += chunk
+        elif len(self.head) < self.max_bytes:
+            self.head += chunk[:self.max_bytes - len(self.head)]
+        self.tail += chunk
+        if len(self.tail) > self.TAIL_BYTES:
+            del self.tail[:-self.TAIL_BYTES]
+
+    def split_frame(self, marker: bytes):
+        """
+        Split off the trailing frame that starts at the last `marker`.
+
+        Returns:
+            (output bytes before the frame, frame bytes or None, output size excluding the frame)
+        """
+        pos = self.tail.rfind(marker)
+        if pos < 0:
+            return bytes(self.head), None, self.total
+        frame_offset = self.total - (len(self.tail) - pos)
+        return bytes(self.head[:frame_offset]), bytes(self.tail[pos:]), frame_offset
+
+
+_TIMES_RE = re.compile(r'(\d+)m([\d.]+)s')
+
+
+def parse_times_output(text: str):
+    """
+    Parse the output of the POSIX `times` builtin.
+
+    Returns:
+        (children user seconds, children system seconds), or (None, None)
+    """
+    lines = [line for line in text.strip().splitlines() if line.strip()]
+    if len(lines) < 2:
+        return None, None
+    values = [int(m) * 60 + float(s) for m, s in _TIMES_RE.findall(lines[1])]
+    if len(values) < 2:
+        return None, None
+    return values[0], values[1]
+
+
+def forkserver_config(sandbox_config: Dict) -> Optional[Dict]:
+    """
+    Normalize the `forkserver` entry of `sandbox_config`.
+
+    Returns:
+        `{"preload": [...]}`, or None when the forkserver is disabled
+    """
+    forkserver = sandbox_config.get('forkserver')
+    if not forkserver:
+        return None
+    forkserver = forkserver if isinstance(forkserver, dict) else {}
+    return {'preload': forkserver.get('preload', ['pandas', 'numpy', 'scipy'])}
+
+
+def prlimit_prefix(limits: Dict) -> List[str]:
+    """
+    Build a `prlimit` command prefix applying the `command_limits` of `sandbox_config`.
+
+    Args:
+        limits: Optional `cpu_seconds`, `memory_mb` and `max_processes`
+
+    Returns:
+        The argv prefix, empty when no limit is set
+    """
+    prlimit_args = []
+    if limits.get('cpu_seconds'):
+        prlimit_args.append(f"--cpu={int(limits['cpu_seconds'])}")
+    if limits.get('memory_mb'):
+        prlimit_args.append(f"--as={int(limits['memory_mb']) * 1024 * 1024}")
+    if limits.get('max_processes'):
+        prlimit_args.append(f"--nproc={int(limits['max_processes'])}")
+    if prlimit_args:
+        return ['prlimit'] + prlimit_args + ['--']
+    return []
+
+
+def build_limited_command(
+    command: str, timeout: Optional[float], limits: Dict, marker: str, path_prefix: Optional[str] = None
+) -> str:
+    """
+    Wrap a shell command with per-command rlimits, a timeout and a trailing usage frame.
+
+    The frame is printed to stdout after the command exits:
+    `<marker> <exit code>` followed by the output of `times`.
+
+    Args:
+        command: The shell command to run
+        timeout: Wall-clock limit in seconds, None for no limit
+        limits: Optional `cpu_seconds`, `memory_mb` and `max_processes`
+        marker: Unique string that starts the frame
+        path_prefix: Directory put in front of PATH for the command, e.g. the forkserver shims
+
+    Returns:
+        A script for `/bin/sh -c`
+    """
+    prefix = prlimit_prefix(limits)
+    if timeout:
+        # TERM at the deadline, KILL two seconds later; exits with 124 on timeout
+        prefix += ['timeout', '-k', '2', str(timeout)]
+    inner = ' '.join(prefix + ['/bin/sh', '-c', shlex.quote(command)])
+    if path_prefix:
+        inner = f"PATH={shlex.quote(path_prefix)}:\"$PATH\"; export PATH\n{inner}"
+    return (
+        f"{inner}\n"
+        f"__rc=$?\n"
+        f"printf '\\n{marker} %s\\n' \"$__rc\"\n"
+        f"times\n"
+        f"exit $__rc\n"
+    )
@@ -0,0 +1,206 @@
+import os
+import re
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from loguru import logger
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from virtual_server.registry import register_server
+from virtual_server.base_server import BaseServer
+from virtual_server.lazy_assets import LAZY_SUFFIX
+
+
+TEXT_SUFFIXES = {
+    '.txt', '.md', '.csv', '.tsv', '.json', '.jsonl', '.log', '.yaml', '.yml',
+    '.xml', '.html', '.htm', '.py', '.sql', '.ini', '.cfg', '.toml',
+}
+# Larger files are left out of the index
+MAX_INDEXED_BYTES = 8 * 1024 * 1024
+MAX_SNIPPET_CHARS = 200
+MAX_SNIPPET_HITS = 200
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+@dataclass
+class _Document:
+    root: str
+    path: str
+    stat_key: Tuple[int, int]
+    text: str
+    length: int
+    terms: Counter = field(repr=False)
+
+
+@register_server(server_name='search_index')
+class SearchIndex(BaseServer):
+    """
+    Incremental inverted index over the text files of the cloud disk and the workspace,
+    ranked with BM25.
+
+    Before a search, the trees are walked and only files whose (mtime, size) changed since
+    they were indexed are tokenized again; removed files leave the index. The words of a
+    file's path are indexed with its content, so a query also finds files by name.
+
+    Example:
+        index = SearchIndex(task_root_path="./my_task")
+        print(index.search('reimbursement travel'))
+    """
+    ROOTS = ('cloud_disk', 'workspace')
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, task_root_path: str, *args, **kwargs) -> None:
+        """
+        Args:
+            task_root_path: Task folder holding `cloud_disk` and `workspace`.
+        """
+        self.root_paths = {root: Path(task_root_path) / root for root in self.ROOTS}
+        # (root, relative path) -> document
+        self.documents: Dict[Tuple[str, str], _Document] = {}
+        # term -> {(root, relative path): term frequency}
+        self.postings: Dict[str, Dict[Tuple[str, str], int]] = {}
+        self.total_length = 0
+
+    def _walk(self, root: str) -> Dict[str, Tuple[int, int]]:
+        found = {}
+        prefix_length = len(str(self.root_paths[root])) + 1
+        stack = [str(self.root_paths[root])]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.startswith('.') or entry.name.endswith(LAZY_SUFFIX):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in TEXT_SUFFIXES:
+                    st = entry.stat()
+                    if st.st_size <= MAX_INDEXED_BYTES:
+                        relative_path = entry.path[prefix_length:].replace(os.sep, '/')
+                        found[relative_path] = (st.st_mtime_ns, st.st_size)
+        return found
+
+    def _remove(self, key: Tuple[str, str]):
+        document = self.documents.pop(key)
+        for term in document.terms:
+            postings = self.postings[term]
+            del postings[key]
+            if not postings:
+                del self.postings[term]
+        self.total_length -= document.length
+
+    def _add(self, key: Tuple[str, str], stat_key: Tuple[int, int]):
+        root, relative_path = key
+        try:
+            text = (self.root_paths[root] / relative_path).read_text(encoding='utf-8', errors='replace')
+        except OSError:
+            return
+        terms = Counter(tokenize(text))
+        terms.update(tokenize(relative_path))
+        length = sum(terms.values())
+        self.documents[key] = _Document(root, relative_path, stat_key, text, length, terms)
+        for term, count in terms.items():
+            self.postings.setdefault(term, {})[key] = count
+        self.total_length += length
+
+    def refresh(self) -> int:
+        """Brings the index up to date with the files. Returns the number of files (re)indexed or removed."""
+        changed = 0
+        seen = set()
+        for root in self.ROOTS:
+            for relative_path, stat_key in self._walk(root).items():
+                key = (root, relative_path)
+                seen.add(key)
+                document = self.documents.get(key)
+                if document is not None and document.stat_key == stat_key:
+                    continue
+                if document is not None:
+                    self._remove(key)
+                self._add(key, stat_key)
+                changed += 1
+        for key in [key for key in self.documents if key not in seen]:
+            self._remove(key)
+            changed += 1
+        if changed:
+            logger.debug(f"[Search Index] {changed} files updated, {len(self.documents)} indexed.")
+        return changed
+
+    def _rank(self, terms: List[str], roots: Tuple[str, ...]) -> List[Tuple[float, Tuple[str, str]]]:
+        num_documents = len(self.documents)
+        avg_length = self.total_length / num_documents if num_documents else 0
+        scores: Dict[Tuple[str, str], float] = {}
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (num_documents - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key, tf in postings.items():
+                if key[0] not in roots:
+                    continue
+                norm = self.K1 * (1 - self.B + self.B * self.documents[key].length / avg_length)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+        return sorted(((score, key) for key, score in scores.items()), key=lambda item: (-item[0], item[1]))
+
+    def _snippets(self, document: _Document, terms: List[str], max_lines: int = 2) -> List[str]:
+        """The lines with the most distinct query terms, among the first `MAX_SNIPPET_HITS` hits."""
+        pattern = re.compile(r'\b(' + '|'.join(map(re.escape, set(terms))) + r')\b', re.IGNORECASE)
+        text = document.text
+        # Line start -> distinct terms found on the line
+        lines: Dict[int, set] = {}
+        for i, m in enumerate(pattern.finditer(text)):
+            if i == MAX_SNIPPET_HITS:
+                break
+            lines.setdefault(text.rfind('\n', 0, m.start()) + 1, set()).add(m.group(0).lower())
+        best = sorted(lines, key=lambda start: (-len(lines[start]), start))[:max_lines]
+        snippets = []
+        for start in sorted(best):
+            end = text.find('\n', start)
+            line = text[start:end if end >= 0 else len(text)].strip()
+            if len(line) > MAX_SNIPPET_CHARS:
+                first = max(0, pattern.search(line).start() - MAX_SNIPPET_CHARS // 3)
+                line = ('...' if first else '') + line[first:first + MAX_SNIPPET_CHARS] + '...'
+            snippets.append(f"{text.count(chr(10), 0, start) + 1:>6}| {line}")
+        return snippets
+
+    def search(self, query: str, scope: str = 'all', max_results: int = 5) -> str:
+        """
+        Args:
+            query: Words to look for; files containing more of them, more often, rank higher.
+            scope: `all`, `cloud_disk` or `workspace`.
+            max_results: Number of files returned (at most 20).
+
+        Returns:
+            The ranked files with their best matching lines.
+        """
+        roots = self.ROOTS if scope == 'all' else (scope,)
+        if any(root not in self.ROOTS for root in roots):
+            return f"Error: Unknown scope `{scope}`, expected `all`, `cloud_disk` or `workspace`."
+        terms = tokenize(query)
+        if not terms:
+            return "Error: The query must contain at least one word."
+        self.refresh()
+        ranked = self._rank(terms, roots)
+        if not ranked:
+            return f"No file matches `{query}`."
+
+        max_results = max(1, min(int(max_results), 20))
+        labels = {'cloud_disk': 'CloudDisk:', 'workspace': 'Workspace:'}
+        output = [f"{len(ranked)} files match `{query}`, best {min(max_results, len(ranked))} first:"]
+        for rank, (score, key) in enumerate(ranked[:max_results], 1):
+            document = self.documents[key]
+            output.append(f"\n{rank}. {labels[document.root]}{document.path} (score {score:.2f})")
+            output.extend(self._snippets(document, terms))
+        return '\n'.join(output)
+
+    def close(self):
+        self.documents.clear()
+        self.postings.clear()
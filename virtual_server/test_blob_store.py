@@ -0,0 +1,55 @@
+"""
+Test script for BlobStore: deduplicated cloud disk files stay independent of each other.
+"""
+
+import os
+import hashlib
+
+from virtual_server.blob_store import BlobStore
+
+
+def test_dedupe_keeps_files_independent(tmp_path):
+    """Writing one deduplicated file changes neither the other tree nor the blob."""
+    for tree in ('a', 'b'):
+        (tmp_path / tree).mkdir()
+        (tmp_path / tree / 'f.txt').write_text('shared manual\n', encoding='utf-8')
+    store = BlobStore(tmp_path / '.blobs')
+    store.dedupe_tree(tmp_path / 'a')
+    store.dedupe_tree(tmp_path / 'b')
+
+    file_a, file_b = tmp_path / 'a' / 'f.txt', tmp_path / 'b' / 'f.txt'
+    assert not os.path.samefile(file_a, file_b)
+    digest = store.hash_file(file_a)
+    blob = store.blob_path(digest)
+    if blob.exists():
+        print("Reflinks supported, blob stored")
+        assert not os.path.samefile(blob, file_a)
+    else:
+        print("No reflinks here, files left as they are")
+
+    with open(file_a, 'w', encoding='utf-8') as wf:
+        wf.write('edited\n')
+    assert file_a.read_text(encoding='utf-8') == 'edited\n'
+    assert file_b.read_text(encoding='utf-8') == 'shared manual\n'
+    if blob.exists():
+        assert store.hash_file(blob) == digest
+
+    print("\n✓ Blob store dedupe test passed!")
+
+
+def test_gc_keeps_used_blobs(tmp_path):
+    """`gc` removes only the blobs whose content no file of the given folders has."""
+    store = BlobStore(tmp_path / '.blobs')
+    for content in ('used\n', 'unused\n'):
+        blob = store.blob_path(hashlib.sha256(content.encode()).hexdigest())
+        blob.parent.mkdir(exist_ok=True)
+        blob.write_text(content)
+    (tmp_path / 'day').mkdir()
+    (tmp_path / 'day' / 'f.txt').write_text('used\n')
+
+    removed = store.gc(tmp_path)
+    print(f"Removed {removed} blobs")
+    assert removed == 1
+    assert [blob.read_text() for blob in (tmp_path / '.blobs').glob('*/*')] == ['used\n']
+
+    print("\n✓ Blob store gc test passed!")
@@ -0,0 +1,58 @@
+"""
+Test script for CloudDisk globs written with `./` paths.
+"""
+
+from virtual_server.cloud_disk import CloudDisk, _format_size
+
+
+def _make_disk(tmp_path) -> CloudDisk:
+    (tmp_path / 'cloud_disk' / 'sales').mkdir(parents=True)
+    (tmp_path / 'cloud_disk' / 'sales' / 'q1.csv').write_text('a\n1\n', encoding='utf-8')
+    (tmp_path / 'cloud_disk' / 'sales' / 'notes.md').write_text('x\n', encoding='utf-8')
+    (tmp_path / 'cloud_disk' / 'index.csv').write_text('b\n2\n', encoding='utf-8')
+    return CloudDisk(str(tmp_path), cloud_disk_config={'link_mode': 'copy'})
+
+
+def test_search_dot_slash(tmp_path):
+    """`./*.csv` and `./**/*.csv` match like `*.csv` and `**/*.csv`."""
+    disk = _make_disk(tmp_path)
+    for pattern, expected in [('./*.csv', 1), ('./**/*.csv', 2), ('/**/*.csv', 2), ('./sales/*.csv', 1)]:
+        output = disk.search(pattern)
+        print(f"{pattern}: {output}")
+        assert f"{expected} matches" in output.splitlines()[0], pattern
+
+    print("\n✓ Cloud disk search test passed!")
+
+
+def test_download_many_dot_slash(tmp_path):
+    """`./sales/*.csv` keeps paths relative to `sales`, `./*.csv` to the root."""
+    disk = _make_disk(tmp_path)
+    output = disk.download_many('./sales/*.csv', 'out')
+    print(output)
+    assert (tmp_path / 'workspace' / 'out' / 'q1.csv').is_file()
+
+    output = disk.download_many('./*.csv', 'top')
+    print(output)
+    assert (tmp_path / 'workspace' / 'top' / 'index.csv').is_file()
+    assert not (tmp_path / 'workspace' / 'top' / 'sales').exists()
+
+    print("\n✓ Cloud disk download test passed!")
+
+
+def test_sizes_after_rewrite(tmp_path):
+    """Rewriting a file in place keeps its folder's listing but shows the new size."""
+    disk = _make_disk(tmp_path)
+    print(disk.open_folder('sales', recursive=True))
+    (tmp_path / 'cloud_disk' / 'sales' / 'q1.csv').write_text('a\n' + '1\n' * 1000, encoding='utf-8')
+    new_size = _format_size(2002)
+
+    output = disk.open_folder('sales', recursive=True)
+    print(output)
+    assert f'sales/q1.csv ({new_size})' in output
+    assert f'sales/q1.csv ({new_size})' in disk.search('q1')
+
+    output = disk.download_many('sales/*.csv', 'out')
+    print(output)
+    assert f'({new_size})' in output.splitlines()[0]
+
+    print("\n✓ Cloud disk size refresh test passed!")
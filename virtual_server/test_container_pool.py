@@ -0,0 +1,135 @@
+"""
+Test script for ContainerPool with a fake Docker client.
+"""
+
+import os
+import time
+
+from virtual_server.container_pool import ContainerPool
+
+
+class FakeExecResult:
+    exit_code = 0
+    output = b''
+
+
+class FakeContainer:
+    def __init__(self, number: int):
+        self.id = f'fake{number}'
+        self.short_id = self.id
+        self.status = 'running'
+
+    def reload(self):
+        pass
+
+    def exec_run(self, cmd, **kwargs):
+        return FakeExecResult()
+
+    def remove(self, force=False):
+        self.status = 'removed'
+
+
+class FakeContainers:
+    def __init__(self):
+        self.started = []
+
+    def run(self, image, volumes=None, labels=None, **kwargs):
+        container = FakeContainer(len(self.started))
+        self.started.append(container)
+        return container
+
+
+class FakeClient:
+    def __init__(self):
+        self.containers = FakeContainers()
+
+
+def _make_pool(tmp_path, **kwargs) -> ContainerPool:
+    pool = ContainerPool(FakeClient(), 'fake:latest', {}, pool_root=str(tmp_path / 'pool'), **kwargs)
+    _wait_started(pool)
+    return pool
+
+
+def _wait_started(pool: ContainerPool):
+    deadline = time.monotonic() + 5
+    while pool._starting and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not pool._starting
+
+
+def _make_workspace(tmp_path) -> str:
+    workspace = tmp_path / 'task' / 'workspace'
+    workspace.mkdir(parents=True)
+    (workspace / 'input.csv').write_text('a,b\n1,2\n')
+    return str(workspace)
+
+
+def test_lease_release_round_trip(tmp_path):
+    """The workspace is reachable through the symlink while leased and moved back on release."""
+    # At the cap, so the released container goes back to the idle list
+    pool = _make_pool(tmp_path, size=1, max_size=1)
+    workspace = _make_workspace(tmp_path)
+
+    lease = pool.lease(workspace)
+    assert os.path.islink(workspace)
+    assert os.path.realpath(workspace) == lease.slot_dir
+    assert (tmp_path / 'task' / 'workspace' / 'input.csv').read_text() == 'a,b\n1,2\n'
+    # Written by the episode, e.g. through the container's /workspace
+    with open(os.path.join(lease.slot_dir, 'output.txt'), 'w') as wf:
+        wf.write('done')
+    assert lease in pool._leased
+
+    pool.release(lease)
+    print(f"Workspace after release: {sorted(os.listdir(workspace))}")
+    assert not os.path.islink(workspace)
+    assert sorted(os.listdir(workspace)) == ['input.csv', 'output.txt']
+    assert os.listdir(lease.slot_dir) == []
+    assert lease in pool._idle and not pool._leased
+
+    pool.close()
+    assert not os.path.exists(pool.pool_root)
+
+    print("\n✓ Container pool round trip test passed!")
+
+
+def test_lease_recovers_stale_symlink(tmp_path):
+    """A workspace left as a symlink by an episode that never released gets its files back."""
+    pool = _make_pool(tmp_path, size=1, max_size=2)
+    workspace = tmp_path / 'task' / 'workspace'
+    stale_slot = tmp_path / 'stale_slot'
+    stale_slot.mkdir()
+    (stale_slot / 'report.md').write_text('# report')
+    workspace.parent.mkdir()
+    os.symlink(stale_slot, workspace, target_is_directory=True)
+
+    lease = pool.lease(str(workspace))
+    print(f"Files in the new slot: {os.listdir(lease.slot_dir)}")
+    assert os.path.realpath(workspace) == lease.slot_dir
+    assert os.listdir(lease.slot_dir) == ['report.md']
+
+    pool.release(lease)
+    assert not os.path.islink(workspace)
+    assert (workspace / 'report.md').read_text() == '# report'
+    pool.close()
+
+    print("\n✓ Container pool stale symlink test passed!")
+
+
+def test_close_keeps_leased_slots(tmp_path):
+    """Closing the pool during a lease keeps the leased workspace; the last release cleans up."""
+    pool = _make_pool(tmp_path, size=1, max_size=2)
+    workspace = _make_workspace(tmp_path)
+
+    lease = pool.lease(workspace)
+    _wait_started(pool)
+    pool.close()
+    assert os.path.isdir(lease.slot_dir)
+    assert (tmp_path / 'task' / 'workspace' / 'input.csv').is_file()
+
+    pool.release(lease)
+    assert not os.path.islink(workspace)
+    assert os.listdir(workspace) == ['input.csv']
+    assert lease.container.status == 'removed'
+    assert not os.path.exists(pool.pool_root)
+
+    print("\n✓ Container pool close test passed!")
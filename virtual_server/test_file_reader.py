@@ -0,0 +1,37 @@
+"""
+Test script for FileReader.grep line semantics.
+"""
+
+from virtual_server.file_reader import FileReader
+
+
+def test_grep_anchors(tmp_path):
+    """`^` and `$` anchor at every line, and matches never span lines."""
+    workspace = tmp_path / 'workspace'
+    workspace.mkdir()
+    (workspace / 'server.log').write_text(
+        'ERROR one\ninfo ERROR\nERROR two\nok\n', encoding='utf-8'
+    )
+    reader = FileReader(str(tmp_path))
+
+    output = reader.grep('server.log', '^ERROR')
+    print(output)
+    assert output.splitlines()[0].startswith('[server.log] 2 matching lines')
+    assert '     1: ERROR one' in output and '     3: ERROR two' in output
+
+    output = reader.grep('server.log', 'ERROR$')
+    print(output)
+    assert output.splitlines()[0].startswith('[server.log] 1 matching lines')
+    assert '     2: info ERROR' in output
+
+    # `\s` and `[^x]` would otherwise match the newline and join two lines
+    output = reader.grep('server.log', r'one\s+info')
+    assert 'No line matches' in output
+    output = reader.grep('server.log', r'ok[^x]*')
+    assert output.splitlines()[0].startswith('[server.log] 1 matching lines')
+
+    # Every line matches `^`, without a phantom line after the final newline
+    output = reader.grep('server.log', '^')
+    assert output.splitlines()[0].startswith('[server.log] 4 matching lines')
+
+    print("\n✓ File reader grep test passed!")
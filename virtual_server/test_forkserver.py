@@ -0,0 +1,132 @@
+"""
+Test script for the preloaded Python forkserver and its shims.
+"""
+
+import os
+import sys
+import time
+import signal
+import subprocess
+
+from virtual_server import forkserver
+
+
+def _start_server(tmp_path, address=None):
+    address = address or str(tmp_path / 'forkserver.sock')
+    server = subprocess.Popen(
+        [sys.executable, forkserver.__file__, '--serve', '--address', address, '--preload', 'json'],
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + 10
+    while not os.path.exists(address):
+        assert server.poll() is None and time.monotonic() < deadline, 'forkserver did not start'
+        time.sleep(0.02)
+    bin_dir = str(tmp_path / 'bin')
+    forkserver.install_shims(bin_dir)
+    env = dict(os.environ, **{forkserver.ADDRESS_ENV: address})
+    return server, os.path.join(bin_dir, 'python'), env
+
+
+def _stop_server(server):
+    os.killpg(server.pid, signal.SIGKILL)
+    server.wait()
+
+
+def _children(pid):
+    children = []
+    for name in os.listdir('/proc'):
+        if name.isdigit():
+            try:
+                with open(f'/proc/{name}/stat', 'rb') as f:
+                    if int(f.read().rsplit(b')', 1)[1].split()[1]) == pid:
+                        children.append(int(name))
+            except OSError:
+                pass
+    return children
+
+
+def test_parse_python_args():
+    """Supported command lines become requests, anything else falls back to the interpreter."""
+    assert forkserver._parse_python_args(['-c', 'print(1)', 'x']) == ('code', 'print(1)', ['-c', 'x'], False)
+    assert forkserver._parse_python_args(['-u', '-m', 'json.tool', 'a.json']) == ('module', 'json.tool', ['json.tool', 'a.json'], True)
+    assert forkserver._parse_python_args(['script.py', '--flag']) == ('script', 'script.py', ['script.py', '--flag'], False)
+    assert forkserver._parse_python_args(['-', 'arg']) == ('stdin', None, ['-', 'arg'], False)
+    assert forkserver._parse_python_args(['-O', 'script.py']) is None
+
+    print("\n✓ Python argument parsing test passed!")
+
+
+def test_shim_runs_commands(tmp_path):
+    """Commands run through the shim see their argv, cwd, env and stdin, and return their exit status."""
+    server, python, env = _start_server(tmp_path)
+    try:
+        work_dir = tmp_path / 'work'
+        work_dir.mkdir()
+        (work_dir / 'script.py').write_text('import os, sys\nprint(os.getcwd(), sys.argv[1:], os.environ["VALUE"])\nsys.exit(4)\n')
+        result = subprocess.run([python, 'script.py', 'a b'], cwd=work_dir, env=dict(env, VALUE='42'), capture_output=True)
+        print(f"Script: {result}")
+        assert result.returncode == 4
+        assert result.stdout.decode().strip() == f"{work_dir} ['a b'] 42"
+
+        result = subprocess.run([python, '-'], input=b'import json; print(json.dumps([1]))', env=env, capture_output=True)
+        assert result.returncode == 0 and result.stdout == b'[1]\n'
+
+        result = subprocess.run([python, '-c', 'raise ValueError("bad")'], env=env, capture_output=True)
+        assert result.returncode == 1 and b'ValueError: bad' in result.stderr
+        assert forkserver.__file__.encode() not in result.stderr
+
+        result = subprocess.run([python, '-c', 'import os, signal; os.kill(os.getpid(), signal.SIGTERM)'], env=env)
+        assert result.returncode == -signal.SIGTERM
+    finally:
+        _stop_server(server)
+
+    print("\n✓ Forkserver shim test passed!")
+
+
+def test_reset_keeps_server(tmp_path):
+    """`reset` would kill the running commands and their supervisors, but not the server."""
+    server, python, env = _start_server(tmp_path)
+    try:
+        command = subprocess.Popen([python, '-c', 'import time; time.sleep(30)'], env=env)
+        deadline = time.monotonic() + 10
+        while not any(_children(supervisor) for supervisor in _children(server.pid)):
+            assert time.monotonic() < deadline, 'command did not start'
+            time.sleep(0.02)
+        supervisors = _children(server.pid)
+        commands = [pid for supervisor in supervisors for pid in _children(supervisor)]
+
+        pids = forkserver.processes_to_reset()
+        print(f"Server {server.pid}, supervisors {supervisors}, commands {commands}")
+        assert server.pid not in pids
+        assert set(supervisors + commands) <= set(pids)
+
+        # What `reset` does in a container, limited to this server's processes
+        for pid in commands + supervisors:
+            os.kill(pid, signal.SIGKILL)
+        command.wait(timeout=10)
+        result = subprocess.run([python, '-c', 'print("still served")'], env=env, capture_output=True)
+        assert result.stdout == b'still served\n'
+    finally:
+        _stop_server(server)
+
+    print("\n✓ Forkserver reset test passed!")
+
+
+def test_second_server_exits_before_preloading(tmp_path):
+    """Starting a server on a served address exits at once, without importing the preload list."""
+    server, _, _ = _start_server(tmp_path)
+    try:
+        start = time.monotonic()
+        result = subprocess.run(
+            [sys.executable, forkserver.__file__, '--serve', '--address', str(tmp_path / 'forkserver.sock'),
+             '--preload', 'this_module_does_not_exist'],
+            capture_output=True, timeout=30,
+        )
+        print(f"Second server: {result.stderr.decode().strip()} in {time.monotonic() - start:.2f}s")
+        assert b'already served' in result.stderr
+        assert b'cannot preload' not in result.stderr
+        assert os.path.exists(tmp_path / 'forkserver.sock')
+    finally:
+        _stop_server(server)
+
+    print("\n✓ Forkserver single instance test passed!")
@@ -0,0 +1,61 @@
+"""
+Test script for ImageEncoder: downscaling, cache hits and invalidation.
+"""
+
+import io
+import base64
+
+from PIL import Image
+
+from virtual_server.image_cache import ImageEncoder
+
+
+def _write_png(path, size, color):
+    Image.new('RGB', size, color).save(path, 'PNG')
+
+
+def test_downscale_and_cache(tmp_path):
+    """Large images are downscaled; a repeated read is served from memory until the file changes."""
+    ImageEncoder._memory_cache.clear()
+    image_path = tmp_path / 'heatmap.png'
+    _write_png(image_path, (2000, 1000), (200, 30, 30))
+    encoder = ImageEncoder({'max_side': 500, 'format': 'png'})
+
+    mime, payload, info = encoder.encode(image_path, 'image/png')
+    print(f"First read: {mime}, {info}")
+    assert mime == 'image/png' and not info['cached']
+    with Image.open(io.BytesIO(base64.b64decode(payload))) as image:
+        assert image.size == (500, 250)
+
+    _, cached_payload, info = encoder.encode(image_path, 'image/png')
+    assert info['cached'] and cached_payload == payload
+
+    # Shared between encoders with the same settings
+    assert ImageEncoder({'max_side': 500, 'format': 'png'}).encode(image_path, 'image/png')[2]['cached']
+    assert not ImageEncoder({'max_side': 400, 'format': 'png'}).encode(image_path, 'image/png')[2]['cached']
+
+    _write_png(image_path, (300, 600), (30, 30, 200))
+    _, new_payload, info = encoder.encode(image_path, 'image/png')
+    print(f"After rewrite: {info}")
+    assert not info['cached']
+    with Image.open(io.BytesIO(base64.b64decode(new_payload))) as image:
+        assert image.size == (250, 500)
+
+    print("\n✓ Image cache test passed!")
+
+
+def test_disk_cache(tmp_path):
+    """With `cache_path`, a new process (empty memory cache) reads the encoded image from disk."""
+    ImageEncoder._memory_cache.clear()
+    image_path = tmp_path / 'chart.png'
+    _write_png(image_path, (800, 800), (10, 120, 10))
+    config = {'max_side': 256, 'format': 'webp', 'cache_path': str(tmp_path / 'cache')}
+
+    mime, payload, info = ImageEncoder(config).encode(image_path, 'image/png')
+    assert mime == 'image/webp' and not info['cached']
+    ImageEncoder._memory_cache.clear()
+    _, disk_payload, info = ImageEncoder(config).encode(image_path, 'image/png')
+    print(f"Second read: {info}")
+    assert info['cached'] and disk_payload == payload
+
+    print("\n✓ Image disk cache test passed!")
@@ -0,0 +1,44 @@
+"""
+Test script for the command timeout of LocalSandbox.
+"""
+
+import time
+import resource
+
+from virtual_server.local_sandbox import LocalSandbox
+
+
+def test_timeout_after_output_closed(tmp_path):
+    """A command that closes its output still gets killed at the timeout."""
+    (tmp_path / 'workspace').mkdir()
+    with LocalSandbox(str(tmp_path), sandbox_config={'command_timeout': 1}) as sandbox:
+        start = time.monotonic()
+        result = sandbox.execute('exec >/dev/null 2>&1; sleep 8')
+        elapsed = time.monotonic() - start
+        print(f"Result: {result}, elapsed {elapsed:.2f}s")
+        assert result.timed_out
+        assert result.exit_code == 124
+        assert elapsed < 4
+
+        result = sandbox.execute('echo done')
+        assert not result.timed_out and result.exit_code == 0 and result.output == 'done'
+
+    print("\n✓ Local sandbox timeout test passed!")
+
+
+def test_command_limits(tmp_path):
+    """`command_limits` apply to the command, `max_processes` does not cap the host user."""
+    (tmp_path / 'workspace').mkdir()
+    config = {'command_limits': {'cpu_seconds': 7, 'memory_mb': 512, 'max_processes': 1}}
+    with LocalSandbox(str(tmp_path), sandbox_config=config) as sandbox:
+        result = sandbox.execute('ulimit -t; ulimit -v')
+        print(f"Limits: {result.output!r}")
+        assert result.output.split() == ['7', str(512 * 1024)]
+
+        result = sandbox.execute('python3 -c "import resource; print(resource.getrlimit(resource.RLIMIT_NPROC)[0])"')
+        assert int(result.output) == resource.getrlimit(resource.RLIMIT_NPROC)[0]
+
+        result = sandbox.execute('(echo forked) | cat')
+        assert result.exit_code == 0 and result.output == 'forked'
+
+    print("\n✓ Local sandbox limits test passed!")
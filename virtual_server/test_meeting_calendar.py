@@ -0,0 +1,67 @@
+"""
+Test script for MeetingRoomCalendar scheduling queries.
+"""
+
+import datetime
+
+from virtual_server.meeting_calendar import MeetingRoomCalendar
+
+
+def _dt(hour: int, minute: int = 0, day: int = 1) -> datetime.datetime:
+    return datetime.datetime(2025, 10, day, hour, minute)
+
+
+def test_find_free_slots(tmp_path):
+    """Free slots skip attendee conflicts, full rooms and non-business hours."""
+    calendar = MeetingRoomCalendar(str(tmp_path), clock=None)
+
+    # Alice is busy 09:00-10:30, Bob is busy 10:00-11:00
+    calendar.book_meeting("Alice Smith", "Carol White", _dt(9), _dt(10, 30), "Room_01")
+    calendar.book_meeting("Dave Green", "Bob Jones", _dt(10), _dt(11), "Room_02")
+
+    slots = calendar.find_free_slots(
+        ["Alice Smith", "Bob Jones"], 60, _dt(8), _dt(18), max_results=3
+    )
+    print(f"Slots: {slots}")
+    assert slots[0] == (_dt(11), _dt(12), "Room_01")
+    assert [room for _, _, room in slots] == ["Room_01", "Room_02", "Room_03"]
+
+    # Occupy every room at 11:00-12:00; the earliest slot moves to 12:00
+    for i, room in enumerate(calendar.room_names):
+        calendar.book_meeting(f"Person {i}", "", _dt(11), _dt(12), room)
+    slots = calendar.find_free_slots(["Alice Smith", "Bob Jones"], 60, _dt(8), _dt(18), max_results=1)
+    assert slots == [(_dt(12), _dt(13), "Room_01")]
+
+    # Windows spanning several days only yield business hours
+    slots = calendar.find_free_slots(["Eve Black"], 480, _dt(12), _dt(17, day=3), max_results=5)
+    assert slots[0] == (_dt(9, day=2), _dt(17, day=2), "Room_01")
+    assert all(start.hour >= 9 and end.hour <= 17 for start, end, _ in slots)
+
+    print("\n✓ Free slot finder test passed!")
+
+
+class _Clock:
+    now_dt = datetime.datetime(2025, 10, 1, 8, 0)
+
+
+def test_calendar_config(tmp_path):
+    """Rooms, business hours and horizon come from `calendar_config`."""
+    calendar = MeetingRoomCalendar(
+        str(tmp_path), clock=_Clock(),
+        calendar_config={"num_rooms": 120, "business_start": 8, "business_end": 20, "horizon_days": 2}
+    )
+    assert len(calendar.room_names) == 120
+    assert calendar.room_names[0] == "Room_001"
+
+    assert calendar.book_meeting("Alice Smith", "", _dt(19), _dt(20), "Room_120").success
+    assert not calendar.book_meeting("Alice Smith", "", _dt(20), _dt(21), "Room_001").success
+    # Meetings may not span days or go past the horizon
+    assert not calendar.book_meeting("Alice Smith", "", _dt(19), _dt(9, day=2), "Room_001").success
+    assert not calendar.book_meeting("Alice Smith", "", _dt(9, day=3), _dt(10, day=3), "Room_001").success
+
+    assert "Room_120" not in calendar.get_available_rooms(_dt(19, 30), _dt(20))
+    slots = calendar.find_free_slots(["Alice Smith"], 60, _dt(19), _dt(12, day=5), max_results=200)
+    assert slots[0][0] == _dt(8, day=2)
+    assert all(end <= _dt(0, day=3) for _, end, _ in slots)
+
+    print("\n✓ Calendar config test passed!")
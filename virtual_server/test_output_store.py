@@ -0,0 +1,91 @@
+"""
+Test script for OutputStore and the spilling of long tool results in Environment.
+"""
+
+import json
+from collections import defaultdict
+from types import SimpleNamespace
+
+from environment import Environment
+from tools_parser import ToolManager
+from virtual_server.output_store import OutputStore
+
+
+def _long_text(lines: int = 2000) -> str:
+    return '\n'.join(f'row {i:05d} ' + 'x' * 20 for i in range(lines))
+
+
+def test_spill_and_read(tmp_path):
+    """Short outputs pass through; long ones become a head, a tail and pages within `threshold`."""
+    (tmp_path / 'workspace').mkdir()
+    store = OutputStore(str(tmp_path), output_config={'threshold': 1000, 'head_chars': 700, 'tail_chars': 300, 'page_chars': 900})
+
+    short = 'y' * 1000
+    assert store.spill('ExecuteCommand', short) is short
+
+    text = _long_text()
+    preview = store.spill('ExecuteCommand', text)
+    print(preview[-400:])
+    assert len(preview) <= store.threshold
+    assert preview.startswith(text[:600]) and preview.endswith(text[-30:])
+    # A long tool name makes a long note; the preview shrinks to stay within `threshold`
+    assert len(store.spill('A' * 120, text)) <= store.threshold
+    handle = preview.split('saved in your workspace as `', 1)[1].split('`', 1)[0]
+    assert (tmp_path / 'workspace' / handle).read_text(encoding='utf-8') == text
+
+    # Reading every page back gives the whole output, and no page is spilled again
+    pages, offset = [], 0
+    while True:
+        page = store.read(handle, offset)
+        assert len(page) <= store.threshold
+        assert store.spill('ReadToolOutput', page) is page
+        body, _, footer = page.rpartition('\n\n[Output Store] ')
+        pages.append(body)
+        if 'end of output' in footer:
+            break
+        offset = int(footer.rsplit('offset=', 1)[1].rstrip('.'))
+    assert ''.join(pages) == text
+    print(f"{len(pages)} pages read")
+
+    print("\n✓ Output store spill test passed!")
+
+
+def test_read_rejects_foreign_handles(tmp_path):
+    """Only artifacts inside `.tool_outputs` can be read."""
+    (tmp_path / 'workspace').mkdir()
+    (tmp_path / 'workspace' / 'notes.txt').write_text('private')
+    (tmp_path / 'secret.txt').write_text('secret')
+    store = OutputStore(str(tmp_path))
+    store.spill('ExecuteCommand', _long_text())
+
+    for handle in ('notes.txt', '../secret.txt', '.tool_outputs/../notes.txt', '/etc/passwd', '.tool_outputs/missing.txt'):
+        output = store.read(handle)
+        print(f"{handle}: {output}")
+        assert output.startswith('Error: Unknown output handle')
+
+    print("\n✓ Output store handle test passed!")
+
+
+def test_environment_spills_tool_results(tmp_path):
+    """`execute_tool_calls` replaces a long tool result by its preview."""
+    (tmp_path / 'workspace').mkdir()
+    store = OutputStore(str(tmp_path), output_config={'threshold': 500, 'head_chars': 200, 'tail_chars': 100})
+    manager = ToolManager({})
+    manager.register_tool('Dump', lambda: _long_text())
+    manager.register_tool('Echo', lambda text: text)
+    manager.validators = {'Dump': lambda arguments: None, 'Echo': lambda arguments: None}
+    env = SimpleNamespace(
+        tool_manager=manager, servers={'output_store': store}, clock=None,
+        total_tool_calls=defaultdict(int), event_controller=SimpleNamespace(update=lambda **kwargs: []),
+    )
+    tool_calls = [
+        SimpleNamespace(id='1', function=SimpleNamespace(name='Dump', arguments='{}')),
+        SimpleNamespace(id='2', function=SimpleNamespace(name='Echo', arguments='{"text": "short"}')),
+    ]
+    results = Environment.execute_tool_calls(env, 'agent', tool_calls)
+    contents = [json.loads(result['content']) for result in results]
+    print(contents[0][-300:])
+    assert len(contents[0]) <= 500 and '`.tool_outputs/Dump-' in contents[0]
+    assert contents[1] == 'short'
+
+    print("\n✓ Environment spill test passed!")
@@ -0,0 +1,74 @@
+"""
+Test script for persistent sandbox sessions, run through LocalSandbox.
+"""
+
+import os
+import time
+
+from virtual_server.local_sandbox import LocalSandbox
+
+
+def _make_sandbox(tmp_path) -> LocalSandbox:
+    (tmp_path / 'workspace' / 'sub').mkdir(parents=True)
+    return LocalSandbox(str(tmp_path), sandbox_config={'persistent_shell': True})
+
+
+def test_shell_session_keeps_state(tmp_path):
+    """The working directory and variables survive between calls until the session is reset."""
+    with _make_sandbox(tmp_path) as sandbox:
+        session = sandbox.get_session('shell')
+        result = session.run('cd sub && export GREETING=hello && COUNT=3')
+        assert result.exit_code == 0
+
+        result = session.run('echo "$(pwd) $GREETING $COUNT"')
+        print(f"Second call: {result.output!r}")
+        assert result.output == f"{os.path.realpath(tmp_path / 'workspace' / 'sub')} hello 3"
+
+        result = session.run('exit_code_test() { return 3; }; exit_code_test')
+        assert result.exit_code == 3
+
+        sandbox.reset_sessions()
+        result = session.run('echo "$(pwd) [$GREETING]"')
+        print(f"After reset: {result.output!r}")
+        assert result.output == f"{os.path.realpath(tmp_path / 'workspace')} []"
+
+    print("\n✓ Shell session test passed!")
+
+
+def test_python_session_keeps_globals(tmp_path):
+    """Python globals survive between calls; the last expression is printed."""
+    with _make_sandbox(tmp_path) as sandbox:
+        session = sandbox.get_session('python')
+        assert session.run('data = [1, 2, 3]\ntotal = sum(data)').exit_code == 0
+        result = session.run('total * 2')
+        print(f"Second call: {result.output!r}")
+        assert result.exit_code == 0 and result.output == '12'
+
+        result = session.run('undefined_name')
+        assert result.exit_code == 1 and 'NameError' in result.output
+
+        sandbox.reset_sessions()
+        result = session.run('total')
+        assert result.exit_code == 1 and 'NameError' in result.output
+
+    print("\n✓ Python session test passed!")
+
+
+def test_timeout_kills_session(tmp_path):
+    """A request that times out kills the session, which restarts with a clean state."""
+    with _make_sandbox(tmp_path) as sandbox:
+        session = sandbox.get_session('shell')
+        session.run('export KEPT=yes')
+
+        start = time.monotonic()
+        result = session.run('sleep 30', timeout=0.5)
+        print(f"Timed out after {time.monotonic() - start:.2f}s: {result.output!r}")
+        assert result.timed_out and result.exit_code == 124
+        assert 'will restart on the next call' in result.output
+        assert time.monotonic() - start < 5
+        assert not session.alive
+
+        result = session.run('echo "[$KEPT]"')
+        assert result.exit_code == 0 and result.output == '[]'
+
+    print("\n✓ Session timeout test passed!")
@@ -0,0 +1,75 @@
+"""
+Test script for OutputCollector and build_limited_command.
+"""
+
+import subprocess
+
+from virtual_server.sandbox_utils import OutputCollector, build_limited_command, parse_times_output
+
+
+MARKER = '__EVOENV_RC_test__'
+
+
+def test_output_truncated_at_max_bytes():
+    """Only `max_bytes` are kept, the total counts everything."""
+    collector = OutputCollector(max_bytes=10)
+    for chunk in (b'0123', b'456789abc', b'', b'defgh'):
+        collector.feed(chunk)
+    print(f"Head: {bytes(collector.head)!r}, total {collector.total}")
+    assert bytes(collector.head) == b'0123456789'
+    assert collector.total == 18
+
+    unbounded = OutputCollector()
+    unbounded.feed(b'x' * 100000)
+    assert len(unbounded.head) == 100000 and len(unbounded.tail) == OutputCollector.TAIL_BYTES
+
+    print("\n✓ Output truncation test passed!")
+
+
+def test_marker_split_across_chunks():
+    """The frame is found when the marker arrives in pieces, and after truncation."""
+    stream = b'hello\nworld\n' + f'\n{MARKER} 3\n'.encode() + b'0m0.00s 0m0.00s\n0m1.50s 0m0.25s\n'
+    for size in (1, 2, 5, 7, len(stream)):
+        collector = OutputCollector()
+        for i in range(0, len(stream), size):
+            collector.feed(stream[i:i + size])
+        output, frame, output_bytes = collector.split_frame(MARKER.encode())
+        assert output == b'hello\nworld\n\n'
+        assert output_bytes == len(output)
+        assert frame.startswith(f'{MARKER} 3\n'.encode())
+
+    # The marker is beyond the kept head but still in the tail window
+    collector = OutputCollector(max_bytes=4)
+    for i in range(0, len(stream), 3):
+        collector.feed(stream[i:i + 3])
+    output, frame, output_bytes = collector.split_frame(MARKER.encode())
+    print(f"Truncated: {output!r}, {output_bytes} bytes before the frame")
+    assert output == b'hell' and output_bytes == 13
+    assert parse_times_output(frame.decode().partition('\n')[2]) == (1.5, 0.25)
+
+    assert OutputCollector().split_frame(MARKER.encode())[1] is None
+
+    print("\n✓ Frame marker test passed!")
+
+
+def test_build_limited_command_quoting(tmp_path):
+    """The command runs verbatim under the limits, and the frame carries its exit code."""
+    command = 'echo "it\'s $((1 + 1))" \'$HOME\' `echo back`; printf "a\\nb\\n"; exit 7'
+    expected = subprocess.run(['/bin/sh', '-c', command], capture_output=True).stdout
+    script = build_limited_command(
+        command, timeout=10, limits={'cpu_seconds': 5, 'memory_mb': 256}, marker=MARKER,
+        path_prefix=str(tmp_path / 'dir with space')
+    )
+    print(script)
+    result = subprocess.run(['/bin/sh', '-c', script], capture_output=True)
+    output, _, frame = result.stdout.partition(f'\n{MARKER} '.encode())
+    assert output == expected
+    assert frame.startswith(b'7\n')
+    assert result.returncode == 7
+
+    script = build_limited_command('echo "$PATH"', timeout=None, limits={}, marker=MARKER,
+                                   path_prefix=str(tmp_path / "it's here"))
+    result = subprocess.run(['/bin/sh', '-c', script], capture_output=True)
+    assert result.stdout.decode().startswith(str(tmp_path / "it's here") + ':')
+
+    print("\n✓ Limited command test passed!")
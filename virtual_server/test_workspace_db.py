@@ -0,0 +1,41 @@
+"""
+Test script for the query-only guards of WorkspaceDatabase.
+"""
+
+import os
+
+from virtual_server.workspace_db import WorkspaceDatabase
+
+
+def test_rejects_writes_and_attach(tmp_path):
+    """PRAGMA, ATTACH and DDL/DML are rejected, and the tables stay intact."""
+    workspace = tmp_path / 'workspace'
+    workspace.mkdir()
+    (workspace / 'sales.csv').write_text('region,amount\nnorth,10\nsouth,5\n', encoding='utf-8')
+    db = WorkspaceDatabase(str(tmp_path))
+
+    assert 'north' in db.query('SELECT region, SUM(amount) FROM sales GROUP BY region')
+
+    evil_path = tmp_path / 'evil.db'
+    for statement in [
+        'PRAGMA query_only = OFF',
+        'DROP TABLE sales',
+        'DELETE FROM sales',
+        "INSERT INTO sales VALUES ('east', 1)",
+        'CREATE TABLE t (x)',
+        f"ATTACH DATABASE '{evil_path}' AS e",
+        'DETACH DATABASE main',
+    ]:
+        output = db.query(statement)
+        print(f"{statement}: {output.splitlines()[0]}")
+        assert output.startswith('Error'), statement
+
+    assert not os.path.exists(evil_path)
+    output = db.query('SELECT COUNT(*) AS n FROM sales')
+    assert output.splitlines()[-1].strip('| ') == '2'
+
+    # Reads that only need SELECT and functions still work, including recursive CTEs
+    output = db.query('WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 3) SELECT MAX(x) AS m FROM c')
+    assert output.splitlines()[-1].strip('| ') == '3'
+
+    print("\n✓ Workspace DB guard test passed!")
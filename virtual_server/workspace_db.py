@@ -0,0 +1,251 @@
+import os
+import re
+import csv
+import json
+import sqlite3
+from contextlib import contextmanager
+from loguru import logger
+from pathlib import Path
+from typing import Dict, List, Tuple
+from tabulate import tabulate
+
+from virtual_server.registry import register_server
+from virtual_server.base_server import BaseServer
+
+
+DATA_SUFFIXES = ('.csv', '.json')
+# Rows and cell width of a query result shown to the agent
+MAX_RESULT_ROWS = 100
+MAX_CELL_CHARS = 200
+
+_INT_RE = re.compile(r'[+-]?(0|[1-9]\d*)')
+_REAL_RE = re.compile(r'[+-]?(\d+\.\d*|\.\d+|\d+)([eE][+-]?\d+)?')
+_IDENTIFIER_RE = re.compile(r'"([^"]+)"|`([^`]+)`|\[([^\]]+)\]|([A-Za-z_][A-Za-z0-9_]*)')
+
+
+def table_name(relative_path: str) -> str:
+    """`sales/2025 q1.csv` -> `sales_2025_q1`"""
+    stem = relative_path.rsplit('.', 1)[0]
+    name = re.sub(r'\W+', '_', stem).strip('_') or 'data'
+    return f't_{name}' if name[0].isdigit() else name
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _column_type(values: List[str]) -> str:
+    """The narrowest SQLite type of a column of strings; empty cells do not count."""
+    kind = 'INTEGER'
+    for value in values:
+        value = value.strip()
+        if not value:
+            continue
+        if kind == 'INTEGER' and _INT_RE.fullmatch(value):
+            continue
+        # Leading zeros mark identifiers such as `007`, which must stay text
+        if _REAL_RE.fullmatch(value) and not re.match(r'[+-]?0\d', value):
+            kind = 'REAL'
+            continue
+        return 'TEXT'
+    return kind
+
+
+def _convert(value, kind: str):
+    if value is None:
+        return None
+    if kind == 'TEXT':
+        return value
+    value = value.strip()
+    if not value:
+        return None
+    return int(value) if kind == 'INTEGER' else float(value)
+
+
+# Actions an agent's query may perform; PRAGMA, ATTACH/DETACH and all DDL/DML are denied
+_QUERY_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE}
+
+
+def _authorize_query(action: int, *args) -> int:
+    return sqlite3.SQLITE_OK if action in _QUERY_ACTIONS else sqlite3.SQLITE_DENY
+
+
+def _unique_columns(header: List[str]) -> List[str]:
+    columns, seen = [], set()
+    for i, column in enumerate(header):
+        column = column.strip() or f'column_{i + 1}'
+        candidate, n = column, 2
+        while candidate.lower() in seen:
+            candidate, n = f'{column}_{n}', n + 1
+        seen.add(candidate.lower())
+        columns.append(candidate)
+    return columns
+
+
+def _read_csv(path: Path) -> Tuple[List[str], List[List]]:
+    with open(path, 'r', encoding='utf-8-sig', errors='replace', newline='') as rf:
+        rows = list(csv.reader(rf))
+    if not rows:
+        return [], []
+    columns = _unique_columns(rows[0])
+    width = len(columns)
+    body = [(row + [None] * width)[:width] for row in rows[1:] if any(cell.strip() for cell in row)]
+    return columns, body
+
+
+def _read_json(path: Path) -> Tuple[List[str], List[List]]:
+    with open(path, 'r', encoding='utf-8') as rf:
+        data = json.load(rf)
+    # Either a list of records or an object holding one
+    if isinstance(data, dict):
+        lists = [value for value in data.values() if isinstance(value, list)]
+        data = lists[0] if len(lists) == 1 else [data]
+    records = [record if isinstance(record, dict) else {'value': record} for record in data]
+    keys = list(dict.fromkeys(key for record in records for key in record))
+    columns = _unique_columns(keys)
+    body = []
+    for record in records:
+        row = []
+        for key in keys:
+            value = record.get(key)
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value, ensure_ascii=False)
+            row.append(None if value is None else str(value))
+        body.append(row)
+    return columns, body
+
+
+@register_server(server_name='workspace_db')
+class WorkspaceDatabase(BaseServer):
+    """
+    An in-memory SQLite database over the CSV and JSON files of the workspace.
+
+    Every data file is a table named after its path in the workspace (see `table_name`),
+    with INTEGER, REAL or TEXT columns inferred from its content. A file is loaded when a
+    query first mentions its table and reloaded only when its mtime or size changed, so
+    repeated aggregates over the same files run in milliseconds without a sandbox process.
+    The database is query-only: an authorizer lets queries read tables and call functions
+    only, so they can neither change the loaded tables nor attach other database files.
+
+    Example:
+        db = WorkspaceDatabase(task_root_path="./my_task")
+        print(db.query("SELECT region, SUM(amount) FROM sales GROUP BY region"))
+    """
+    def __init__(self, task_root_path: str, *args, **kwargs) -> None:
+        """
+        Args:
+            task_root_path: Task folder holding the `workspace`.
+        """
+        self.workspace_path = Path(task_root_path) / 'workspace'
+        self.conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self.conn.execute('PRAGMA query_only = ON')
+        self.conn.setlimit(sqlite3.SQLITE_LIMIT_ATTACHED, 0)
+        self.conn.set_authorizer(_authorize_query)
+        # Table -> (relative path, mtime_ns, size) of the loaded version
+        self._loaded: Dict[str, Tuple[str, int, int]] = {}
+
+    def data_files(self) -> Dict[str, str]:
+        """Table name -> relative path of every CSV/JSON file of the workspace (hidden folders excluded)."""
+        files = {}
+        for root, dirs, filenames in os.walk(self.workspace_path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            for filename in sorted(filenames):
+                if filename.lower().endswith(DATA_SUFFIXES):
+                    relative_path = (Path(root) / filename).relative_to(self.workspace_path).as_posix()
+                    name = table_name(relative_path)
+                    # Keep names unique, e.g. for `report.csv` next to `report.json`
+                    candidate, n = name, 2
+                    while candidate.lower() in files:
+                        candidate, n = f'{name}_{n}', n + 1
+                    files[candidate.lower()] = relative_path
+        return files
+
+    @contextmanager
+    def _loading(self):
+        """Lifts the query-only guards while the server itself changes the tables."""
+        self.conn.set_authorizer(None)
+        self.conn.execute('PRAGMA query_only = OFF')
+        try:
+            yield
+        finally:
+            self.conn.execute('PRAGMA query_only = ON')
+            self.conn.set_authorizer(_authorize_query)
+
+    def _drop(self, name: str):
+        """Forgets the table of a file that was removed from the workspace."""
+        with self._loading():
+            with self.conn:
+                self.conn.execute(f'DROP TABLE IF EXISTS {_quote(name)}')
+        del self._loaded[name]
+
+    def _load(self, name: str, relative_path: str):
+        path = self.workspace_path / relative_path
+        st = os.stat(path)
+        if self._loaded.get(name) == (relative_path, st.st_mtime_ns, st.st_size):
+            return
+        if relative_path.lower().endswith('.csv'):
+            columns, rows = _read_csv(path)
+        else:
+            columns, rows = _read_json(path)
+        kinds = [_column_type([row[i] for row in rows if row[i] is not None]) for i in range(len(columns))]
+        column_defs = ', '.join(f'{_quote(column)} {kind}' for column, kind in zip(columns, kinds))
+
+        with self._loading():
+            with self.conn:
+                self.conn.execute(f'DROP TABLE IF EXISTS {_quote(name)}')
+                if columns:
+                    self.conn.execute(f'CREATE TABLE {_quote(name)} ({column_defs})')
+                    self.conn.executemany(
+                        f'INSERT INTO {_quote(name)} VALUES ({", ".join("?" * len(columns))})',
+                        ([_convert(value, kind) for value, kind in zip(row, kinds)] for row in rows)
+                    )
+        self._loaded[name] = (relative_path, st.st_mtime_ns, st.st_size)
+        logger.debug(f"[Workspace DB] Loaded '{relative_path}' as `{name}` ({len(rows)} rows).")
+
+    def _tables_hint(self, files: Dict[str, str]) -> str:
+        if not files:
+            return 'There are no CSV or JSON files in your workspace; download or create them first.'
+        return 'Available tables:\n' + '\n'.join(f'   - {name} (`{path}`)' for name, path in files.items())
+
+    def query(self, sql: str) -> str:
+        """
+        Runs a query after loading the tables it mentions.
+
+        Returns:
+            The result as a table of at most `MAX_RESULT_ROWS` rows, or an error message
+            listing the available tables.
+        """
+        files = self.data_files()
+        try:
+            for name in [name for name in self._loaded if name not in files]:
+                self._drop(name)
+            for match in _IDENTIFIER_RE.finditer(sql):
+                identifier = next(group for group in match.groups() if group is not None).lower()
+                if identifier in files:
+                    self._load(identifier, files[identifier])
+        except Exception as e:
+            return f"Error: Could not load the data: {e}"
+
+        try:
+            cursor = self.conn.execute(sql)
+            rows = cursor.fetchmany(MAX_RESULT_ROWS + 1)
+        except sqlite3.Error as e:
+            return f"Error: {e}\n\n{self._tables_hint(files)}"
+        if cursor.description is None:
+            return 'The statement returned no rows.'
+
+        headers = [column[0] for column in cursor.description]
+        truncated = len(rows) > MAX_RESULT_ROWS
+        rows = [
+            [value[:MAX_CELL_CHARS] + '...' if isinstance(value, str) and len(value) > MAX_CELL_CHARS else value for value in row]
+            for row in rows[:MAX_RESULT_ROWS]
+        ]
+        if not rows:
+            return f"The query returned no rows. Columns: {', '.join(headers)}"
+        output = tabulate(rows, headers=headers, tablefmt='github', disable_numparse=True)
+        if truncated:
+            output += f'\n\n(Only the first {MAX_RESULT_ROWS} rows are shown; use aggregates or LIMIT/OFFSET to see the rest.)'
+        return output
+
+    def close(self):
+        self.conn.close()